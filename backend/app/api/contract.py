@@ -1,21 +1,46 @@
 
-import tempfile
-from typing import Generator, Optional
+from typing import AsyncIterator, Generator, Literal, Optional
+import asyncio
+from contextlib import aclosing
+import json
 import uuid
+import zipfile
 from pathlib import Path 
 from beanie import PydanticObjectId
 from fastapi import APIRouter, Body, File, HTTPException, Query, Request, UploadFile
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from app.config import settings
+from app.exceptions import FileTooLarge
 from app.minio import DocumentBucket
 from app.models.documentUploaded import ContractDocument, ContractStatus
+from app.models.ingestion import IngestionJob, IngestionStage
 from app.services.extractor import DocumentExtractor, document_extraction_worker
+from app.services.bulk_upload import BulkIngestion, stage_bulk_files
+from app.services.ingestion import IngestionQueue
+from app.services.near_duplicate import index_contract, reuse_clauses, split_for_review
+from app.services.upload import MultipartUploadStream
 from app.repositories.contract import ContractRepository
 from app.services.agent import agent
 from app.services.segmenter import  extract_clauses
-from app.services.compliance_check import check_compliance, convert_clauses_for_compliance
+from app.services.local_segmenter import segment_locally
+from app.services.incremental_segmenter import resegment_incrementally
+from app.services.compliance_check import (
+    ComplianceCheckResult,
+    check_compliance,
+    convert_clauses_for_compliance,
+    stream_compliance,
+)
+from app.services.compliance_cache import policy_set_version
 
 
 router = APIRouter(prefix="/contract", tags=["Contract"])
+
+# Allowance for form fields and multipart framing on top of MAX_UPLOAD_SIZE
+FORM_OVERHEAD = 1024 * 1024
+# Keep proxies from buffering server-sent events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 @router.get("/upload-page", response_class=HTMLResponse)
 async def get_signed_url():
     file_id = str(uuid.uuid4())
@@ -24,12 +49,14 @@ async def get_signed_url():
     doc_bucket = DocumentBucket(file_prefix="contracts")
     signed_url = await doc_bucket.get_presigned_put_url(
         object_name=file_name,
-        expires_in_seconds=20
+        expires_in_seconds=settings.PRESIGNED_URL_EXPIRY
     )
 
+    # Extracted by the presigned upload listener once the object lands in MinIO
     contract_doc = ContractDocument(
         file_name=file_name,
         file_id=file_id,
+        awaiting_upload=True,
     )
     await contract_doc.insert()
 
@@ -104,7 +131,7 @@ async def get_signed_url():
                 <div class="info">
                     <p>Contract ID: {contract_doc.id}</p>
                     <p>File ID: {file_id}</p>
-                    <p><strong>⚠️ URL expires in 20 minutes.</strong></p>
+                    <p><strong>⚠️ URL expires in {settings.PRESIGNED_URL_EXPIRY // 60} minutes.</strong></p>
                 </div>
             </div>
         </body>
@@ -115,36 +142,80 @@ async def get_signed_url():
 @router.post("/upload-contract", description="Upload contract image, PDF, text, or handwriting", response_model=ContractDocument)
 async def upload_contract(
     request: Request,
+    background: bool = Query(False, description="Return 202 with an ingestion job id and extract in the background"),
+    pdf_backend: Optional[Literal["auto", "pdfium", "pdfminer"]] = Query(
+        None, description="PDF text backend; defaults to the server's PDF_TEXT_BACKEND"
+    ),
 ):
     """
     Upload a contract either as a file or as text content.
     - For file uploads: send as multipart/form-data with 'file', 'name', and 'category' fields
     - For text content: send as multipart/form-data with 'content', 'name', and 'category' fields
+    - With `background=true`, file uploads return 202 as soon as the file is stored;
+      poll `GET /contract/jobs/{job_id}` or follow `GET /contract/jobs/{job_id}/events`
+      for extraction progress.
+    - `pdf_backend` picks the PDF text reader; "auto" reads with pdfium and falls
+      back to pdfminer per page when the text layer looks garbled.
     """
-    document_extract: DocumentExtractor = request.app.state.document_extract
+    ingestion: IngestionQueue = request.app.state.ingestion
     doc_bucket = DocumentBucket(file_prefix="contracts")
 
-    # Get form data to extract all fields
-    form_data = await request.form()
-    file = form_data.get("file")
-    name = form_data.get("name")
-    category = form_data.get("category")
-    content = form_data.get("content")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_SIZE + FORM_OVERHEAD:
+        raise FileTooLarge(f"File exceeds the maximum upload size of {settings.MAX_UPLOAD_SIZE // (1024 * 1024)} MB.")
+
+    # Single pass over the body: the file part is streamed to MinIO while it
+    # is hashed and spooled to disk for the extractor
+    upload = MultipartUploadStream(request, max_size=settings.MAX_UPLOAD_SIZE, temp_dir=settings.UPLOAD_TEMP_DIR)
+    has_file = await upload.start()
 
     file_id = str(uuid.uuid4())
     extracted_data = None
+    extraction_stats = None
     final_file_name = None
-    
-    if file and hasattr(file, 'filename'):
-        # Handle file upload (multipart/form-data)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file.filename) as tmp_file:
-            tmp_file.write(await file.read())
-            tmp_file_path = tmp_file.name
-        path_obj = Path(tmp_file_path)
-        file_id = await doc_bucket.put(file=file, object_name=file.filename)
-        extracted_data = document_extract.extract(path_obj)
-        path_obj.unlink()
-        final_file_name = name if name else file.filename
+
+    if has_file:
+        try:
+            file_id = await doc_bucket.put_stream(
+                upload,
+                object_name=upload.filename,
+                content_type=upload.content_type,
+                filename=upload.filename,
+            )
+            form_data = await upload.finish()
+        except BaseException:
+            upload.discard()
+            raise
+        path_obj = upload.path
+        file_hash = upload.sha256
+    else:
+        form_data = await upload.finish()
+    name = form_data.get("name")
+    category = form_data.get("category")
+    content = form_data.get("content")
+
+    if has_file:
+        final_file_name = name if name else upload.filename
+
+        if background:
+            contract_doc = ContractDocument(
+                file_name=final_file_name,
+                file_id=file_id,
+                category=category,
+            )
+            await contract_doc.insert()
+            job = await ingestion.submit(contract_doc, path_obj, file_hash, pdf_backend)
+            return JSONResponse(
+                status_code=202,
+                content={"job_id": str(job.id), "contract_id": str(contract_doc.id), "stage": job.stage.value},
+            )
+
+        try:
+            result = await ingestion.extract(path_obj, file_hash=file_hash, pdf_backend=pdf_backend)
+        finally:
+            path_obj.unlink(missing_ok=True)
+        extracted_data = result.text
+        extraction_stats = result.summary() if result.pages else None
     elif content:
         # Handle text content upload
         final_file_name = name if name else f"draft_contract_{file_id}.txt"
@@ -157,14 +228,163 @@ async def upload_contract(
         file_id=file_id,
         category=category,
         content=extracted_data,
+        extraction_stats=extraction_stats,
     )
     print(f"Creating contract: name={contract_doc.file_name}, category={category}")
     await contract_doc.insert()
+    await index_contract(contract_doc, settings.NEAR_DUPLICATE_THRESHOLD)
     
     # Return the document - FastAPI will serialize it properly with response_model
     return contract_doc
 
 
+@router.post("/bulk-upload", description="Import many contracts from a zip archive or a multi-file form")
+async def bulk_upload_contracts(
+    request: Request,
+    background: bool = Query(False, description="Queue one ingestion job per file instead of extracting inline"),
+    pdf_backend: Optional[Literal["auto", "pdfium", "pdfminer"]] = Query(
+        None, description="PDF text backend; defaults to the server's PDF_TEXT_BACKEND"
+    ),
+):
+    """
+    Bulk contract import.
+    - Send multipart/form-data with any number of 'files' parts and/or one 'archive'
+      zip, plus an optional 'category' applied to every contract.
+    - Files are uploaded to MinIO concurrently, extracted with bounded parallelism
+      and stored with batched inserts.
+    - Returns a manifest with one entry per file: status "created" (or "queued" with
+      a job id when `background=true`), "failed" or "skipped", and the reason.
+    """
+    ingestion: IngestionQueue = request.app.state.ingestion
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.BULK_MAX_TOTAL_SIZE + FORM_OVERHEAD:
+        raise FileTooLarge(f"Import exceeds the maximum size of {settings.BULK_MAX_TOTAL_SIZE // (1024 * 1024)} MB.")
+
+    form = await request.form(max_files=settings.BULK_MAX_FILES + 1)
+    try:
+        files = [item for item in form.getlist("files") if not isinstance(item, str)]
+        archive = form.get("archive")
+        if isinstance(archive, str):
+            archive = None
+        if not files and archive is None:
+            raise HTTPException(status_code=400, detail="Send 'files' parts or an 'archive' zip.")
+        category = form.get("category") if isinstance(form.get("category"), str) else None
+
+        try:
+            items, skipped = await run_in_threadpool(
+                stage_bulk_files,
+                files,
+                archive,
+                settings.ALLOWED_EXTENSIONS,
+                settings.MAX_UPLOAD_SIZE,
+                settings.BULK_MAX_FILES,
+                settings.BULK_MAX_TOTAL_SIZE,
+                settings.UPLOAD_TEMP_DIR,
+            )
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="'archive' is not a valid zip file.")
+    finally:
+        await form.close()
+
+    bulk = BulkIngestion(
+        ingestion,
+        DocumentBucket(file_prefix="contracts"),
+        upload_concurrency=settings.BULK_UPLOAD_CONCURRENCY,
+        extraction_concurrency=settings.BULK_EXTRACTION_CONCURRENCY,
+        batch_size=settings.BULK_INSERT_BATCH_SIZE,
+        category=category,
+        pdf_backend=pdf_backend,
+        background=background,
+    )
+    manifest = await bulk.run(items) + skipped
+
+    counts = {}
+    for entry in manifest:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    return JSONResponse(
+        status_code=202 if background else 200,
+        content={"total": len(manifest), "counts": counts, "files": manifest},
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJob)
+async def get_ingestion_job(job_id: PydanticObjectId):
+    """
+    Report the progress of a background ingestion job.
+    """
+    job = await IngestionJob.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
+
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _poll_job_events(job: IngestionJob, interval: float = 1.0) -> AsyncIterator[str]:
+    # Job running on another worker (or finished long ago): stream its stored progress
+    last = None
+    while True:
+        current = (job.stage, job.pages_done, job.pages_total)
+        if current != last:
+            yield _sse("progress", {"stage": job.stage.value, "pages_done": job.pages_done, "pages_total": job.pages_total})
+            last = current
+        if job.stage == IngestionStage.COMPLETED:
+            yield _sse("completed", {"contract_id": str(job.contract_id)})
+            return
+        if job.stage == IngestionStage.FAILED:
+            yield _sse("failed", {"error": job.error})
+            return
+        await asyncio.sleep(interval)
+        job = await IngestionJob.get(job.id)
+        if job is None:
+            yield _sse("failed", {"error": "Ingestion job not found"})
+            return
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_ingestion_job(
+    job_id: PydanticObjectId,
+    request: Request,
+    include_text: bool = Query(False, description="Include each page's text in the page events"),
+):
+    """
+    Server-sent events for a background ingestion job.
+
+    Emits a `page` event per page as soon as its text is final (page index,
+    method, character count, seconds since the job started, and the text
+    with `include_text=true`), then a final `completed` or `failed` event.
+    OCR pages can arrive out of order. Reconnecting clients resume after
+    the `Last-Event-ID` header. Jobs not running in this process fall back
+    to `progress` events read from the stored job.
+    """
+    job = await IngestionJob.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+
+    ingestion: IngestionQueue = request.app.state.ingestion
+    log = ingestion.events(job_id)
+    if log is None:
+        return StreamingResponse(_poll_job_events(job), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    last_event_id = request.headers.get("last-event-id", "")
+    after = int(last_event_id) if last_event_id.isdigit() else 0
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for event_id, event, data in log.follow(after):
+            if event == "page" and not include_text:
+                data = {key: value for key, value in data.items() if key != "text"}
+            yield _sse(event, data, event_id)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.post("/{contract_id}/extract-clauses")
 async def extract_clauses_endpoint(contract_id: PydanticObjectId):
     contract = await ContractRepository.get_contract_by_id(contract_id)
@@ -179,12 +399,38 @@ async def extract_clauses_endpoint(contract_id: PydanticObjectId):
             raise HTTPException(status_code=400, detail="No file name")
 
     try:
-        result = extract_clauses(raw_text)
-        clauses_data = [clause.model_dump() for clause in result.clauses]
+        clauses_data = None
+        # Content edited since it was segmented: only the edited regions are segmented again
+        if raw_text and contract.clauses and contract.segmented_content:
+            incremental = await resegment_incrementally(
+                contract.segmented_content, contract.clauses, raw_text, settings.SEGMENTER_MIN_CONFIDENCE
+            )
+            if incremental:
+                clauses_data, stats = incremental
+                print(f"Incremental re-segmentation of contract {contract_id}: {stats}")
+
+        # A near-duplicate of a segmented contract takes over its clauses;
+        # only text the original does not cover needs the LLM
+        reused = None
+        if clauses_data is None and contract.duplicate_of and raw_text:
+            original = await ContractRepository.get_contract_by_id(contract.duplicate_of)
+            if original and original.content and original.clauses:
+                reused = reuse_clauses(original.content, original.clauses, raw_text)
+        if reused:
+            clauses_data, changed = reused
+            print(f"Reused {len(clauses_data)} clauses of contract {contract.duplicate_of}, {changed} changed.")
+        elif clauses_data is None:
+            # Explicitly numbered contracts are segmented locally in milliseconds
+            result, confidence = segment_locally(raw_text)
+            if confidence < settings.SEGMENTER_MIN_CONFIDENCE:
+                print(f"Local segmentation confidence {confidence}, using the LLM.")
+                result = await extract_clauses(raw_text)
+            clauses_data = [clause.model_dump() for clause in result.clauses]
 
         await contract.update({
             "$set": {
                 "clauses": clauses_data,
+                "segmented_content": raw_text,
                 "status": ContractStatus.UNDER_REVIEW
             }
         })
@@ -196,8 +442,73 @@ async def extract_clauses_endpoint(contract_id: PydanticObjectId):
         raise HTTPException(status_code=500, detail=f"Clause extraction failed: {e}")
     
     
-@router.post("/{contract_id}/compliance-check")
-async def compliance_check_endpoint(contract_id: PydanticObjectId):
+async def _compliance_inputs(contract: ContractDocument) -> dict:
+    """Arguments of the compliance check for a segmented contract."""
+    clauses = convert_clauses_for_compliance(contract.clauses)
+
+    print(f"Converted clauses: {len(clauses)}")
+
+    # Near-duplicate of a reviewed contract: re-check only the clauses that differ
+    reuse = {}
+    if contract.duplicate_of:
+        original = await ContractRepository.get_contract_by_id(contract.duplicate_of)
+        if original and original.clauses and original.risks is not None and original.compliance_score is not None:
+            changed, reused_findings = split_for_review(clauses, original.clauses, original.risks)
+            reuse = {
+                "reused_findings": reused_findings,
+                "reused_score": original.compliance_score,
+                "reused_clause_count": len(clauses) - len(changed),
+            }
+            print(f"Reusing {len(reused_findings)} findings of contract {original.id}, checking {len(changed)} changed clauses.")
+            clauses = changed
+
+    # Clauses reviewed before against the same policies take their cached findings
+    return {
+        "clauses": clauses,
+        "contract_id": str(contract.id),
+        "collection_name": "company_policies",
+        "policy_version": await policy_set_version(),
+        **reuse,
+    }
+
+
+async def _store_compliance_result(contract: ContractDocument, result: ComplianceCheckResult) -> dict:
+    # Serialize findings to dict format
+    findings = [finding.model_dump() for finding in result.findings]
+    compliance_score = result.metrics.overall_score
+    
+    # Determine status based on score and recommendation
+    if result.recommendation == "APPROVE" and compliance_score >= 0.9:
+        new_status = ContractStatus.APPROVED
+    elif compliance_score >= 0.7:
+        new_status = ContractStatus.UNDER_REVIEW
+    else:
+        new_status = ContractStatus.UNDER_REVIEW
+    
+    # Update contract with new schema
+    await contract.update({
+        "$set": {
+            "risks": findings,  # Store as findings now
+            "compliance_score": compliance_score,
+            "status": new_status,
+        }
+    })
+    
+    # Return comprehensive result
+    return {
+        "status": "completed",
+        "findings": findings,
+        "metrics": result.metrics.model_dump(),
+        "compliance_score": compliance_score,
+        "executive_summary": result.executive_summary,
+        "recommendation": result.recommendation,
+        "required_actions": result.required_actions,
+        # Agents whose findings are missing: the result is partial
+        "dropped_agents": result.dropped_agents,
+    }
+
+
+async def _get_segmented_contract(contract_id: PydanticObjectId) -> ContractDocument:
     contract = await ContractRepository.get_contract_by_id(contract_id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
@@ -207,52 +518,18 @@ async def compliance_check_endpoint(contract_id: PydanticObjectId):
             status_code=400,
             detail="No clauses found. Run extraction first."
         )
+    return contract
+
+
+@router.post("/{contract_id}/compliance-check")
+async def compliance_check_endpoint(contract_id: PydanticObjectId):
+    contract = await _get_segmented_contract(contract_id)
     
     try:
-        print("x\n"*10)
         print(f"Checking compliance for contract {contract_id}, clauses: {len(contract.clauses)}")
 
-        clauses = convert_clauses_for_compliance(contract.clauses)
-
-        print(f"Converted clauses: {len(clauses)}")
-        
-        result = check_compliance(
-            clauses=clauses,
-            contract_id=str(contract_id),
-            collection_name="company_policies"
-        )
-        
-        # Serialize findings to dict format
-        findings = [finding.model_dump() for finding in result.findings]
-        compliance_score = result.metrics.overall_score
-        
-        # Determine status based on score and recommendation
-        if result.recommendation == "APPROVE" and compliance_score >= 0.9:
-            new_status = ContractStatus.APPROVED
-        elif compliance_score >= 0.7:
-            new_status = ContractStatus.UNDER_REVIEW
-        else:
-            new_status = ContractStatus.UNDER_REVIEW
-        
-        # Update contract with new schema
-        await contract.update({
-            "$set": {
-                "risks": findings,  # Store as findings now
-                "compliance_score": compliance_score,
-                "status": new_status,
-            }
-        })
-        
-        # Return comprehensive result
-        return {
-            "status": "completed",
-            "findings": findings,
-            "metrics": result.metrics.model_dump(),
-            "compliance_score": compliance_score,
-            "executive_summary": result.executive_summary,
-            "recommendation": result.recommendation,
-            "required_actions": result.required_actions
-        }
+        result = await check_compliance(**await _compliance_inputs(contract))
+        return await _store_compliance_result(contract, result)
         
     except Exception as e:
         await contract.update({
@@ -262,6 +539,53 @@ async def compliance_check_endpoint(contract_id: PydanticObjectId):
             status_code=500,
             detail=f"Compliance check failed: {str(e)}"
         )
+
+
+@router.post("/{contract_id}/compliance-check/stream")
+async def stream_compliance_check(contract_id: PydanticObjectId):
+    """
+    Server-sent events for a compliance check.
+
+    Emits a `findings` event with the validated findings of each specialist
+    agent as soon as it completes a batch of clauses (`agent` is null for
+    findings reused from a near-duplicate or the per-clause cache),
+    `agent_failed` for an agent that failed or timed out on a batch, then a final `completed` event with the same
+    body as `/compliance-check` minus the findings already streamed, or
+    `failed`. The result is stored on the contract as with `/compliance-check`.
+    """
+    contract = await _get_segmented_contract(contract_id)
+    print(f"Streaming compliance check for contract {contract_id}, clauses: {len(contract.clauses)}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        event_id = 0
+        try:
+            # Closed as soon as the client goes away, cancelling the agents still running
+            async with aclosing(stream_compliance(**await _compliance_inputs(contract))) as events:
+                async for event, data in events:
+                    event_id += 1
+                    if event == "result":
+                        stored = await _store_compliance_result(contract, data)
+                        stored.pop("findings")
+                        yield _sse("completed", stored, event_id)
+                    elif event == "findings":
+                        yield _sse(event, {
+                            "agent": data["source"],
+                            "findings": [finding.model_dump(mode="json") for finding in data["findings"]],
+                            **{key: data[key] for key in ("batch", "compliance_score") if key in data},
+                        }, event_id)
+                    else:
+                        yield _sse(event, {
+                            "agent": data["source"],
+                            "batch": data["batch"],
+                            "error": data["error"],
+                            "timed_out": data["timed_out"],
+                        }, event_id)
+        except Exception as e:
+            await contract.update({"$set": {"status": ContractStatus.REJECTED}})
+            yield _sse("failed", {"error": f"Compliance check failed: {e}"}, event_id + 1)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
         
 @router.get("/{contract_id}", response_model=ContractDocument)
 async def get_contract(contract_id: PydanticObjectId):
@@ -307,6 +631,8 @@ async def update_contract(
     updated = await ContractRepository.update_contract(contract_id, content, name, category)
     if not updated:
         raise HTTPException(status_code=404, detail="Contract not found")
+    if content is not None:
+        await index_contract(updated, settings.NEAR_DUPLICATE_THRESHOLD)
     return updated
 
 @router.delete("/{contract_id}", response_model=dict)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from app.services.extractor import DocumentExtractor
+from app.services.llm import response_cache
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/ocr", description="Check the OCR engine and the OCR worker pool")
+async def ocr_health(request: Request):
+    """
+    Reports the OCR engine in use, its Tesseract version and languages and,
+    with parallel OCR enabled, how many pool workers answered. Responds 503
+    when a configured language is missing or the pool is not healthy.
+    """
+    extractor: DocumentExtractor = request.app.state.document_extract
+    report = await run_in_threadpool(extractor.ocr_health)
+    return JSONResponse(status_code=200 if report.get("ok") else 503, content=report)
+
+
+@router.get("/llm-cache", description="Hit and miss counters of the LLM response cache")
+async def llm_cache_stats():
+    """Counters of this worker since it started; the persistent tier is shared by all workers."""
+    return response_cache.stats()
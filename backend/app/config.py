@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 from pathlib import Path
 from typing import Optional
@@ -22,6 +22,19 @@ class OCRConfig:
     psm_mode: int = 6  
     language: str = 'eng+ara'
     min_text_length: int = 50 
+    min_page_text_length: int = 20
+    parallel: bool = False
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    max_inflight_pages: int = 8
+    adaptive_dpi: bool = False
+    probe_dpi: int = 150
+    min_confidence: float = 70.0
+    engine: str = "auto"  # "pytesseract", "tesserocr" or "auto" (tesserocr when installed)
+    detect_script: bool = True
+    # Tesseract OSD script confidence (OCR_MIN_SCRIPT_CONFIDENCE) needed to read a page with that
+    # script's pack alone. Clean single-script pages usually score well above 10, mixed eng/ara
+    # pages lower; raise it if minority-script text goes missing, lower it to save OCR time.
+    min_script_confidence: float = 10.0
 
 
 @dataclass
@@ -55,6 +68,9 @@ class ExtractionConfig:
     output_dir: Path = Path("./extracted_data")
     supported_formats: tuple = ('.pdf', '.docx', '.doc')
     save_intermediate: bool = False
+    pdf_backend: str = "auto"  # "pdfium", "pdfminer" or "auto"
+    soffice_path: str = "soffice"  # LibreOffice, used to convert .doc to .docx
+    conversion_timeout: int = 120
 
 class Config:
     """Main configuration class."""
@@ -72,6 +88,30 @@ class Config:
         self.llm.anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
         self.llm.groq_api_key = os.getenv('GROQ_API_KEY')
         
+        if os.getenv('OCR_PARALLEL'):
+            self.ocr.parallel = os.getenv('OCR_PARALLEL').lower() in ('1', 'true', 'yes')
+        if os.getenv('OCR_WORKERS'):
+            self.ocr.workers = int(os.getenv('OCR_WORKERS'))
+        if os.getenv('OCR_MAX_INFLIGHT_PAGES'):
+            self.ocr.max_inflight_pages = int(os.getenv('OCR_MAX_INFLIGHT_PAGES'))
+        if os.getenv('OCR_ENGINE'):
+            self.ocr.engine = os.getenv('OCR_ENGINE')
+        if os.getenv('OCR_ADAPTIVE_DPI'):
+            self.ocr.adaptive_dpi = os.getenv('OCR_ADAPTIVE_DPI').lower() in ('1', 'true', 'yes')
+        if os.getenv('OCR_PROBE_DPI'):
+            self.ocr.probe_dpi = int(os.getenv('OCR_PROBE_DPI'))
+        if os.getenv('OCR_MIN_CONFIDENCE'):
+            self.ocr.min_confidence = float(os.getenv('OCR_MIN_CONFIDENCE'))
+        if os.getenv('OCR_DETECT_SCRIPT'):
+            self.ocr.detect_script = os.getenv('OCR_DETECT_SCRIPT').lower() in ('1', 'true', 'yes')
+        if os.getenv('OCR_MIN_SCRIPT_CONFIDENCE'):
+            self.ocr.min_script_confidence = float(os.getenv('OCR_MIN_SCRIPT_CONFIDENCE'))
+        
+        if os.getenv('PDF_TEXT_BACKEND'):
+            self.extraction.pdf_backend = os.getenv('PDF_TEXT_BACKEND')
+        if os.getenv('SOFFICE_PATH'):
+            self.extraction.soffice_path = os.getenv('SOFFICE_PATH')
+        
         output_dir = os.getenv('OUTPUT_DIR')
         if output_dir:
             self.extraction.output_dir = Path(output_dir)
@@ -153,6 +193,20 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
     ALLOWED_EXTENSIONS: list = [".pdf", ".docx", ".doc"]
     UPLOAD_TEMP_DIR: str = "/tmp/contract_uploads"
+    INGESTION_MAX_CONCURRENCY: int = 2
+    BULK_MAX_FILES: int = 500
+    BULK_MAX_TOTAL_SIZE: int = 1024 * 1024 * 1024  # 1GB
+    BULK_UPLOAD_CONCURRENCY: int = 8
+    BULK_EXTRACTION_CONCURRENCY: int = 4  # extraction threads of each bulk import, besides the ingestion pool
+    BULK_INSERT_BATCH_SIZE: int = 50
+    SEGMENTER_MIN_CONFIDENCE: float = 0.8  # below it, clause extraction goes to the LLM
+    SEGMENTER_CHUNK_CHARS: int = 6000  # longer texts are segmented in chunks; the response echoes the text
+    SEGMENTER_CHUNK_OVERLAP: int = 800
+    SEGMENTER_MAX_CONCURRENCY: int = 4
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8  # estimated Jaccard similarity of word shingles
+    PRESIGNED_URL_EXPIRY: int = 20 * 60  # seconds
+    UPLOAD_LISTENER_MODE: str = "notifications"  # notifications, poll or off
+    UPLOAD_LISTENER_POLL_INTERVAL: float = 5.0
     CHROMA_PERSIST_DIR: str = "./data/chroma"
     CHROMA_COLLECTION_NAME: str = "contract_templates"
     LLM_PROVIDER: str = "groq"  
@@ -167,7 +221,17 @@ class Settings(BaseSettings):
     GROQ_BASE_URL: str = "https://api.groq.com/openai/v1"
     LLM_TEMPERATURE: float = 0.1  
     LLM_MAX_TOKENS: int = 2000
-    LLM_TIMEOUT: int = 60
+    LLM_TIMEOUT: int = 60  # seconds per agent call
+    LLM_MAX_CONNECTIONS: int = 20  # pooled HTTP connections per provider
+    LLM_CACHE_MAX_ENTRIES: int = 512  # in-process LRU tier, 0 to disable it
+    LLM_CACHE_TTL: int = 7 * 24 * 3600  # seconds; 0 disables the response cache
+    AGENT_MAX_CONCURRENCY: int = 12  # agent calls in flight across all requests
+    COMPLIANCE_DEADLINE: float = 45.0  # seconds for all specialist agents of a compliance check
+    COMPLIANCE_HEDGE_AFTER: float = 0.0  # seconds before a straggling agent gets a second attempt; 0 disables
+    COMPLIANCE_BATCH_TOKENS: int = 6000  # prompt tokens per specialist call; more clauses are checked in batches
+    TOKENIZER_ENCODING: str = "o200k_base"  # tiktoken encoding used to count prompt tokens, when installed
+    COMPLIANCE_CACHE_TTL: int = 30 * 24 * 3600  # seconds per-clause findings are kept; 0 disables reuse
+    POLICY_SET_REVISION: str = ""  # bump when the policy knowledge base is reloaded outside the app
     EMBEDDING_DIMENSION: int = 384
     MONGO_URI: str = Field(default=...)
     MONGO_DB: str = Field(default=...)
@@ -8,7 +8,7 @@ from qdrant_client import AsyncQdrantClient
 from app.config import get_config, settings
 from pymongo import AsyncMongoClient
 from beanie import init_beanie
-from app.minio import init_minio_client
+from app.minio import DocumentBucket, init_minio_client
 from app.models.notification import notification
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
@@ -20,11 +20,20 @@ from app.models.policy import Template
 from app.services.embedding import TextDocumentProcessor
 from app.api.contract import router as contract_router
 from app.api.suggestions import router as suggestions_router
+from app.api.health import router as health_router
 from app.models.documentUploaded import ContractDocument
 from app.services.extractor import DocumentExtractor
+from app.services.ingestion import IngestionQueue
+from app.services.upload_listener import PresignedUploadListener
+from app.models.ingestion import IngestionJob
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.models.fingerprint import ContractFingerprint
+from app.models.llm_cache import LLMCacheEntry
+from app.models.compliance_cache import ComplianceCacheEntry
 from app.services.rule_engine import RuleEngineService
 from agno.os import AgentOS
 from app.services.agent  import agent
+from app.services.registry import agent_registry
 
 
 
@@ -34,7 +43,7 @@ mongo_db = mongo_client[settings.MONGO_DB]
 
 
 async def init_mongo():
-    await init_beanie(database=mongo_db, document_models=[ notification,Template,ContractDocument])
+    await init_beanie(database=mongo_db, document_models=[ notification,Template,ContractDocument,IngestionJob,ExtractionCacheEntry,ContractFingerprint,LLMCacheEntry,ComplianceCacheEntry])
 
 async def init_qdrant():
     client =AsyncQdrantClient(url=settings.QDRANT_URL, port=6333)
@@ -59,7 +68,27 @@ async def lifespan(app: FastAPI):
     await TextDocumentProcessor.init(client)
     document_extract =await init_ocr()
     app.state.document_extract = document_extract
+    app.state.ingestion = IngestionQueue(
+        document_extract,
+        max_concurrency=settings.INGESTION_MAX_CONCURRENCY,
+    )
+    app.state.upload_listener = PresignedUploadListener(
+        app.state.ingestion,
+        DocumentBucket(file_prefix="contracts"),
+        mode=settings.UPLOAD_LISTENER_MODE,
+        poll_interval=settings.UPLOAD_LISTENER_POLL_INTERVAL,
+        # Uploads may start right before the URL expires and take a while
+        pending_window=settings.PRESIGNED_URL_EXPIRY + 3600,
+        max_size=settings.MAX_UPLOAD_SIZE,
+        temp_dir=settings.UPLOAD_TEMP_DIR,
+    )
+    app.state.upload_listener.start()
+    agent_registry.warm_up()
     yield
+    await app.state.upload_listener.stop()
+    await app.state.ingestion.shutdown()
+    await agent_registry.close()
+    document_extract.close()
     
 
 
@@ -136,4 +165,5 @@ app.include_router(contract_router)
 app.include_router(analytics_router)
 app.include_router(policy_router)
 app.include_router(suggestions_router)
+app.include_router(health_router)
 
@@ -1,7 +1,9 @@
 from datetime import timedelta
 import random
 import string
+import hashlib
 import uuid
+from typing import Any, BinaryIO
 from fastapi import UploadFile
 from miniopy_async.error import S3Error  # type: ignore
 from miniopy_async.api import Minio  # type: ignore
@@ -21,6 +23,7 @@ def sanitize_filename(filename: str) -> str:
 IMAGES_BUCKET_NAME = "images"
 DOCUMENTS_BUCKET_NAME = "documents"
 WA_SIM_BUCKET_NAME = "wa-sim"
+STREAM_PART_SIZE = 5 * 1024 * 1024  # S3 minimum multipart part size
 
 async def init_minio_client(
     minio_host: str, minio_port: int, minio_root_user: str, minio_root_password: str
@@ -74,6 +77,37 @@ class Bucket:
         )
         return object_name
 
+    async def put_stream(
+        self,
+        stream: Any,
+        object_name: str | None = None,
+        content_type: str | None = None,
+        filename: str | None = None,
+        part_size: int = STREAM_PART_SIZE,
+    ) -> str:
+        """
+        Upload from an object whose (sync or async) read() yields the bytes.
+
+        Parts are read and sent one at a time, so memory use is bounded by
+        `part_size` regardless of the object size.
+        """
+        if object_name is None:
+            object_name = str(uuid.uuid4())
+
+        await self.client.put_object(
+            bucket_name=self.bucket_name,
+            object_name=f"{self.file_prefix}/{object_name}",
+            data=stream,
+            length=-1,
+            part_size=part_size,
+            num_parallel_uploads=1,
+            content_type=content_type or "application/octet-stream",
+            metadata={
+             "filename": sanitize_filename(filename or object_name),
+            },
+        )
+        return object_name
+
     async def get(self, object_name: str) -> tuple[bytes, str, str]:
         try:
             res = await self.client.get_object(
@@ -95,6 +129,46 @@ class Bucket:
         res.close()
         return (data, filename, content_type)
 
+    async def stat(self, object_name: str) -> Any | None:
+        """Object metadata (size, content type...), or None if it does not exist."""
+        try:
+            return await self.client.stat_object(
+                bucket_name=self.bucket_name,
+                object_name=f"{self.file_prefix}/{object_name}",
+            )
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            raise e
+
+    async def download(
+        self, object_name: str, target: BinaryIO, chunk_size: int = STREAM_PART_SIZE
+    ) -> str:
+        """
+        Stream an object into `target` one chunk at a time and return its SHA-256.
+
+        Unlike get(), the object is never held in memory as a whole.
+        """
+        try:
+            res = await self.client.get_object(
+                bucket_name=self.bucket_name,
+                object_name=f"{self.file_prefix}/{object_name}",
+            )
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                raise exceptions.NotFound
+            else:
+                raise e
+
+        digest = hashlib.sha256()
+        try:
+            async for chunk in res.content.iter_chunked(chunk_size):
+                digest.update(chunk)
+                target.write(chunk)
+        finally:
+            res.close()
+        return digest.hexdigest()
+
     async def delete(self, object_name: str) -> None:
         await self.client.remove_object(
             bucket_name=self.bucket_name,
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import List, Optional
+from beanie import Document, Indexed
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class ComplianceCacheEntry(Document):
+    cache_key: Indexed(str, unique=True)
+    clause_id: Optional[str] = None  # the clause's id when it was reviewed; None for contract-level findings
+    findings: List[dict] = Field(default_factory=list)
+    score: Optional[float] = None  # the specialists' average score for the clause
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: Optional[datetime] = None  # set when stored
+    last_hit_at: Optional[datetime] = None
+
+    class Settings:
+        name = "compliance_cache"
+        # Mongo removes entries once `expires_at` has passed
+        indexes = [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)]
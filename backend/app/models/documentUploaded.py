@@ -35,6 +35,7 @@ class ContractDocument(Document):
     category: Optional[str] = None
     clauses: Optional[list[clause]] = None
     content: Optional[str] = None
+    segmented_content: Optional[str] = None  # the content `clauses` were segmented from
     status: ContractStatus = ContractStatus.DRAFT
     created_at: datetime = Field(default_factory=datetime.utcnow)
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
@@ -42,6 +43,10 @@ class ContractDocument(Document):
     last_updated: datetime = Field(default_factory=datetime.utcnow)
     risks: Optional[list[dict]] = None
     compliance_score: Optional[float] = None
+    extraction_stats: Optional[dict] = None
+    awaiting_upload: bool = False
+    duplicate_of: Optional[PydanticObjectId] = None  # closest reviewed near-duplicate
+    duplicate_similarity: Optional[float] = None
     
     class Settings:
         name = "contracts"
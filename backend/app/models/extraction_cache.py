@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+from beanie import Document, Indexed
+from pydantic import Field
+
+
+class ExtractionCacheEntry(Document):
+    cache_key: Indexed(str, unique=True)
+    file_hash: str
+    text: str
+    pages: list[dict] = Field(default_factory=list)
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_hit_at: Optional[datetime] = None
+
+    class Settings:
+        name = "extraction_cache"
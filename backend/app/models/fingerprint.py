@@ -0,0 +1,16 @@
+from datetime import datetime
+from beanie import Document, Indexed, PydanticObjectId
+from pydantic import Field
+
+
+class ContractFingerprint(Document):
+    """MinHash signature of a contract's content and its LSH band keys."""
+    contract_id: Indexed(PydanticObjectId, unique=True)
+    signature: list[int]
+    bands: list[str]
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "contract_fingerprints"
+        # Multikey index: one entry per band key
+        indexes = ["bands"]
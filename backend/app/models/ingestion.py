@@ -0,0 +1,29 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+
+
+class IngestionStage(str, Enum):
+    QUEUED = "queued"
+    EXTRACTING = "extracting"
+    DIGITAL = "digital"
+    OCR = "ocr"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class IngestionJob(Document):
+    contract_id: PydanticObjectId
+    file_name: str
+    stage: IngestionStage = IngestionStage.QUEUED
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "ingestion_jobs"
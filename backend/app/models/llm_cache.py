@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Any, Optional
+from beanie import Document, Indexed
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class LLMCacheEntry(Document):
+    cache_key: Indexed(str, unique=True)
+    model_id: str
+    response: Any  # the parsed response: a dumped model, or JSON
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+    last_hit_at: Optional[datetime] = None
+
+    class Settings:
+        name = "llm_cache"
+        # Mongo removes entries once `expires_at` has passed
+        indexes = [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)]
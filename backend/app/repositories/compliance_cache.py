@@ -0,0 +1,52 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+from beanie.operators import In
+from pymongo.errors import DuplicateKeyError
+from app.models.compliance_cache import ComplianceCacheEntry
+
+
+class ComplianceCacheRepository:
+
+    @staticmethod
+    async def get_many(cache_keys: Iterable[str]) -> Dict[str, ComplianceCacheEntry]:
+        keys = list(set(cache_keys))
+        if not keys:
+            return {}
+        now = datetime.utcnow()
+        entries = await ComplianceCacheEntry.find(
+            In(ComplianceCacheEntry.cache_key, keys), ComplianceCacheEntry.expires_at > now
+        ).to_list()
+        if entries:
+            await ComplianceCacheEntry.find(
+                In(ComplianceCacheEntry.cache_key, [entry.cache_key for entry in entries])
+            ).update({
+                "$inc": {"hits": 1},
+                "$set": {"last_hit_at": now},
+            })
+        return {entry.cache_key: entry for entry in entries}
+
+    @staticmethod
+    async def put(entry: ComplianceCacheEntry, ttl: int) -> None:
+        now = datetime.utcnow()
+        entry.created_at = now
+        entry.expires_at = now + timedelta(seconds=ttl)
+        try:
+            await entry.insert()
+        except DuplicateKeyError:
+            # Expired but not yet removed, or reviewed concurrently: keep the fresh findings
+            await ComplianceCacheEntry.find_one(ComplianceCacheEntry.cache_key == entry.cache_key).update({
+                "$set": {
+                    "clause_id": entry.clause_id,
+                    "findings": entry.findings,
+                    "score": entry.score,
+                    "hits": 0,
+                    "created_at": entry.created_at,
+                    "expires_at": entry.expires_at,
+                    "last_hit_at": None,
+                },
+            })
+
+    @staticmethod
+    async def put_many(entries: List[ComplianceCacheEntry], ttl: int) -> None:
+        await asyncio.gather(*(ComplianceCacheRepository.put(entry, ttl) for entry in entries))
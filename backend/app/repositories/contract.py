@@ -1,7 +1,8 @@
 from typing import List, Optional
 from datetime import datetime
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
 from app.models.documentUploaded import ContractDocument, ContractStatus
+from app.repositories.fingerprint import FingerprintRepository
 
 
 class ContractRepository:
@@ -17,6 +18,43 @@ class ContractRepository:
         await contract.insert()
         return contract
 
+    @staticmethod
+    async def claim_presigned_upload(file_name: str) -> Optional[ContractDocument]:
+        """
+        Atomically take a contract that awaits its presigned upload.
+
+        Returns None when no contract waits for `file_name` or another
+        worker claimed it first.
+        """
+        return await ContractDocument.find_one(
+            ContractDocument.file_name == file_name,
+            ContractDocument.awaiting_upload == True,  # noqa: E712
+        ).update(
+            {"$set": {"awaiting_upload": False, "uploaded_at": datetime.utcnow()}},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+
+    @staticmethod
+    async def release_presigned_upload(contract_id: PydanticObjectId) -> None:
+        """Put a claimed contract back in the waiting state so it is picked up again."""
+        await ContractDocument.find_one(ContractDocument.id == contract_id).update(
+            {"$set": {"awaiting_upload": True}}
+        )
+
+    @staticmethod
+    async def reject_presigned_upload(contract_id: PydanticObjectId) -> None:
+        """Mark a claimed contract whose upload will never be ingested as rejected."""
+        await ContractDocument.find_one(ContractDocument.id == contract_id).update(
+            {"$set": {"status": ContractStatus.REJECTED}}
+        )
+
+    @staticmethod
+    async def list_awaiting_upload(since: datetime, limit: int = 100) -> List[ContractDocument]:
+        return await ContractDocument.find(
+            ContractDocument.awaiting_upload == True,  # noqa: E712
+            ContractDocument.created_at >= since,
+        ).sort(("created_at", 1)).limit(limit).to_list()
+
     @staticmethod
     async def get_contract_by_id(contract_id: PydanticObjectId) -> Optional[ContractDocument]:
         return await ContractDocument.get(contract_id)
@@ -89,4 +127,5 @@ class ContractRepository:
         if not contract:
             return False
         await contract.delete()
+        await FingerprintRepository.delete(contract_id)
         return True
@@ -0,0 +1,39 @@
+from dataclasses import asdict
+from datetime import datetime
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.services.extractor import ExtractionResult, PageExtraction
+
+
+class ExtractionCacheRepository:
+
+    @staticmethod
+    async def get(cache_key: str) -> Optional[ExtractionResult]:
+        entry = await ExtractionCacheEntry.find_one(ExtractionCacheEntry.cache_key == cache_key)
+        if not entry:
+            return None
+        await entry.update({
+            "$inc": {"hits": 1},
+            "$set": {"last_hit_at": datetime.utcnow()},
+        })
+        return ExtractionResult(
+            text=entry.text,
+            pages=[PageExtraction(**page) for page in entry.pages],
+            cache_hit=True,
+        )
+
+    @staticmethod
+    async def put(cache_key: str, file_hash: str, result: ExtractionResult) -> None:
+        entry = ExtractionCacheEntry(
+            cache_key=cache_key,
+            file_hash=file_hash,
+            text=result.text,
+            # Page text is already part of `text`; keep only the per-page decisions
+            pages=[{**asdict(page), "text": ""} for page in result.pages],
+        )
+        try:
+            await entry.insert()
+        except DuplicateKeyError:
+            # Another upload of the same file finished first
+            pass
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import List
+from beanie import PydanticObjectId
+from app.models.fingerprint import ContractFingerprint
+
+
+class FingerprintRepository:
+
+    @staticmethod
+    async def upsert(contract_id: PydanticObjectId, signature: List[int], bands: List[str]) -> None:
+        await ContractFingerprint.find_one(ContractFingerprint.contract_id == contract_id).upsert(
+            {"$set": {"signature": signature, "bands": bands, "created_at": datetime.utcnow()}},
+            on_insert=ContractFingerprint(contract_id=contract_id, signature=signature, bands=bands),
+        )
+
+    @staticmethod
+    async def candidates(
+        bands: List[str], exclude: PydanticObjectId, limit: int = 200
+    ) -> List[ContractFingerprint]:
+        """Fingerprints sharing at least one LSH band with `bands`."""
+        return await ContractFingerprint.find(
+            {"bands": {"$in": bands}, "contract_id": {"$ne": exclude}}
+        ).limit(limit).to_list()
+
+    @staticmethod
+    async def delete(contract_id: PydanticObjectId) -> None:
+        await ContractFingerprint.find(ContractFingerprint.contract_id == contract_id).delete()
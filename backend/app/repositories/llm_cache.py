@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from typing import Any, Optional
+from pymongo.errors import DuplicateKeyError
+from app.models.llm_cache import LLMCacheEntry
+
+
+class LLMCacheRepository:
+
+    @staticmethod
+    async def get(cache_key: str) -> Optional[Any]:
+        now = datetime.utcnow()
+        # The TTL monitor runs about once a minute; skip entries it has not removed yet
+        entry = await LLMCacheEntry.find_one(
+            LLMCacheEntry.cache_key == cache_key, LLMCacheEntry.expires_at > now
+        )
+        if not entry:
+            return None
+        await entry.update({
+            "$inc": {"hits": 1},
+            "$set": {"last_hit_at": now},
+        })
+        return entry.response
+
+    @staticmethod
+    async def put(cache_key: str, model_id: str, response: Any, ttl: int) -> None:
+        now = datetime.utcnow()
+        entry = LLMCacheEntry(
+            cache_key=cache_key,
+            model_id=model_id,
+            response=response,
+            created_at=now,
+            expires_at=now + timedelta(seconds=ttl),
+        )
+        try:
+            await entry.insert()
+        except DuplicateKeyError:
+            # An expired entry the TTL monitor has not removed yet, or a
+            # concurrent identical call: keep the fresh response
+            await LLMCacheEntry.find_one(LLMCacheEntry.cache_key == cache_key).update({
+                "$set": {
+                    "model_id": model_id,
+                    "response": response,
+                    "hits": 0,
+                    "created_at": entry.created_at,
+                    "expires_at": entry.expires_at,
+                    "last_hit_at": None,
+                },
+            })
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from beanie import PydanticObjectId
 from datetime import datetime
 from app.models.policy import Template,  PoStatus  ,Clause
@@ -30,6 +30,12 @@ class TemplateRepository:
             (Template.country == country) & (Template.policy_type == policy_type) & (Template.status == PoStatus.ACTIVE)
         )
 
+    @staticmethod
+    async def active_versions() -> List[Tuple[str, int]]:
+        """(id, version) of every active template, the policy set compliance is checked against."""
+        templates = await Template.find(Template.status == PoStatus.ACTIVE).to_list()
+        return sorted((str(template.id), template.version) for template in templates)
+
     @staticmethod
     async def list_templates(country: Optional[str] = None, policy_type: Optional[str] = None) -> List[Template]:
         query = Template.find({})
@@ -1,7 +1,7 @@
 from agno.agent import Agent
 from app.config import settings
 from typing import List, Dict, Any, Generator
-from agno.models.openai import OpenAIChat
+from app.services.registry import agent_registry
 
 def gemini_pro_connector(messages: List[Dict[str, Any]], model_kwargs: Dict[str, Any], **kwargs) -> Any:
     """
@@ -46,9 +46,5 @@ gemini_pro = gemini_pro_connector
 
 agent = Agent(
     name="abstract_worker_agent",
-    model=OpenAIChat(
-        id=settings.GROQ_MODEL,
-        api_key=settings.GROQ_API_KEY,
-        base_url=settings.GROQ_BASE_URL,
-    ),
+    model=agent_registry.model(),
     stream=False)
\ No newline at end of file
@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import mimetypes
+import os
+import tempfile
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+from starlette.datastructures import UploadFile
+from app.minio import Bucket, sanitize_filename
+from app.models.documentUploaded import ContractDocument
+from app.config import settings
+from app.services.ingestion import IngestionQueue
+from app.services.near_duplicate import index_contract
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class BulkItem:
+    """A file of a bulk import, staged on local disk."""
+    file_name: str
+    path: Path
+    sha256: str
+    size: int
+    content_type: str
+    entry: dict  # its line in the result manifest
+
+
+def _spool(source: BinaryIO, temp_dir: Optional[str], suffix: str, max_size: int) -> Tuple[Path, str, int]:
+    """Copies `source` to a temporary file, hashing it on the way. Raises ValueError past `max_size`."""
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, dir=temp_dir, suffix=suffix) as target:
+        path = Path(target.name)
+        try:
+            while chunk := source.read(COPY_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise ValueError(f"File exceeds the maximum upload size of {max_size // (1024 * 1024)} MB.")
+                digest.update(chunk)
+                target.write(chunk)
+        except BaseException:
+            target.close()
+            path.unlink(missing_ok=True)
+            raise
+    return path, digest.hexdigest(), size
+
+
+def stage_bulk_files(
+    files: Sequence[UploadFile],
+    archive: Optional[UploadFile],
+    allowed_extensions: Sequence[str],
+    max_file_size: int,
+    max_files: int,
+    max_total_size: int,
+    temp_dir: Optional[str] = None,
+) -> Tuple[List[BulkItem], List[dict]]:
+    """
+    Spools form files and zip archive members to disk (blocking; run it in a thread).
+
+    Returns the staged items and the manifest entries of files that were
+    skipped (unsupported type, too large, too many files). Archive members
+    are read by name only, never extracted to their stored paths.
+    """
+    if temp_dir:
+        os.makedirs(temp_dir, exist_ok=True)
+    allowed = {ext.lower() for ext in allowed_extensions}
+    items: List[BulkItem] = []
+    skipped: List[dict] = []
+    total_size = 0
+
+    def add(file_name: str, source: BinaryIO, declared_size: Optional[int], content_type: Optional[str]) -> None:
+        nonlocal total_size
+        suffix = Path(file_name).suffix.lower()
+        entry = {"file_name": file_name, "status": "pending"}
+        if suffix not in allowed:
+            skipped.append({**entry, "status": "skipped", "error": f"Unsupported file type '{suffix}'."})
+            return
+        if len(items) >= max_files:
+            skipped.append({**entry, "status": "skipped", "error": f"More than {max_files} files in one import."})
+            return
+        if declared_size is not None and (declared_size > max_file_size or total_size + declared_size > max_total_size):
+            skipped.append({**entry, "status": "skipped", "error": "File exceeds the upload size limits."})
+            return
+        try:
+            path, sha256, size = _spool(source, temp_dir, suffix, min(max_file_size, max_total_size - total_size))
+        except ValueError as e:
+            skipped.append({**entry, "status": "skipped", "error": str(e)})
+            return
+        total_size += size
+        content_type = content_type or mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+        items.append(BulkItem(file_name, path, sha256, size, content_type, entry))
+
+    try:
+        for upload in files:
+            if upload.filename:
+                add(os.path.basename(upload.filename), upload.file, upload.size, upload.content_type)
+
+        if archive is not None:
+            with zipfile.ZipFile(archive.file) as zip_file:
+                for info in zip_file.infolist():
+                    name = os.path.basename(info.filename)
+                    if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                        continue
+                    with zip_file.open(info) as member:
+                        add(name, member, info.file_size, None)
+    except BaseException:
+        for item in items:
+            item.path.unlink(missing_ok=True)
+        raise
+
+    return items, skipped
+
+
+class BulkIngestion:
+    """
+    Imports many contracts in one go.
+
+    Objects are uploaded to MinIO concurrently, inline extraction runs on
+    a thread pool of this import's own with `extraction_concurrency`
+    threads (so it neither waits for nor holds up the background ingestion
+    pool), and contracts are written with `insert_many` in batches of
+    `batch_size`. The object of a file that fails after its upload is
+    deleted again.
+    """
+
+    def __init__(
+        self,
+        ingestion: IngestionQueue,
+        bucket: Bucket,
+        upload_concurrency: int = 8,
+        extraction_concurrency: int = 4,
+        batch_size: int = 50,
+        category: Optional[str] = None,
+        pdf_backend: Optional[str] = None,
+        background: bool = False,
+    ):
+        self.ingestion = ingestion
+        self.bucket = bucket
+        self.batch_size = batch_size
+        self.category = category
+        self.pdf_backend = pdf_backend
+        self.background = background
+        self._upload_slots = asyncio.Semaphore(upload_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=extraction_concurrency, thread_name_prefix="bulk-extraction")
+        self._batch: List[Tuple[ContractDocument, BulkItem]] = []
+        self._batch_lock = asyncio.Lock()
+
+    async def run(self, items: List[BulkItem]) -> List[dict]:
+        """
+        Imports the staged items and returns their manifest entries.
+
+        With `background`, contracts are stored without content and an
+        ingestion job is queued per file instead of extracting inline.
+        """
+        try:
+            await asyncio.gather(*(self._process(item) for item in items))
+            async with self._batch_lock:
+                await self._flush()
+        finally:
+            self._executor.shutdown(wait=False)
+        return [item.entry for item in items]
+
+    async def _process(self, item: BulkItem) -> None:
+        keep_file = False
+        batched = False
+        try:
+            async with self._upload_slots:
+                with open(item.path, "rb") as data:
+                    file_id = await self.bucket.put_stream(
+                        data,
+                        object_name=f"{uuid.uuid4().hex}_{sanitize_filename(item.file_name)}",
+                        content_type=item.content_type,
+                        filename=item.file_name,
+                    )
+            item.entry["file_id"] = file_id
+
+            contract = ContractDocument(file_name=item.file_name, file_id=file_id, category=self.category)
+            if not self.background:
+                result = await self.ingestion.extract(
+                    item.path, file_hash=item.sha256, pdf_backend=self.pdf_backend, executor=self._executor
+                )
+                if result.error:
+                    raise RuntimeError(result.error)
+                contract.content = result.text
+                contract.extraction_stats = result.summary() if result.pages else None
+                item.entry["cache_hit"] = result.cache_hit
+            # Ids are assigned up front: insert_many does not set them on the documents
+            contract.id = PydanticObjectId()
+            keep_file = self.background
+
+            async with self._batch_lock:
+                self._batch.append((contract, item))
+                batched = True
+                if len(self._batch) >= self.batch_size:
+                    await self._flush()
+        except Exception as e:
+            print(f"Bulk import of {item.file_name} failed: {e}")
+            item.entry.update(status="failed", error=str(e))
+            if not batched:
+                await self._delete_object(item)
+        finally:
+            if not keep_file:
+                item.path.unlink(missing_ok=True)
+
+    async def _flush(self) -> None:
+        """Writes the pending batch. Must be called with `_batch_lock` held."""
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+
+        failed: Dict[int, str] = {}
+        try:
+            await ContractDocument.insert_many([contract for contract, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+        except Exception as e:
+            failed = {index: str(e) for index in range(len(batch))}
+
+        for index, (contract, item) in enumerate(batch):
+            if index in failed:
+                item.entry.update(status="failed", error=failed[index])
+                item.path.unlink(missing_ok=True)
+                await self._delete_object(item)
+                continue
+            item.entry.update(status="created", contract_id=str(contract.id))
+            if not self.background:
+                if await index_contract(contract, settings.NEAR_DUPLICATE_THRESHOLD):
+                    item.entry["duplicate_of"] = str(contract.duplicate_of)
+                continue
+            try:
+                job = await self.ingestion.submit(contract, item.path, item.sha256, self.pdf_backend)
+            except Exception as e:
+                item.entry["error"] = f"Stored without content, queueing extraction failed: {e}"
+                item.path.unlink(missing_ok=True)
+                continue
+            item.entry.update(status="queued", job_id=str(job.id))
+
+    async def _delete_object(self, item: BulkItem) -> None:
+        """Removes the uploaded object of a file no contract was stored for."""
+        file_id = item.entry.pop("file_id", None)
+        if file_id is None:
+            return
+        try:
+            await self.bucket.delete(file_id)
+        except Exception as e:
+            print(f"Could not delete orphaned object {file_id}: {e}")
@@ -0,0 +1,162 @@
+import bisect
+import difflib
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Set, Tuple
+
+
+@dataclass
+class MappedClause:
+    """A clause of the original text and where it lies in the new one."""
+    data: dict  # the clause, as a dict
+    start: Optional[int] = None  # its word span in the new content; None for clauses without text
+    end: Optional[int] = None
+    touched: bool = False  # an edit falls inside the span
+
+
+@dataclass
+class ClauseMapping:
+    content: str
+    clauses: List[MappedClause]
+    word_spans: List[Tuple[int, int]]  # character span of each word of `content`
+    # Word ranges of `content` inserted outside every clause, with how many words they add
+    insertions: List[Tuple[int, int, int]] = field(default_factory=list)
+    changed_words: int = 0  # words of `content` the diff does not match to the original
+
+    @property
+    def uncovered_words(self) -> int:
+        return sum(added for _, _, added in self.insertions)
+
+    def text(self, start: int, end: int) -> str:
+        """The new content from word `start` up to word `end`, original spacing kept."""
+        if end <= start:
+            return ""
+        return self.content[self.word_spans[start][0]:self.word_spans[end - 1][1]]
+
+
+def map_clauses(original_content: str, original_clauses: Sequence, content: str) -> Optional[ClauseMapping]:
+    """
+    Maps clauses segmented from `original_content` onto `content`.
+
+    Each clause is located in the original text and its span carried through
+    a word-level diff. Returns None when a clause cannot be located in the
+    original text.
+    """
+    old_words = original_content.split()
+    word_spans = [m.span() for m in re.finditer(r"\S+", content)]
+    new_words = [content[start:end] for start, end in word_spans]
+    old_joined = " ".join(old_words)
+    # Character offset of each word in `old_joined`
+    old_offsets, offset = [], 0
+    for word in old_words:
+        old_offsets.append(offset)
+        offset += len(word) + 1
+
+    def locate(words: List[str], cursor: int) -> int:
+        """Index of the first word of `words` in the original, searching from word `cursor`."""
+        needle = " ".join(words)
+        for begin in (cursor, 0):
+            position = old_joined.find(needle, old_offsets[begin] if begin < len(old_offsets) else len(old_joined))
+            while position >= 0:
+                index = bisect.bisect_left(old_offsets, position)
+                if index < len(old_offsets) and old_offsets[index] == position:
+                    return index
+                position = old_joined.find(needle, position + 1)
+        return -1
+
+    located: List[Tuple[dict, int, int]] = []
+    cursor = 0
+    for clause in original_clauses:
+        data = dict(clause if isinstance(clause, dict) else clause.model_dump())
+        clause_words = (data.get("text") or "").split()
+        if not clause_words:
+            located.append((data, -1, -1))
+            continue
+        start = locate(clause_words, cursor)
+        if start < 0:
+            return None
+        located.append((data, start, start + len(clause_words)))
+        cursor = start
+
+    boundaries = {position for _, start, end in located if start >= 0 for position in (start, end)}
+    opcodes = _slide_to_boundaries(
+        difflib.SequenceMatcher(None, old_words, new_words, autojunk=False).get_opcodes(),
+        old_words, new_words, boundaries,
+    )
+
+    def map_start(i: int) -> int:
+        for tag, i1, i2, j1, _ in opcodes:
+            if i1 <= i < i2:
+                return j1 + (i - i1) if tag == "equal" else j1
+        return len(new_words)
+
+    def map_end(i: int) -> int:
+        for tag, i1, i2, j1, j2 in opcodes:
+            if i1 < i <= i2:
+                return j1 + (i - i1) if tag == "equal" else j2
+        return 0
+
+    mapped: List[MappedClause] = []
+    for data, start, end in located:
+        if start < 0:
+            mapped.append(MappedClause(data))
+            continue
+        # Any edit inside the span; insertions only count strictly inside it
+        touched = any(
+            tag != "equal" and (start < i1 < end if i1 == i2 else i1 < end and i2 > start)
+            for tag, i1, i2, _, _ in opcodes
+        )
+        mapped.append(MappedClause(data, map_start(start), map_end(end), touched))
+
+    covered = [(item.start, item.end) for item in mapped if item.start is not None]
+    insertions = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        added = (j2 - j1) - (i2 - i1)
+        if tag in ("insert", "replace") and added > 0 and not any(s <= j1 and j2 <= e for s, e in covered):
+            insertions.append((j1, j2, added))
+    changed_words = sum(j2 - j1 for tag, _, _, j1, j2 in opcodes if tag != "equal")
+    return ClauseMapping(content, mapped, word_spans, insertions, changed_words)
+
+
+def _slide_to_boundaries(
+    opcodes: List[Tuple[str, int, int, int, int]],
+    old_words: Sequence[str],
+    new_words: Sequence[str],
+    boundaries: Set[int],
+) -> List[Tuple[str, int, int, int, int]]:
+    """
+    Moves pure insertions and deletions onto clause boundaries where that
+    gives the same diff.
+
+    In repetitive text ("... within thirty days." closing every clause) a
+    deleted clause can equally be reported as the tail of the clause before
+    it plus the head of the deleted one; sliding the block until it starts
+    at a boundary attributes the change to the right clause.
+    """
+    ops = [list(op) for op in opcodes]
+    for k, op in enumerate(ops):
+        tag, i1, i2, j1, j2 = op
+        if tag not in ("delete", "insert") or i1 in boundaries:
+            continue
+        before = ops[k - 1] if k > 0 and ops[k - 1][0] == "equal" else None
+        after = ops[k + 1] if k + 1 < len(ops) and ops[k + 1][0] == "equal" else None
+        words, a, b = (old_words, i1, i2) if tag == "delete" else (new_words, j1, j2)
+
+        left = 0
+        while before and left < before[2] - before[1] and words[a - left - 1] == words[b - left - 1]:
+            left += 1
+        right = 0
+        while after and right < after[2] - after[1] and b + right < len(words) and words[a + right] == words[b + right]:
+            right += 1
+        shifts = [shift for shift in range(-left, right + 1) if i1 + shift in boundaries]
+        if not shifts:
+            continue
+        shift = min(shifts, key=abs)
+        op[1:] = [i1 + shift, i2 + shift, j1 + shift, j2 + shift]
+        if before:
+            before[2] += shift
+            before[4] += shift
+        if after:
+            after[1] += shift
+            after[3] += shift
+    return [tuple(op) for op in ops]
@@ -0,0 +1,66 @@
+import copy
+import hashlib
+import json
+from typing import Dict, Iterable, List, Sequence
+from app.config import settings
+from app.models.compliance_cache import ComplianceCacheEntry
+from app.repositories.compliance_cache import ComplianceCacheRepository
+from app.repositories.policy import TemplateRepository
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+async def policy_set_version() -> str:
+    """Fingerprint of the active policy templates, plus POLICY_SET_REVISION."""
+    versions = await TemplateRepository.active_versions()
+    return _digest(settings.POLICY_SET_REVISION, *(f"{template_id}@{version}" for template_id, version in versions))
+
+
+def review_namespace(policy_version: str, reviewers: Sequence[str]) -> str:
+    """Cache namespace for a policy set and the agents (model and instructions) reviewing against it."""
+    return _digest(policy_version, *reviewers)[:32]
+
+
+def clause_key(namespace: str, heading: str, text: str) -> str:
+    """Key of a clause's findings: its heading and text, whitespace-normalised, not its id."""
+    return f"clause:{namespace}:{_digest(' '.join((heading or '').split()), ' '.join(text.split()))}"
+
+
+def outline_key(namespace: str, clause_keys: Sequence[str]) -> str:
+    """Key of the findings about the contract as a whole (e.g. missing provisions), by its clauses."""
+    return f"contract:{namespace}:{_digest(*clause_keys)}"
+
+
+def findings_for(entry: ComplianceCacheEntry, clause_id: str) -> List[dict]:
+    """The entry's findings, with the clause's id at review time replaced by its current one."""
+    findings = copy.deepcopy(entry.findings)
+    if entry.clause_id is not None and entry.clause_id != clause_id:
+        for finding in findings:
+            for affected in finding.get("affected_clauses") or []:
+                if str(affected.get("clause_id")) == entry.clause_id:
+                    affected["clause_id"] = clause_id
+    return findings
+
+
+async def lookup(cache_keys: Iterable[str]) -> Dict[str, ComplianceCacheEntry]:
+    if settings.COMPLIANCE_CACHE_TTL <= 0:
+        return {}
+    try:
+        return await ComplianceCacheRepository.get_many(cache_keys)
+    except Exception as e:
+        print(f"Compliance cache lookup failed: {e}")
+        return {}
+
+
+async def store(entries: List[dict]) -> None:
+    """Stores entries given as ComplianceCacheEntry fields."""
+    if settings.COMPLIANCE_CACHE_TTL <= 0 or not entries:
+        return
+    try:
+        await ComplianceCacheRepository.put_many(
+            [ComplianceCacheEntry(**entry) for entry in entries], settings.COMPLIANCE_CACHE_TTL
+        )
+    except Exception as e:
+        print(f"Compliance cache write failed: {e}")
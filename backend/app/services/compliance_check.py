@@ -1,16 +1,22 @@
 import json
-from typing import List, Optional, Dict
+from typing import Any, AsyncIterator, List, Optional, Dict, Sequence, Tuple
 from pydantic import BaseModel, Field
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.knowledge.knowledge import Knowledge 
-from agno.vectordb.qdrant import Qdrant
-from app.config import settings
 from duckduckgo_search import DDGS
 from datetime import datetime
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
-
+import asyncio
+import functools
+from contextlib import aclosing
+from agno.run.agent import RunOutput
+from app.config import settings
+from app.services import compliance_cache
+from app.services.llm import LLMTimeoutError, arun_cached
+from app.services.llm_cache import ResponseCache
+from app.services.registry import agent_registry
+from app.services.scheduler import agent_scheduler
+from app.services.tokens import count_tokens, pack
 
 # ============= ENUMS =============
 
@@ -111,37 +117,34 @@ class ComplianceCheckResult(BaseModel):
     contract_id: str
     analysis_timestamp: datetime = Field(default_factory=datetime.now)
     agents_used: List[AnalysisSource]
+    dropped_agents: List[AnalysisSource] = Field(default_factory=list)  # failed or cut off by the deadline
     executive_summary: str
     recommendation: str
     required_actions: List[str] = Field(default_factory=list)
 
+# finding_id prefix of each agent's findings, numbered from 001 per check
+FINDING_ID_PREFIXES = {
+    AnalysisSource.COMPLIANCE_AGENT: "COMP",
+    AnalysisSource.TARIFF_AGENT: "TAR",
+    AnalysisSource.EXTERNAL_REVIEW_AGENT: "EXT",
+}
+
 class ClauseWithCompliance(BaseModel):
     clause_id: str
     text: str
     heading: Optional[str] = None
     level: int
 
-def create_base_knowledge(collection_name: str = "company_policies"):
-    vector_db = Qdrant(
-        collection=collection_name,
-        url=settings.QDRANT_URL,
-    )
-    knowledge_base = Knowledge(
-        vector_db=vector_db,
-        max_results=5,
-    )
-    return knowledge_base
+def create_base_knowledge(collection_name: str = "company_policies") -> Knowledge:
+    return agent_registry.knowledge(collection_name)
 
 
+@agent_registry.register
 def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
     knowledge_base = create_base_knowledge(collection_name)
     return Agent(
         name="ComplianceChecker",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are a contract compliance expert checking against company policies.",
             "Review each clause against retrieved company policies from the knowledge base.",
@@ -171,15 +174,12 @@ def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
     )
 
 
+@agent_registry.register
 def create_tariff_agent(collection_name: str = "company_policies") -> Agent:
     knowledge_base = create_base_knowledge(collection_name)
     return Agent(
         name="TariffManagementAgent",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are a Tariff and Financial Risk expert checking against company policies.",
             "Review each clause for financial risks, missing tariff classifications, and cost-protection issues.",
@@ -209,14 +209,11 @@ def create_tariff_agent(collection_name: str = "company_policies") -> Agent:
     )
 
 
+@agent_registry.register
 def create_risk_review_agent() -> Agent:
     return Agent(
         name="ExternalRiskReviewAgent",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are an independent risk auditor identifying risks and missing provisions BEYOND company policies.",
             "Focus on market standards, legal gaps, missing clauses, and commercially unfavorable terms.",
@@ -300,104 +297,375 @@ def _sanitize_finding_data(finding_data: Dict) -> Dict:
     return sanitized
 
 
-def _run_specialist_agent(agent: Agent, clauses: List[ClauseWithCompliance], contract_id: str, source: AnalysisSource) -> Dict:
-    """Run a specialist agent and return partial findings"""
-    clauses_text = "\n\n".join([
-        f"Clause {c.clause_id} - {c.heading or 'Untitled'}:\n{c.text}"
-        for c in clauses
-    ])
-    prompt = f"""
+def _parse_findings(response: RunOutput) -> Optional[Dict]:
+    """The agent's findings JSON; None when it could not check the clauses."""
+    raw_output = (response.content or "").strip()
+
+    if not raw_output or "unable to check" in raw_output.lower():
+        return None
+
+    if raw_output.startswith("```"):
+        raw_output = raw_output.split("\n", 1)[1]
+        raw_output = raw_output.rsplit("```", 1)[0]
+        raw_output = raw_output.strip()
+
+    data = json.loads(raw_output)
+    if not isinstance(data, dict):
+        raise ValueError("The agent did not return a JSON object.")
+    return data
+
+
+def _clause_block(clause: ClauseWithCompliance) -> str:
+    return f"Clause {clause.clause_id} - {clause.heading or 'Untitled'}:\n{clause.text}"
+
+
+def _outline_line(clause: ClauseWithCompliance) -> str:
+    return f"- Clause {clause.clause_id} - {clause.heading or 'Untitled'}"
+
+
+def _specialist_prompt(
+    clauses: Sequence[ClauseWithCompliance],
+    contract_id: str,
+    context: Sequence[ClauseWithCompliance] = (),
+    part: Optional[Tuple[int, int]] = None,
+) -> str:
+    clauses_text = "\n\n".join(_clause_block(c) for c in clauses) or "(none)"
+    outline = ""
+    if part and part[0] > 0:
+        outline = f"""
+These clauses are batch {part[0] + 1} of {part[1]} of the contract; the other batches are reviewed separately.
+Report issues in these clauses only, not provisions missing from the contract.
+"""
+    elif context:
+        outline_text = "\n".join(_outline_line(c) for c in context)
+        outline = f"""
+The other clauses of the contract are reviewed separately and are listed by heading only.
+Report issues in the clauses given in full below, and provisions missing from the contract as a whole.
+
+Other Clauses:
+{outline_text}
+"""
+    return f"""
 Check these contract clauses for compliance/risks.
 
 Contract ID: {contract_id}
-Total Clauses: {len(clauses)}
-
+Total Clauses: {len(clauses) + len(context)}
+{outline}
 Contract Clauses:
 {clauses_text}
 
 Return JSON strictly in the format defined by your instructions.
 """
-    try:
-        response = agent.run(prompt, contract_id=contract_id) 
-        raw_output = (response.content or "").strip()
 
-        if not raw_output or "unable to check" in raw_output.lower():
-            return {"findings": [], "compliance_score": 1.0}
 
-        if raw_output.startswith("```"):
-            raw_output = raw_output.split("\n", 1)[1]
-            raw_output = raw_output.rsplit("```", 1)[0]
-            raw_output = raw_output.strip()
+async def _run_specialist_agent(
+    agent: Agent,
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    source: AnalysisSource,
+    timeout: Optional[float] = None,
+    context: Sequence[ClauseWithCompliance] = (),
+    cache_scope: str = "",
+    part: Optional[Tuple[int, int]] = None,
+) -> Dict:
+    """
+    Run a specialist agent and return partial findings. Raises LLMTimeoutError past `timeout`.
 
-        data = json.loads(raw_output)
+    `context` lists the contract's other clauses, already reviewed or in
+    other batches; the agent only sees their headings, enough to judge what
+    the contract is missing. `part` is (batch index, batch count) when the
+    clauses are one of several batches; only the first looks for missing
+    provisions. The result has "failed" set when the agent gave no usable answer.
+    """
+    prompt = _specialist_prompt(clauses, contract_id, context, part)
+    try:
+        data = await arun_cached(
+            agent, prompt, _parse_findings, timeout=timeout, cache_scope=cache_scope, contract_id=contract_id
+        )
+        if data is None:
+            return {"findings": [], "compliance_score": 1.0, "failed": True}
         return data
 
+    except LLMTimeoutError:
+        raise
     except Exception as e:
         print(f"Error in specialist agent: {e}")
-        return {"findings": [], "compliance_score": 1.0}
+        return {"findings": [], "compliance_score": 1.0, "failed": True}
 
 
-def check_compliance_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
+async def check_compliance_risks(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    timeout: Optional[float] = None,
+    context: Sequence[ClauseWithCompliance] = (),
+    cache_scope: str = "",
+    part: Optional[Tuple[int, int]] = None,
+) -> Dict:
     print(f"Checking compliance risks for contract {contract_id}, clauses: {len(clauses)}")
     risk_agent = create_compliance_agent()
-    return _run_specialist_agent(risk_agent, clauses, contract_id, AnalysisSource.COMPLIANCE_AGENT)
+    return await _run_specialist_agent(
+        risk_agent, clauses, contract_id, AnalysisSource.COMPLIANCE_AGENT, timeout, context, cache_scope, part
+    )
 
 
-def check_tariff_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
+async def check_tariff_risks(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    timeout: Optional[float] = None,
+    context: Sequence[ClauseWithCompliance] = (),
+    cache_scope: str = "",
+    part: Optional[Tuple[int, int]] = None,
+) -> Dict:
     print(f"Checking tariff risks for contract {contract_id}, clauses: {len(clauses)}")
     tariff_agent = create_tariff_agent()
-    return _run_specialist_agent(tariff_agent, clauses, contract_id, AnalysisSource.TARIFF_AGENT)
+    return await _run_specialist_agent(
+        tariff_agent, clauses, contract_id, AnalysisSource.TARIFF_AGENT, timeout, context, cache_scope, part
+    )
 
 
-def check_external_context_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
+async def check_external_context_risks(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    timeout: Optional[float] = None,
+    context: Sequence[ClauseWithCompliance] = (),
+    cache_scope: str = "",
+    part: Optional[Tuple[int, int]] = None,
+) -> Dict:
     print(f"Checking external context risks for contract {contract_id}, clauses: {len(clauses)}")
     risk_review_agent = create_risk_review_agent()
-    return _run_specialist_agent(risk_review_agent, clauses, contract_id, AnalysisSource.EXTERNAL_REVIEW_AGENT)
+    return await _run_specialist_agent(
+        risk_review_agent, clauses, contract_id, AnalysisSource.EXTERNAL_REVIEW_AGENT, timeout, context, cache_scope, part
+    )
+
+
+def _reviewers() -> List[str]:
+    """What the specialists' answers depend on besides the prompt: model and instructions."""
+    return [
+        ResponseCache.key(agent, "")
+        for agent in (create_compliance_agent(), create_tariff_agent(), create_risk_review_agent())
+    ]
 
 
-def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, collection_name: str = "company_policies") -> ComplianceCheckResult:
+def _affected_ids(finding: Dict) -> set:
+    return {str(item.get("clause_id")) for item in finding.get("affected_clauses") or [] if isinstance(item, dict)}
+
+
+def _score(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+@functools.lru_cache(maxsize=1)
+def _instruction_tokens() -> int:
+    agents = (create_compliance_agent(), create_tariff_agent(), create_risk_review_agent())
+    return max(count_tokens("\n".join(agent.instructions)) for agent in agents)
+
+
+def _batches(
+    to_check: List[ClauseWithCompliance],
+    contract: List[ClauseWithCompliance],
+    contract_id: str,
+    budget: int,
+) -> List[Tuple[List[ClauseWithCompliance], List[ClauseWithCompliance]]]:
     """
-    Main compliance checking function that orchestrates multiple specialist agents in parallel
+    Packs the clauses to check, in order, into batches whose prompts
+    (instructions included) stay within `budget` tokens, so that no call
+    overflows the context and large contracts become several shorter
+    generations run side by side. Each batch comes with its context: the
+    first lists every other clause of `contract` by heading, so that it can
+    judge missing provisions; the others have none.
     """
-    agents_used = []
-    all_findings = []
-    scores = []
-    
-    # Run all three agents in parallel using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        # Submit all agents at once
-        compliance_future = executor.submit(check_compliance_risks, clauses, contract_id)
-        tariff_future = executor.submit(check_tariff_risks, clauses, contract_id)
-        external_future = executor.submit(check_external_context_risks, clauses, contract_id)
-        
-        # Collect results with timeout (30 seconds per agent)
-        for future, source, name in [
-            (compliance_future, AnalysisSource.COMPLIANCE_AGENT, "Compliance"),
-            (tariff_future, AnalysisSource.TARIFF_AGENT, "Tariff"),
-            (external_future, AnalysisSource.EXTERNAL_REVIEW_AGENT, "External Review")
-        ]:
+    overhead = _instruction_tokens() + count_tokens(_specialist_prompt([], contract_id, (), (1, 2)))
+    costs = [count_tokens(_clause_block(c)) + 2 for c in to_check]
+    available = max(budget - overhead, 1)
+    if len(contract) == len(to_check) and sum(costs) <= available:
+        return [(list(to_check), [])]
+    outline_cost = sum(count_tokens(_outline_line(c)) + 1 for c in contract)
+    batches = pack(to_check, costs, available, max(available - outline_cost, 1)) or [[]]
+    first = {id(c) for c in batches[0]}
+    return [(batches[0], [c for c in contract if id(c) not in first])] + [(batch, []) for batch in batches[1:]]
+
+
+async def _cache_reviews(
+    batches: List[Tuple[List[ClauseWithCompliance], List[ClauseWithCompliance]]],
+    batch_scores: List[List[float]],
+    keys: List[str],
+    clauses: List[ClauseWithCompliance],
+    outline: Optional[str],
+    findings: List[Dict],
+) -> None:
+    """Caches a complete run's findings per checked clause, and the rest as contract-level findings."""
+    key_of = {id(clause): key for clause, key in zip(clauses, keys)}
+    checked_ids = {str(c.clause_id) for batch, _ in batches for c in batch}
+    entries = []
+    for (batch, _), scores in zip(batches, batch_scores):
+        score = sum(scores) / len(scores) if scores else None
+        entries += [
+            {
+                "cache_key": key_of[id(clause)],
+                "clause_id": str(clause.clause_id),
+                "findings": [f for f in findings if str(clause.clause_id) in _affected_ids(f)],
+                "score": score,
+            }
+            for clause in batch
+        ]
+    if outline:
+        entries.append({
+            "cache_key": outline,
+            "findings": [f for f in findings if not _affected_ids(f) & checked_ids],
+        })
+    await compliance_cache.store(entries)
+
+
+async def stream_compliance(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    collection_name: str = "company_policies",
+    reused_findings: Optional[List[Dict]] = None,
+    reused_score: Optional[float] = None,
+    reused_clause_count: int = 0,
+    policy_version: Optional[str] = None,
+    deadline: Optional[float] = None,
+    hedge_after: Optional[float] = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Runs the compliance check and yields its progress as (event, data):
+
+    - ("findings", {"source": None, "findings": [...]}) first, for findings
+      reused from a near-duplicate or taken from the cache, if any;
+    - ("findings", {"source": AnalysisSource, "batch": ..., "findings": [...], "compliance_score": ...})
+      as each specialist agent completes a batch of clauses, in completion order;
+    - ("agent_failed", {"source": AnalysisSource, "batch": ..., "error": ..., "timed_out": ...})
+      for an agent that failed on a batch, or was dropped at the deadline;
+    - ("result", ComplianceCheckResult) last.
+
+    Findings are validated ComplianceFinding objects, each yielded once and
+    numbered COMP-/TAR-/EXT-001 onwards in that order.
+    Closing the generator early cancels the agents still running.
+    See `check_compliance` for the arguments.
+    """
+    all_findings = list(reused_findings or [])
+    to_check = list(clauses)
+    cached_scores: List[float] = []
+    namespace, keys, outline, cached = "", [], None, {}
+
+    if policy_version is not None:
+        namespace = compliance_cache.review_namespace(policy_version, _reviewers())
+        keys = [compliance_cache.clause_key(namespace, c.heading, c.text) for c in clauses]
+        # Contract-level findings need the whole contract, which a near-duplicate run does not review
+        if reused_findings is None and clauses:
+            outline = compliance_cache.outline_key(namespace, keys)
+        cached = await compliance_cache.lookup(keys + ([outline] if outline else []))
+        to_check = []
+        for clause, key in zip(clauses, keys):
+            entry = cached.get(key)
+            if entry is None:
+                to_check.append(clause)
+                continue
+            all_findings.extend(compliance_cache.findings_for(entry, clause.clause_id))
+            cached_scores.append(entry.score if entry.score is not None else 1.0)
+        print(f"Compliance cache: {len(clauses) - len(to_check)} of {len(clauses)} clauses reviewed before.")
+
+    needs_run = bool(to_check) or (outline is not None and outline not in cached)
+    if outline in cached and not to_check:
+        all_findings.extend(compliance_cache.findings_for(cached[outline], ""))
+
+    # Convert raw findings to ComplianceFinding objects, numbered per agent
+    # in the order they arrive; a finding on several clauses comes back from
+    # the cache of each of them, and batches may report the same issue
+    findings_objects = []
+    seen = set()
+    numbers: Dict[str, int] = {}
+
+    def validate(raw_findings: List[Dict]) -> List[ComplianceFinding]:
+        new = []
+        for finding_data in raw_findings:
             try:
-                result = future.result(timeout=30)
-                if result.get("findings"):
-                    all_findings.extend(result["findings"])
-                scores.append(result.get("compliance_score", 1.0))
-                agents_used.append(source)
-            except FutureTimeoutError:
-                print(f"{name} agent timed out after 30 seconds")
+                # Sanitize data types before creating ComplianceFinding
+                sanitized = _sanitize_finding_data(finding_data)
+                finding = ComplianceFinding(**sanitized)
+                identity = (finding.source, finding.title.casefold(), finding.description)
+                if identity in seen:
+                    continue
+                seen.add(identity)
+                prefix = FINDING_ID_PREFIXES.get(finding.source, "FND")
+                numbers[prefix] = numbers.get(prefix, 0) + 1
+                finding.finding_id = f"{prefix}-{numbers[prefix]:03d}"
+                new.append(finding)
             except Exception as e:
-                print(f"{name} agent error: {e}")
-    
-    # Convert raw findings to ComplianceFinding objects
-    findings_objects = []
-    for finding_data in all_findings:
-        try:
-            # Sanitize data types before creating ComplianceFinding
-            sanitized = _sanitize_finding_data(finding_data)
-            finding = ComplianceFinding(**sanitized)
-            findings_objects.append(finding)
-        except Exception as e:
-            print(f"Error parsing finding: {e}")
-            print(f"Finding data: {json.dumps(finding_data, indent=2, default=str)}")
+                print(f"Error parsing finding: {e}")
+                print(f"Finding data: {json.dumps(finding_data, indent=2, default=str)}")
+        findings_objects.extend(new)
+        return new
+
+    known = validate(all_findings)
+    if known:
+        yield "findings", {"source": None, "findings": known}
+
+    # Run all three agents on every batch of clauses concurrently, on the
+    # shared scheduler (nothing to run when every clause is covered by a
+    # reused or cached review), reporting each batch as it completes;
+    # whatever is still running at the deadline is cancelled and its agent
+    # reported as dropped
+    deadline = settings.COMPLIANCE_DEADLINE if deadline is None else deadline
+    hedge_after = settings.COMPLIANCE_HEDGE_AFTER if hedge_after is None else hedge_after
+    agents_used, dropped = [], []
+    fresh_findings, complete = [], True
+    batches: List[Tuple[List[ClauseWithCompliance], List[ClauseWithCompliance]]] = []
+    # Scores per batch, from each agent that reviewed it
+    batch_scores: List[List[float]] = []
+    if needs_run:
+        batches = _batches(to_check, clauses if outline else to_check, contract_id, settings.COMPLIANCE_BATCH_TOKENS)
+        batch_scores = [[] for _ in batches]
+        if len(batches) > 1:
+            print(f"Checking {len(to_check)} clauses in {len(batches)} batches")
+        sources = {
+            "Compliance": AnalysisSource.COMPLIANCE_AGENT,
+            "Tariff": AnalysisSource.TARIFF_AGENT,
+            "External Review": AnalysisSource.EXTERNAL_REVIEW_AGENT,
+        }
+        calls = {
+            (name, index): functools.partial(
+                check, batch, contract_id, deadline, context, namespace, (index, len(batches))
+            )
+            for name, check in [
+                ("Compliance", check_compliance_risks),
+                ("Tariff", check_tariff_risks),
+                ("External Review", check_external_context_risks),
+            ]
+            for index, (batch, context) in enumerate(batches)
+        }
+        async with aclosing(agent_scheduler.run(calls, deadline, hedge_after)) as completed:
+            async for (name, index), result, error in completed:
+                source = sources[name]
+                if error is not None:
+                    timed_out = isinstance(error, LLMTimeoutError)
+                    if timed_out:
+                        print(f"{name} agent dropped: {error}")
+                    else:
+                        print(f"{name} agent error: {error}")
+                    complete = False
+                    if source not in dropped:
+                        dropped.append(source)
+                    yield "agent_failed", {"source": source, "batch": index, "error": str(error), "timed_out": timed_out}
+                    continue
+                raw = [f for f in result.get("findings") or [] if isinstance(f, dict)]
+                fresh_findings.extend(raw)
+                batch_scores[index].append(_score(result.get("compliance_score", 1.0)))
+                if source not in agents_used:
+                    agents_used.append(source)
+                complete = complete and not result.get("failed")
+                yield "findings", {
+                    "source": source,
+                    "batch": index,
+                    "findings": validate(raw),
+                    "compliance_score": result.get("compliance_score", 1.0),
+                }
+
+        if namespace and complete:
+            await _cache_reviews(batches, batch_scores, keys, clauses, outline, fresh_findings)
     
     # Calculate metrics
     critical_count = sum(1 for f in findings_objects if f.severity == Severity.CRITICAL)
@@ -405,8 +673,20 @@ def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, coll
     medium_count = sum(1 for f in findings_objects if f.severity == Severity.MEDIUM)
     low_count = sum(1 for f in findings_objects if f.severity == Severity.LOW)
     
-    # Calculate overall score (weighted average)
-    overall_score = sum(scores) / len(scores) if scores else 1.0
+    # Calculate overall score: clauses weigh equally, whether checked now,
+    # taken from the cache or from a reused review
+    weighted = [(score, 1) for score in cached_scores]
+    weighted += [
+        (sum(scores) / len(scores), len(batch))
+        for (batch, _), scores in zip(batches, batch_scores) if scores and batch
+    ]
+    if reused_score is not None and reused_clause_count:
+        weighted.append((reused_score, reused_clause_count))
+    fresh = [score for scores in batch_scores for score in scores]
+    if weighted:
+        overall_score = sum(score * weight for score, weight in weighted) / sum(weight for _, weight in weighted)
+    else:
+        overall_score = sum(fresh) / len(fresh) if fresh else 1.0
     
     # Calculate completeness score
     completeness_score = 1.0 - (sum(1 for f in findings_objects if f.finding_type == FindingType.MISSING_CLAUSE) * 0.15)
@@ -447,17 +727,59 @@ def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, coll
     # Required actions only
     required_actions = [f.title for f in findings_objects if f.severity in [Severity.CRITICAL, Severity.HIGH]]
     
-    return ComplianceCheckResult(
+    yield "result", ComplianceCheckResult(
         findings=findings_objects,
         metrics=metrics,
         contract_id=contract_id,
         analysis_timestamp=datetime.now(),
         agents_used=agents_used,
+        dropped_agents=dropped,
         executive_summary=summary,
         recommendation=recommendation,
         required_actions=required_actions[:10]  # Top 10 required actions
     )
 
+
+async def check_compliance(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    collection_name: str = "company_policies",
+    reused_findings: Optional[List[Dict]] = None,
+    reused_score: Optional[float] = None,
+    reused_clause_count: int = 0,
+    policy_version: Optional[str] = None,
+    deadline: Optional[float] = None,
+    hedge_after: Optional[float] = None,
+) -> ComplianceCheckResult:
+    """
+    Main compliance checking function that orchestrates multiple specialist agents in parallel
+
+    For a near-duplicate of a reviewed contract, `clauses` holds only the
+    clauses that differ; the original's still-valid findings are passed as
+    `reused_findings`, and its score, weighted by `reused_clause_count`,
+    is averaged with the fresh one.
+
+    With the active `policy_version`, findings are cached per clause (by
+    heading and text) and only new or changed clauses go to the agents,
+    with the rest of the contract listed by heading so that missing
+    provisions can still be judged. Findings about the contract as a whole
+    are cached by its full set of clauses. Nothing is cached from a run in
+    which an agent failed.
+
+    The agents share one `deadline` (COMPLIANCE_DEADLINE seconds by
+    default); those still running then are cancelled and the result is
+    partial, listing them in `dropped_agents`. A straggler gets a hedged
+    second attempt after `hedge_after` seconds (COMPLIANCE_HEDGE_AFTER).
+    """
+    result = None
+    async for event, data in stream_compliance(
+        clauses, contract_id, collection_name, reused_findings, reused_score, reused_clause_count, policy_version,
+        deadline, hedge_after,
+    ):
+        if event == "result":
+            result = data
+    return result
+
 def convert_clauses_for_compliance(clauses_data: List) -> List[ClauseWithCompliance]:
     """Convert clause dictionaries or objects to ClauseWithCompliance objects"""
     result = []
@@ -3,10 +3,8 @@ from typing import List, Optional
 from app.models.documentUploaded import clause
 from pydantic import BaseModel
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-from agno.knowledge.knowledge import Knowledge
-from agno.vectordb.qdrant import Qdrant
-from app.config import settings
+from app.services.llm import arun
+from app.services.registry import agent_registry
 
 
 class ClauseWithCompliance(BaseModel):
@@ -16,36 +14,23 @@ class ClauseWithCompliance(BaseModel):
     level: int
 
 
+@agent_registry.register
 def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
-    vector_db = Qdrant(
-        collection=collection_name,
-        url=settings.QDRANT_URL,
-    )
-    
-    knowledge_base = Knowledge(
-        vector_db=vector_db,
-        max_results=5,
-    )
-    
     return Agent(
         name="ContractDraftingExpert",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are a contract drafting expert who revises contracts based on user instructions while ensuring compliance with company policies.",
             "Search the knowledge base for relevant company policies before drafting the revision.",
             "Your output must be the final, revised contract text only.",
         ],
-        knowledge=knowledge_base,
+        knowledge=agent_registry.knowledge(collection_name),
         search_knowledge=True,
         stream=False,
     )
 
 
-def modify_contract_text(
+async def modify_contract_text(
     clauses: str,
     collection_name: str = "company_policies",
     user_prompt: str = None,
@@ -79,7 +64,7 @@ def modify_contract_text(
     """
     
     try:
-        response = agent.run(prompt)
+        response = await arun(agent, prompt)
         # We strip any surrounding quotes or backticks that the LLM might add due to the strict instruction
         raw_output = (response.content or "").strip()
         
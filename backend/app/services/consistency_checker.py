@@ -2,10 +2,9 @@ import json
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from agno.knowledge.knowledge import Knowledge 
-from agno.vectordb.qdrant import Qdrant
-from app.config import settings
+from app.services.llm import arun
+from app.services.registry import agent_registry
 from duckduckgo_search import DDGS 
 
 
@@ -24,27 +23,16 @@ class ClauseWithCompliance(BaseModel):
     heading: Optional[str] = None
     level: int
 
-def create_base_knowledge(collection_name: str = "company_policies"):
-    vector_db = Qdrant(
-        collection=collection_name,
-        url=settings.QDRANT_URL,
-    )
-    knowledge_base = Knowledge(
-        vector_db=vector_db,
-        max_results=5,
-    )
-    return knowledge_base
+def create_base_knowledge(collection_name: str = "company_policies") -> Knowledge:
+    return agent_registry.knowledge(collection_name)
 
 
+@agent_registry.register
 def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
     knowledge_base = create_base_knowledge(collection_name)
     return Agent(
         name="ComplianceChecker",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are a contract compliance expert checking against company policies (The General Risk Handler).",
             "Review each clause against retrieved company policies from the knowledge base.",
@@ -61,15 +49,12 @@ def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
     )
 
 
+@agent_registry.register
 def create_tariff_agent(collection_name: str = "company_policies") -> Agent:
     knowledge_base = create_base_knowledge(collection_name)
     return Agent(
         name="TariffManagementAgent",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are a Tariff and Financial Risk expert checking against company policies.",
             "Review each clause for financial risks, missing tariff classifications, and cost-protection issues.",
@@ -86,14 +71,11 @@ def create_tariff_agent(collection_name: str = "company_policies") -> Agent:
     )
 
 
+@agent_registry.register
 def create_risk_review_agent() -> Agent:
     return Agent(
         name="ExternalRiskReviewAgent",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are an independent risk auditor. Your job is to identify risks and missing provisions BEYOND company policies.",
             "Focus on market standards, legal gaps, missing clauses (e.g., indemnification, data privacy), and commercially unfavorable terms.",
@@ -124,7 +106,7 @@ def check_external_web_data(query: str) -> str:
         return f"External search failed: {str(e)}. No external data found for '{query}'."
 
 
-def _run_specialist_agent(agent: Agent, clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
+async def _run_specialist_agent(agent: Agent, clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
     clauses_text = "\n\n".join([
         f"Clause {c.clause_id} - {c.heading or 'Untitled'}:\n{c.text}"
         for c in clauses
@@ -141,7 +123,7 @@ Contract Clauses:
 Return JSON strictly in the format defined by your instructions.
 """
     try:
-        response = agent.run(prompt, contract_id=contract_id) 
+        response = await arun(agent, prompt, contract_id=contract_id)
         raw_output = (response.content or "").strip()
 
         if not raw_output or "unable to check" in raw_output.lower():
@@ -159,29 +141,26 @@ Return JSON strictly in the format defined by your instructions.
         return ComplianceCheckResult(risks=[], compliance_score=1.0)
 
 
-def check_compliance_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
+async def check_compliance_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
     risk_agent = create_compliance_agent()
-    return _run_specialist_agent(risk_agent, clauses, contract_id)
+    return await _run_specialist_agent(risk_agent, clauses, contract_id)
 
 
-def check_tariff_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
+async def check_tariff_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
     tariff_agent = create_tariff_agent()
-    return _run_specialist_agent(tariff_agent, clauses, contract_id)
+    return await _run_specialist_agent(tariff_agent, clauses, contract_id)
 
 
-def check_external_context_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
+async def check_external_context_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
     risk_review_agent = create_risk_review_agent()
-    return _run_specialist_agent(risk_review_agent, clauses, contract_id)
+    return await _run_specialist_agent(risk_review_agent, clauses, contract_id)
 
 
-def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, collection_name: str = "company_policies") -> ComplianceCheckResult:
-    orchestrator = Agent(
+@agent_registry.register
+def create_orchestrator_agent() -> Agent:
+    return Agent(
         name="ContractOrchestrator",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are a contract router and risk aggregator.",
             "Analyze the contract clauses to determine the primary context (e.g., Finance, General Risk, External Context).",
@@ -200,6 +179,10 @@ def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, coll
         ],
         stream=False,
     )
+
+
+async def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, collection_name: str = "company_policies") -> ComplianceCheckResult:
+    orchestrator = create_orchestrator_agent()
     clauses_text = "\n\n".join([f"Clause {c.clause_id} - {c.heading or 'Untitled'}:\n{c.text}" for c in clauses])
     prompt = f"""
 Analyze the context of the following clauses and call the appropriate specialist tool(s).
@@ -209,7 +192,7 @@ Contract Clauses:
 {clauses_text}
 """
     try:
-        response = orchestrator.run(prompt, clauses=clauses, contract_id=contract_id)
+        response = await arun(orchestrator, prompt, clauses=clauses, contract_id=contract_id)
         raw_output = (response.content or "").strip()
 
         if raw_output.startswith("```"):
@@ -1,122 +1,1038 @@
 import os
+import hashlib
+import multiprocessing
+import subprocess
+import tempfile
+import threading
+import unicodedata
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
-from docx import Document
-from pdfminer.high_level import extract_text as pdfminer_extract_text
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from lxml import etree
+from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+from pdfminer.layout import LTTextContainer
 import pytesseract
 from PIL import Image
 import pypdfium2 as pdfium
-from app.config import get_config, Config 
+import pypdfium2.raw as pdfium_c
+from app.config import get_config, Config, OCRConfig
+
+try:
+    import tesserocr
+except ImportError:  # optional: keeps Tesseract and its traineddata loaded in-process
+    tesserocr = None
+
+# Called as progress(stage, pages_done, pages_total) while a document is processed.
+ProgressCallback = Callable[[str, int, int], None]
+
+PAGE_BREAK = "\n\n---PAGE BREAK---\n\n"
+TABLE_ROW = "\n---TABLE ROW---\n"
+
+
+@dataclass
+class PageExtraction:
+    """How a single PDF page was read."""
+    page_index: int
+    method: str  # "digital", "ocr" or "blank"
+    char_count: int
+    text: str = field(default="", repr=False)
+    backend: Optional[str] = None  # text backend that read a digital page
+    dpi: Optional[int] = None  # render resolution of an OCR page
+    ocr_confidence: Optional[float] = None  # mean Tesseract word confidence (0-100)
+    ocr_language: Optional[str] = None  # language packs an OCR page was read with
+
+
+# Called as on_page(page, pages_total) as soon as a page's text is final.
+PageCallback = Callable[[PageExtraction, int], None]
+
+
+@dataclass
+class PageOCR:
+    """OCR output for one page, with the resolution and languages it was finally read with."""
+    text: str
+    dpi: int
+    confidence: Optional[float] = None
+    language: Optional[str] = None
+
+
+@dataclass
+class ExtractionResult:
+    """Extracted text together with the per-page decisions that produced it."""
+    text: str
+    pages: List[PageExtraction] = field(default_factory=list)
+    error: Optional[str] = None
+    cache_hit: bool = False
+
+    def summary(self) -> Dict[str, Any]:
+        """Page counts per method and the share of pages that skipped OCR."""
+        total = len(self.pages)
+        digital = sum(1 for p in self.pages if p.method == "digital")
+        ocr = sum(1 for p in self.pages if p.method == "ocr")
+        backends: Dict[str, int] = {}
+        for p in self.pages:
+            if p.method == "digital" and p.backend:
+                backends[p.backend] = backends.get(p.backend, 0) + 1
+        confidences = [p.ocr_confidence for p in self.pages if p.ocr_confidence is not None]
+        ocr_dpis: Dict[str, int] = {}
+        for p in self.pages:
+            if p.method == "ocr" and p.dpi:
+                ocr_dpis[str(p.dpi)] = ocr_dpis.get(str(p.dpi), 0) + 1
+        ocr_languages: Dict[str, int] = {}
+        for p in self.pages:
+            if p.method == "ocr" and p.ocr_language:
+                ocr_languages[p.ocr_language] = ocr_languages.get(p.ocr_language, 0) + 1
+        return {
+            "pages": total,
+            "digital_pages": digital,
+            "ocr_pages": ocr,
+            "blank_pages": total - digital - ocr,
+            "ocr_avoided_ratio": round((total - ocr) / total, 3) if total else 0.0,
+            "text_backends": backends,
+            "ocr_dpi": ocr_dpis,
+            "ocr_languages": ocr_languages,
+            "mean_ocr_confidence": round(sum(confidences) / len(confidences), 1) if confidences else None,
+        }
+
+
+# --- PDF text backends ---
+
+class PdfTextBackend:
+    """Reads the embedded text layer of PDF pages."""
+    name = "base"
+
+    def read_pages(self, file_path: Path, page_indices: Optional[Sequence[int]] = None) -> List[str]:
+        """Returns the text of each requested page (all pages by default), in order."""
+        raise NotImplementedError
+
+
+class PdfiumTextBackend(PdfTextBackend):
+    """pdfium's text API: native and fast, but no layout analysis."""
+    name = "pdfium"
+
+    def read_pages(self, file_path: Path, page_indices: Optional[Sequence[int]] = None) -> List[str]:
+        pdf_document = pdfium.PdfDocument(file_path)
+        try:
+            if page_indices is None:
+                page_indices = range(len(pdf_document))
+            texts = []
+            for page_index in page_indices:
+                page = pdf_document.get_page(page_index)
+                textpage = page.get_textpage()
+                try:
+                    texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                finally:
+                    textpage.close()
+                    page.close()
+            return texts
+        finally:
+            pdf_document.close()
+
+
+class PdfMinerTextBackend(PdfTextBackend):
+    """pdfminer.six layout analysis: slower, but robust reading order and font decoding."""
+    name = "pdfminer"
+
+    def read_pages(self, file_path: Path, page_indices: Optional[Sequence[int]] = None) -> List[str]:
+        page_numbers = None if page_indices is None else set(page_indices)
+        texts = []
+        for page_layout in pdfminer_extract_pages(file_path, page_numbers=page_numbers):
+            texts.append("".join(
+                element.get_text() for element in page_layout if isinstance(element, LTTextContainer)
+            ))
+        return texts
+
+
+PDF_TEXT_BACKENDS: Dict[str, PdfTextBackend] = {
+    backend.name: backend for backend in (PdfiumTextBackend(), PdfMinerTextBackend())
+}
+AUTO_BACKEND = "auto"
+
+
+def text_layer_looks_sound(text: str) -> bool:
+    """
+    Layout-quality heuristics for a page read by the fast backend.
+
+    Flags undecodable glyphs (replacement or private-use characters, or
+    glyphs read back as blanks, as produced by fonts without a usable
+    ToUnicode map) and runs of words glued together by missing spacing,
+    all of which pdfminer usually recovers.
+    """
+    # A long layer that is all or mostly blanks: glyphs without a usable mapping
+    if len(text) > 100 and sum(1 for ch in text if not ch.isspace()) / len(text) < 0.3:
+        return False
+    stripped = text.strip()
+    if not stripped:
+        return True
+    garbled = sum(
+        1 for ch in stripped
+        if ch == "\ufffd" or unicodedata.category(ch) in ("Co", "Cs") or (unicodedata.category(ch) == "Cc" and ch not in "\n\t\f")
+    )
+    if garbled / len(stripped) > 0.02:
+        return False
+    words = stripped.split()
+    if len(stripped) > 200 and len(stripped) / len(words) > 25:
+        return False
+    return True
+
+
+
+# --- DOCX streaming ---
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Alternate-content fallbacks repeat the preferred choice (e.g. VML text boxes)
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+OFFICE_DOCUMENT_REL = "/officeDocument"
+
+
+def _docx_main_part(archive: zipfile.ZipFile) -> str:
+    """Name of the main document part, from the package relationships."""
+    try:
+        rels = etree.fromstring(archive.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels:
+        if rel.get("Type", "").endswith(OFFICE_DOCUMENT_REL):
+            return rel.get("Target", "").lstrip("/")
+    return "word/document.xml"
+
+
+def iter_docx_blocks(file_path: Path) -> Iterator[str]:
+    """
+    Streams a DOCX body in document order.
+
+    Yields one string per top-level paragraph and one per table row
+    (`TABLE_ROW` followed by the cells joined with " | "), so rows keep
+    their position between the surrounding clauses. The XML is read with
+    an incremental parser and every element is discarded once its text
+    has been collected, so memory stays flat however long the document
+    is. Rows of nested tables are folded into the enclosing cell, and text
+    boxes into their paragraph.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open(_docx_main_part(archive)) as part:
+        paragraphs: List[List[str]] = []  # open paragraphs (text boxes nest), their text pieces
+        rows: List[List[str]] = []  # open table rows, their cell texts
+        cells: List[List[str]] = []  # open table cells, their paragraph texts
+        fallback_depth = 0
+        
+        for event, elem in etree.iterparse(part, events=("start", "end"), resolve_entities=False, huge_tree=True):
+            tag = elem.tag
+            if tag == MC_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+            elif fallback_depth:
+                pass
+            elif event == "start":
+                if tag == W_NS + "p":
+                    paragraphs.append([])
+                elif tag == W_NS + "tr":
+                    rows.append([])
+                elif tag == W_NS + "tc":
+                    cells.append([])
+            elif tag == W_NS + "t":
+                if paragraphs and elem.text:
+                    paragraphs[-1].append(elem.text)
+            elif tag == W_NS + "tab":
+                if paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in (W_NS + "br", W_NS + "cr"):
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == W_NS + "p":
+                text = "".join(paragraphs.pop())
+                if paragraphs:
+                    if text:
+                        paragraphs[-1].append("\n" + text)
+                elif cells:
+                    cells[-1].append(text)
+                else:
+                    yield text
+            elif tag == W_NS + "tc":
+                cell_text = "\n".join(text for text in cells.pop() if text)
+                if rows:
+                    rows[-1].append(cell_text)
+            elif tag == W_NS + "tr":
+                row_text = " | ".join(rows.pop())
+                if cells:
+                    cells[-1].append(row_text)
+                else:
+                    yield f"{TABLE_ROW}{row_text}"
+            
+            if event == "end":
+                # Text is collected incrementally, so finished elements can go
+                elem.clear(keep_tail=True)
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+
+# --- OCR engines ---
+
+class OCREngine:
+    """Recognises the text of a rendered page image."""
+    name = "base"
+
+    def __init__(self, ocr_config: OCRConfig):
+        self.config = ocr_config
+
+    def recognize(
+        self, image: Image.Image, with_confidence: bool = False, language: Optional[str] = None
+    ) -> Tuple[str, Optional[float]]:
+        """
+        Returns the page text and, if requested, the mean word confidence (0-100).
+        `language` overrides the configured language packs, e.g. "ara".
+        """
+        raise NotImplementedError
+
+    def detect_script(self, image: Image.Image) -> Optional[Tuple[str, float]]:
+        """
+        Dominant script of the page ("Latin", "Arabic"...) and Tesseract's
+        confidence in it, from orientation and script detection (OSD).
+        None when OSD is not installed or finds too little text.
+        """
+        raise NotImplementedError
+
+    def health(self) -> Dict[str, Any]:
+        """Reports the Tesseract version and whether the configured languages are installed."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def _language_report(self, available: Sequence[str]) -> Dict[str, Any]:
+        missing = [lang for lang in self.config.language.split("+") if lang not in available]
+        return {"languages": sorted(available), "missing_languages": missing, "ok": not missing}
+
+
+class PytesseractEngine(OCREngine):
+    """
+    Runs the `tesseract` CLI through pytesseract.
+
+    Every call starts a new tesseract process that loads the traineddata
+    again; used when tesserocr is not installed.
+    """
+    name = "pytesseract"
+
+    def __init__(self, ocr_config: OCRConfig):
+        super().__init__(ocr_config)
+        if ocr_config.tesseract_path:
+            pytesseract.pytesseract.tesseract_cmd = ocr_config.tesseract_path
+        # Tesseract arguments, using psm_mode 6 and eng+ara language
+        self.tesseract_args = f'--oem 3 --psm {ocr_config.psm_mode} -l {ocr_config.language}'
+        self._osd_available: Optional[bool] = None
+
+    def recognize(
+        self, image: Image.Image, with_confidence: bool = False, language: Optional[str] = None
+    ) -> Tuple[str, Optional[float]]:
+        args = self.tesseract_args
+        if language:
+            args = f'--oem 3 --psm {self.config.psm_mode} -l {language}'
+        if not with_confidence:
+            return pytesseract.image_to_string(image, config=args), None
+        data = pytesseract.image_to_data(image, config=args, output_type=pytesseract.Output.DICT)
+        return _text_from_tesseract_data(data)
+
+    def detect_script(self, image: Image.Image) -> Optional[Tuple[str, float]]:
+        if self._osd_available is None:
+            self._osd_available = "osd" in pytesseract.get_languages(config="")
+        if not self._osd_available:
+            return None
+        try:
+            osd = pytesseract.image_to_osd(image, config="--psm 0", output_type=pytesseract.Output.DICT)
+        except pytesseract.TesseractError:
+            # Raised for pages with too few characters to tell
+            return None
+        return osd["script"], float(osd["script_conf"])
+
+    def health(self) -> Dict[str, Any]:
+        report = {"engine": self.name, "version": str(pytesseract.get_tesseract_version())}
+        report.update(self._language_report(pytesseract.get_languages(config="")))
+        if self.config.engine != self.name:
+            report["warning"] = (
+                "tesserocr is not installed: every page starts a tesseract process "
+                "instead of reusing a persistent engine (install the 'ocr' extra)."
+            )
+        return report
+
+
+class TesserocrEngine(OCREngine):
+    """
+    Keeps one Tesseract API instance, with its traineddata loaded, for the
+    lifetime of the engine. Not thread-safe: use one engine per thread or
+    process.
+    """
+    name = "tesserocr"
+
+    def __init__(self, ocr_config: OCRConfig):
+        super().__init__(ocr_config)
+        self._api = self._create_api(ocr_config.language)
+        # One API per language combination, created on first use, so each
+        # keeps its traineddata loaded
+        self._apis = {ocr_config.language: self._api}
+        self._osd_api = None
+        self._osd_available = "osd" in self._api.GetAvailableLanguages()
+
+    def _create_api(self, language: str):
+        return tesserocr.PyTessBaseAPI(lang=language, psm=self.config.psm_mode, oem=tesserocr.OEM.DEFAULT)
+
+    def recognize(
+        self, image: Image.Image, with_confidence: bool = False, language: Optional[str] = None
+    ) -> Tuple[str, Optional[float]]:
+        language = language or self.config.language
+        api = self._apis.get(language)
+        if api is None:
+            api = self._apis[language] = self._create_api(language)
+        api.SetImage(image)
+        text = api.GetUTF8Text()
+        confidence = None
+        if with_confidence:
+            confidences = [conf for conf in api.AllWordConfidences() if conf >= 0]
+            confidence = round(sum(confidences) / len(confidences), 1) if confidences else None
+        api.Clear()
+        return text, confidence
+
+    def detect_script(self, image: Image.Image) -> Optional[Tuple[str, float]]:
+        if not self._osd_available:
+            return None
+        if self._osd_api is None:
+            self._osd_api = tesserocr.PyTessBaseAPI(lang="osd", psm=tesserocr.PSM.OSD_ONLY)
+        self._osd_api.SetImage(image)
+        osd = self._osd_api.DetectOrientationScript()
+        self._osd_api.Clear()
+        if not osd:
+            return None
+        return osd["script_name"], float(osd["script_conf"])
+
+    def health(self) -> Dict[str, Any]:
+        report = {"engine": self.name, "version": tesserocr.tesseract_version().splitlines()[0]}
+        report.update(self._language_report(self._api.GetAvailableLanguages()))
+        return report
+
+    def close(self) -> None:
+        for api in self._apis.values():
+            api.End()
+        if self._osd_api is not None:
+            self._osd_api.End()
+
+
+def resolve_ocr_engine(ocr_config: OCRConfig) -> str:
+    """Name of the engine `OCRConfig.engine` selects ("auto" prefers tesserocr)."""
+    engine = ocr_config.engine
+    if engine not in ("auto", "tesserocr", "pytesseract"):
+        raise ValueError(f"Unknown OCR engine '{engine}'")
+    if engine in ("auto", "tesserocr") and tesserocr is not None:
+        return TesserocrEngine.name
+    return PytesseractEngine.name
+
+
+def create_ocr_engine(ocr_config: OCRConfig) -> OCREngine:
+    if resolve_ocr_engine(ocr_config) == TesserocrEngine.name:
+        return TesserocrEngine(ocr_config)
+    if ocr_config.engine == "tesserocr":
+        print("Warning: OCR_ENGINE=tesserocr but tesserocr is not installed, falling back to pytesseract.")
+    return PytesseractEngine(ocr_config)
+
+
+def _text_from_tesseract_data(data: Dict[str, list]) -> Tuple[str, Optional[float]]:
+    """Rebuilds page text line by line from `image_to_data` output, with the mean word confidence."""
+    lines: Dict[tuple, List[str]] = {}
+    confidences = []
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        if not word:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(word)
+        conf = float(data["conf"][i])
+        if conf >= 0:
+            confidences.append(conf)
+    
+    text_lines = []
+    previous_paragraph = None
+    for (block, paragraph, _), words in lines.items():
+        if previous_paragraph is not None and (block, paragraph) != previous_paragraph:
+            text_lines.append("")
+        text_lines.append(" ".join(words))
+        previous_paragraph = (block, paragraph)
+    
+    confidence = round(sum(confidences) / len(confidences), 1) if confidences else None
+    return "\n".join(text_lines), confidence
 
 
 class DocumentExtractor:
     """
     A worker class responsible for extracting text from documents.
-    It supports DOCX and PDF (with digital text preference and OCR fallback).
+    It supports DOCX and PDF (reading each page's text layer and OCRing only
+    the pages that have none).
     """
     def __init__(self, config: Config):
         self.config = config
+        self._ocr_pool: Optional[ProcessPoolExecutor] = None
+        # Extraction threads start the pool lazily; only one may create it
+        self._ocr_pool_lock = threading.Lock()
+        # Engines used by serial OCR, one per extraction thread
+        self._local = threading.local()
+        self._engines: List[OCREngine] = []
+        self._engines_lock = threading.Lock()
         
         # 1. Configure Tesseract Path
         if self.config.ocr.tesseract_path:
             pytesseract.pytesseract.tesseract_cmd = self.config.ocr.tesseract_path
 
-    def extract(self, file_path: Path) -> str:
+    def close(self) -> None:
+        """Shuts down the OCR process pool, if one was started, and releases OCR engines."""
+        with self._ocr_pool_lock:
+            if self._ocr_pool is not None:
+                self._ocr_pool.shutdown(wait=False, cancel_futures=True)
+                self._ocr_pool = None
+        with self._engines_lock:
+            for engine in self._engines:
+                engine.close()
+            self._engines.clear()
+        self._local = threading.local()
+
+    def ocr_health(self, timeout: float = 10.0) -> Dict[str, Any]:
+        """
+        Checks the OCR engine in this process and, when parallel OCR is
+        enabled, that the pool workers respond with a loaded engine.
+        """
+        ocr_config = self.config.ocr
+        try:
+            report = self._get_ocr_engine().health()
+        except Exception as e:
+            report = {"engine": ocr_config.engine, "ok": False, "error": str(e)}
+        
+        if ocr_config.parallel and ocr_config.workers > 1:
+            pool_report = {"workers": ocr_config.workers, "ok": False}
+            try:
+                # One ping per worker; the pool may route several to the same process
+                pool = self._get_ocr_pool()
+                futures = [pool.submit(_ocr_worker_health) for _ in range(ocr_config.workers)]
+                done, not_done = wait(futures, timeout=timeout)
+                for future in not_done:
+                    future.cancel()
+                replies = [future.result() for future in done]
+                pool_report["worker_pids"] = sorted({reply["pid"] for reply in replies})
+                pool_report["engines"] = sorted({reply.get("engine", "?") for reply in replies})
+                pool_report["timed_out"] = len(not_done)
+                pool_report["ok"] = not not_done and all(reply.get("ok") for reply in replies)
+            except BrokenProcessPool as e:
+                self._discard_ocr_pool(pool)
+                pool_report["error"] = f"OCR pool is broken: {e}"
+            except Exception as e:
+                pool_report["error"] = str(e)
+            report["pool"] = pool_report
+            report["ok"] = report.get("ok", False) and pool_report["ok"]
+        return report
+
+    def cache_key(self, file_hash: str, suffix: str, pdf_backend: Optional[str] = None) -> str:
+        """
+        Content-addressed key for an extraction result.
+
+        Combines the file's SHA-256 with every setting that changes the
+        extracted text, so changing the OCR configuration invalidates
+        previously cached entries.
+        """
+        ocr_config = self.config.ocr
+        fingerprint = "|".join(str(part) for part in (
+            file_hash,
+            suffix.lower(),
+            ocr_config.dpi,
+            ocr_config.language,
+            ocr_config.psm_mode,
+            ocr_config.min_page_text_length,
+            ocr_config.adaptive_dpi and (ocr_config.probe_dpi, ocr_config.min_confidence),
+            ocr_config.detect_script and ocr_config.min_script_confidence,
+            resolve_ocr_engine(ocr_config),
+            pdf_backend or self.config.extraction.pdf_backend,
+        ))
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def extract(
+        self,
+        file_path: Path,
+        progress: Optional[ProgressCallback] = None,
+        pdf_backend: Optional[str] = None,
+    ) -> str:
         """
         Main method to extract text based on file extension.
         
         Args:
             file_path: The Path object pointing to the document.
+            progress: Optional callback receiving (stage, pages_done, pages_total).
+            pdf_backend: "pdfium", "pdfminer" or "auto"; defaults to ExtractionConfig.pdf_backend.
 
         Returns:
             The extracted text content or an error message.
         """
+        return self.extract_document(file_path, progress, pdf_backend).text
+
+    def extract_document(
+        self,
+        file_path: Path,
+        progress: Optional[ProgressCallback] = None,
+        pdf_backend: Optional[str] = None,
+        on_page: Optional[PageCallback] = None,
+    ) -> ExtractionResult:
+        """
+        Like `extract`, but also returns how each page was read.
+
+        `on_page` receives every page as soon as its text is final; OCR pages
+        may arrive out of order when they are processed in parallel.
+        """
         file_path = Path(file_path)
         
         if file_path.suffix.lower() == '.pdf':
-            return self._extract_pdf(file_path)
+            return self._extract_pdf(file_path, progress, pdf_backend, on_page)
         elif file_path.suffix.lower() == '.docx':
-            return self._extract_docx(file_path)
+            return self._extract_docx(file_path, progress, on_page)
+        elif file_path.suffix.lower() == '.doc':
+            return self._extract_doc(file_path, progress, on_page)
         else:
-            return f"Error: Unsupported file format {file_path.suffix}."
+            message = f"Error: Unsupported file format {file_path.suffix}."
+            return ExtractionResult(text=message, error=message)
 
-    def _extract_docx(self, file_path: Path) -> str:
+    def _extract_docx(
+        self,
+        file_path: Path,
+        progress: Optional[ProgressCallback] = None,
+        on_page: Optional[PageCallback] = None,
+    ) -> ExtractionResult:
+        """Extracts a DOCX, which counts as a single page."""
         print(f"Processing digital DOCX file: {file_path.name}")
         try:
-            document = Document(file_path)
-            full_text = []
-            
-            for paragraph in document.paragraphs:
-                full_text.append(paragraph.text)
+            text = "\n\n".join(iter_docx_blocks(file_path))
+        except Exception as e:
+            message = f"Error extracting DOCX text: {e}"
+            return ExtractionResult(text=message, error=message)
+        page = PageExtraction(0, "digital", len(text), text)
+        if on_page:
+            on_page(page, 1)
+        if progress:
+            progress("digital", 1, 1)
+        return ExtractionResult(text=text, pages=[page])
+
+    def _extract_doc(
+        self,
+        file_path: Path,
+        progress: Optional[ProgressCallback] = None,
+        on_page: Optional[PageCallback] = None,
+    ) -> ExtractionResult:
+        """Converts a legacy Word .doc to DOCX with headless LibreOffice, then extracts it."""
+        print(f"Converting legacy DOC file: {file_path.name}")
+        extraction_config = self.config.extraction
+        with tempfile.TemporaryDirectory(prefix="doc-convert-") as out_dir:
+            command = [
+                extraction_config.soffice_path,
+                "--headless",
+                "--norestore",
+                # A private profile per conversion, so concurrent conversions do not collide
+                f"-env:UserInstallation={Path(out_dir, 'profile').as_uri()}",
+                "--convert-to", "docx",
+                "--outdir", out_dir,
+                str(file_path),
+            ]
+            message = None
+            try:
+                subprocess.run(command, check=True, capture_output=True, timeout=extraction_config.conversion_timeout)
+            except FileNotFoundError:
+                message = "Error: LibreOffice not found. Set SOFFICE_PATH to convert .doc files."
+            except subprocess.TimeoutExpired:
+                message = f"Error: .doc conversion timed out after {extraction_config.conversion_timeout}s."
+            except subprocess.CalledProcessError as e:
+                message = f"Error converting .doc file: {e.stderr.decode('utf-8', 'replace').strip() or e}"
             
-            for table in document.tables:
-                for row in table.rows:
-                    row_text = " | ".join(cell.text for cell in row.cells)
-                    full_text.append(f"\n---TABLE ROW---\n{row_text}")
+            converted = Path(out_dir) / f"{file_path.stem}.docx"
+            if message is None and not converted.exists():
+                message = "Error converting .doc file: LibreOffice produced no output."
+            if message is not None:
+                return ExtractionResult(text=message, error=message)
+            return self._extract_docx(converted, progress, on_page)
 
-            return "\n\n".join(full_text)
-        except Exception as e:
-            return f"Error extracting DOCX text: {e}"
+    def _extract_pdf(
+        self,
+        file_path: Path,
+        progress: Optional[ProgressCallback] = None,
+        pdf_backend: Optional[str] = None,
+        on_page: Optional[PageCallback] = None,
+    ) -> ExtractionResult:
+        """
+        Extracts text from a PDF page by page.
 
-    def _extract_pdf(self, file_path: Path) -> str:
-        """Extracts text from a PDF, falling back to OCR if digital text is insufficient."""
-        
+        Pages whose text layer has at least `min_page_text_length` characters
+        are read directly through the selected text backend; pages with
+        images but no usable text are sent to OCR, and pages with neither are
+        recorded as blank.
+        """
         ocr_config = self.config.ocr
+        pdf_backend = pdf_backend or self.config.extraction.pdf_backend
         
-        # 1. Try Digital Extraction
         try:
-            digital_text = pdfminer_extract_text(file_path)
+            texts, backends = self._read_text_layers(file_path, pdf_backend)
+            pdf_document = pdfium.PdfDocument(file_path)
+        except Exception as e:
+            message = f"Error opening PDF: {e}"
+            return ExtractionResult(text=message, error=message)
+        
+        pages: List[PageExtraction] = []
+        ocr_indices: List[int] = []
+        try:
+            page_count = len(pdf_document)
+            if len(texts) != page_count:
+                # Pages the backend did not return are classified as having no text layer
+                print(f"Text backend returned {len(texts)} pages, pdfium counts {page_count}.")
+            # 1. Classify every page from its text layer
+            for page_index in range(page_count):
+                text = texts[page_index] if page_index < len(texts) else ""
+                if len(text.strip()) >= ocr_config.min_page_text_length:
+                    pages.append(PageExtraction(page_index, "digital", len(text), text, backends[page_index]))
+                else:
+                    page = pdf_document.get_page(page_index)
+                    try:
+                        has_images = self._has_images(page)
+                    finally:
+                        page.close()
+                    if has_images:
+                        pages.append(PageExtraction(page_index, "ocr", 0))
+                        ocr_indices.append(page_index)
+                    else:
+                        pages.append(PageExtraction(page_index, "blank", len(text.strip()), text.strip()))
+                if on_page and pages[page_index].method != "ocr":
+                    on_page(pages[page_index], page_count)
+                if progress:
+                    progress("digital", page_index + 1 - len(ocr_indices), page_count)
+        finally:
+            pdf_document.close()
+        
+        print(f"PDF has {page_count} pages: {page_count - len(ocr_indices)} read digitally, {len(ocr_indices)} need OCR.")
+        
+        # 2. OCR only the image-only pages
+        if ocr_indices:
+            digital_done = page_count - len(ocr_indices)
+            ocr_progress = None
+            if progress:
+                ocr_progress = lambda stage, done, total: progress(stage, digital_done + done, page_count)
             
-            # Check if digital text length is sufficient (i.e., not a scanned document)
-            if len(digital_text.strip()) >= ocr_config.min_text_length:
-                print(f"PDF is digital (length {len(digital_text.strip())}), using fast extraction.")
-                return digital_text
+            def on_page_ocr(page_index: int, page_ocr: PageOCR) -> None:
+                page = pages[page_index]
+                page.text = page_ocr.text
+                page.char_count = len(page_ocr.text)
+                page.dpi = page_ocr.dpi
+                page.ocr_confidence = page_ocr.confidence
+                page.ocr_language = page_ocr.language
+                if on_page:
+                    on_page(page, page_count)
             
-            print(f"Digital text length ({len(digital_text.strip())}) is too short. Falling back to OCR.")
-        except Exception as e:
-            # Catch exceptions from pdfminer (e.g., malformed PDF)
-            print(f"Digital extraction failed ({e}). Falling back to OCR.")
+            try:
+                self._ocr_pages(file_path, ocr_indices, ocr_progress, on_page_ocr)
+            except pytesseract.TesseractNotFoundError:
+                message = "Error: Tesseract not found. Check TESSERACT_PATH in config and ensure Tesseract is installed."
+                return ExtractionResult(text=message, pages=pages, error=message)
+            except Exception as e:
+                message = f"Error during PDF OCR extraction: {e}"
+                return ExtractionResult(text=message, pages=pages, error=message)
+        
+        return ExtractionResult(text=PAGE_BREAK.join(p.text for p in pages), pages=pages)
 
-        # 2. OCR Extraction
-        return self._ocr_pdf(file_path)
+    def _read_text_layers(self, file_path: Path, pdf_backend: str) -> tuple[List[str], List[str]]:
+        """
+        Reads every page's text layer, returning the texts and the backend used per page.
 
-    def _ocr_pdf(self, file_path: Path) -> str:
-        """Performs Tesseract OCR on a PDF file using configuration settings."""
+        In "auto" mode pages are read with pdfium and only the pages failing
+        `text_layer_looks_sound` are re-read with pdfminer.
+        """
+        if pdf_backend != AUTO_BACKEND:
+            if pdf_backend not in PDF_TEXT_BACKENDS:
+                raise ValueError(f"Unknown PDF text backend '{pdf_backend}'")
+            texts = PDF_TEXT_BACKENDS[pdf_backend].read_pages(file_path)
+            return texts, [pdf_backend] * len(texts)
+        
+        try:
+            texts = PDF_TEXT_BACKENDS["pdfium"].read_pages(file_path)
+        except Exception as e:
+            print(f"pdfium text extraction failed ({e}), using pdfminer.")
+            texts = PDF_TEXT_BACKENDS["pdfminer"].read_pages(file_path)
+            return texts, ["pdfminer"] * len(texts)
         
+        backends = ["pdfium"] * len(texts)
+        unsound = [i for i, text in enumerate(texts) if not text_layer_looks_sound(text)]
+        if unsound:
+            print(f"Re-reading {len(unsound)} page(s) with pdfminer after layout checks failed.")
+            for page_index, text in zip(unsound, PDF_TEXT_BACKENDS["pdfminer"].read_pages(file_path, unsound)):
+                texts[page_index] = text
+                backends[page_index] = "pdfminer"
+        return texts, backends
+
+    @staticmethod
+    def _has_images(page: pdfium.PdfPage) -> bool:
+        for _ in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE]):
+            return True
+        return False
+
+    def _ocr_pages(
+        self,
+        file_path: Path,
+        page_indices: Sequence[int],
+        progress: Optional[ProgressCallback] = None,
+        on_result: Optional[Callable[[int, PageOCR], None]] = None,
+    ) -> List[PageOCR]:
+        """
+        OCRs the given pages, returning their results in the same order. Raises on OCR failure.
+
+        `on_result(page_index, page_ocr)` is called as each page finishes.
+        """
         ocr_config = self.config.ocr
         
-        # Tesseract arguments, using psm_mode 6 and eng+ara language
-        tesseract_args = (
-            f'--oem 3 --psm {ocr_config.psm_mode} -l {ocr_config.language}'
-        )
+        if ocr_config.parallel and ocr_config.workers > 1 and len(page_indices) > 1:
+            return self._ocr_pages_parallel(file_path, page_indices, progress, on_result)
+        return self._ocr_pages_serial(file_path, page_indices, progress, on_result)
+
+    def _ocr_pages_serial(
+        self,
+        file_path: Path,
+        page_indices: Sequence[int],
+        progress: Optional[ProgressCallback],
+        on_result: Optional[Callable[[int, PageOCR], None]] = None,
+    ) -> List[PageOCR]:
+        """Renders and OCRs pages one at a time in the calling thread."""
         full_ocr_text = []
         
+        # Load PDF document
+        pdf_document = pdfium.PdfDocument(file_path)
         try:
-            # Load PDF document
-            pdf_document = pdfium.PdfDocument(file_path)
-            
-            # Calculate scale factor for DPI (e.g., 300 dpi / 72 base dpi)
-            scale = ocr_config.dpi / 72.0 
+            if progress:
+                progress("ocr", 0, len(page_indices))
             
-            for page_index in range(len(pdf_document)):
+            for pages_done, page_index in enumerate(page_indices, start=1):
                 print(f"Processing Page {page_index + 1} with OCR...")
                 page = pdf_document.get_page(page_index)
+                try:
+                    page_ocr = _ocr_rendered_page(page, self.config.ocr, self._get_ocr_engine())
+                finally:
+                    page.close()
+                full_ocr_text.append(page_ocr)
+                if on_result:
+                    on_result(page_index, page_ocr)
+                if progress:
+                    progress("ocr", pages_done, len(page_indices))
+        finally:
+            pdf_document.close()
+            
+        return full_ocr_text
+
+    def _ocr_pages_parallel(
+        self,
+        file_path: Path,
+        page_indices: Sequence[int],
+        progress: Optional[ProgressCallback],
+        on_result: Optional[Callable[[int, PageOCR], None]] = None,
+    ) -> List[PageOCR]:
+        """
+        Fans pages out across the OCR process pool.
+
+        Each page is rendered inside the worker that OCRs it, and no more than
+        `max_inflight_pages` pages are submitted at once, so the number of
+        rendered bitmaps alive at any time stays bounded. Results are slotted
+        back by position to keep the original page order.
+        """
+        ocr_config = self.config.ocr
+        page_indices = list(page_indices)
+        page_count = len(page_indices)
+        
+        max_inflight = max(1, ocr_config.max_inflight_pages)
+        pool = self._get_ocr_pool()
+        print(f"Processing {page_count} pages with OCR on {ocr_config.workers} workers...")
+        if progress:
+            progress("ocr", 0, page_count)
+        
+        full_ocr_text: List[Optional[PageOCR]] = [None] * page_count
+        slot_of = {}
+        pending = set()
+        next_slot = 0
+        pages_done = 0
+        try:
+            while next_slot < page_count or pending:
+                while next_slot < page_count and len(pending) < max_inflight:
+                    future = pool.submit(_ocr_page, str(file_path), page_indices[next_slot], ocr_config)
+                    slot_of[future] = next_slot
+                    pending.add(future)
+                    next_slot += 1
                 
-                # Render page to a PIL Image object
-                bitmap = page.render(scale=scale)
-                pil_image = bitmap.to_pil()
-                
-                # Run Tesseract OCR with the configured parameters
-                page_text = pytesseract.image_to_string(pil_image, config=tesseract_args)
-                full_ocr_text.append(page_text)
-                
-            return "\n\n---PAGE BREAK---\n\n".join(full_ocr_text)
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    slot = slot_of.pop(future)
+                    full_ocr_text[slot] = future.result()
+                    if on_result:
+                        on_result(page_indices[slot], full_ocr_text[slot])
+                    pages_done += 1
+                    if progress:
+                        progress("ocr", pages_done, page_count)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); start a fresh pool on the next document
+            self._discard_ocr_pool(pool)
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+            
+        return full_ocr_text
 
-        except pytesseract.TesseractNotFoundError:
-            # Handle Tesseract not found error, which is critical for OCR
-            return f"Error: Tesseract not found. Check TESSERACT_PATH in config and ensure Tesseract is installed."
-        except Exception as e:
-            return f"Error during PDF OCR extraction: {e}"
+    def _get_ocr_engine(self) -> OCREngine:
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            engine = create_ocr_engine(self.config.ocr)
+            self._local.engine = engine
+            with self._engines_lock:
+                self._engines.append(engine)
+        return engine
+
+    def _get_ocr_pool(self) -> ProcessPoolExecutor:
+        with self._ocr_pool_lock:
+            if self._ocr_pool is None:
+                # spawn rather than fork: the API process runs threads and an event loop.
+                # Workers are long-lived and load their OCR engine once, in the initializer.
+                self._ocr_pool = ProcessPoolExecutor(
+                    max_workers=self.config.ocr.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_ocr_worker,
+                    initargs=(self.config.ocr,),
+                )
+            return self._ocr_pool
+
+    def _discard_ocr_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Drops a broken pool, unless another thread already replaced it."""
+        with self._ocr_pool_lock:
+            if self._ocr_pool is pool:
+                self._ocr_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# OCR engine of the current pool process, created by `_init_ocr_worker`
+_worker_engine: Optional[OCREngine] = None
+
+
+def _init_ocr_worker(ocr_config: OCRConfig) -> None:
+    global _worker_engine
+    _worker_engine = create_ocr_engine(ocr_config)
+
+
+def _ocr_worker_health() -> Dict[str, Any]:
+    """Runs inside an OCR pool process."""
+    try:
+        report = _worker_engine.health()
+    except Exception as e:
+        report = {"ok": False, "error": str(e)}
+    report["pid"] = os.getpid()
+    return report
+
+
+def _ocr_page(file_path: str, page_index: int, ocr_config: OCRConfig) -> PageOCR:
+    """Renders and OCRs a single PDF page. Runs inside an OCR pool process."""
+    pdf_document = pdfium.PdfDocument(file_path)
+    try:
+        page = pdf_document.get_page(page_index)
+        try:
+            return _ocr_rendered_page(page, ocr_config, _worker_engine)
+        finally:
+            page.close()
+    finally:
+        pdf_document.close()
+
+
+# Tesseract OSD script names and the language pack that reads them
+SCRIPT_LANGUAGES = {"Latin": "eng", "Arabic": "ara"}
+
+
+def _page_language(image: Image.Image, ocr_config: OCRConfig, engine: OCREngine) -> Optional[str]:
+    """
+    The single configured language pack a page needs, or None to read it
+    with all of them.
+
+    Loading every pack roughly multiplies recognition time by their number,
+    while most pages are in one script. Pages whose script OSD cannot name
+    with `min_script_confidence` (mixed or unknown scripts, near-empty
+    pages) keep the full `language` setting.
+    """
+    languages = ocr_config.language.split("+")
+    if not ocr_config.detect_script or len(languages) < 2:
+        return None
+    detected = engine.detect_script(image)
+    if detected is None:
+        return None
+    script, confidence = detected
+    language = SCRIPT_LANGUAGES.get(script)
+    if language not in languages or confidence < ocr_config.min_script_confidence:
+        return None
+    return language
+
+
+def _ocr_rendered_page(page: pdfium.PdfPage, ocr_config: OCRConfig, engine: OCREngine) -> PageOCR:
+    """
+    OCRs one page at the configured DPI, or adaptively when `adaptive_dpi` is set.
+
+    With `detect_script`, a grayscale render at `probe_dpi` is first run
+    through OSD to pick the language pack (see `_page_language`). A
+    single-language read below `min_confidence` is retried with all
+    languages, in either mode.
+
+    In adaptive mode the page is first rendered in grayscale at `probe_dpi`
+    and read with its word confidences; it is re-rendered at the full `dpi`
+    only when the mean confidence falls below `min_confidence` (or no words
+    were found). Rendering at half the resolution in one channel cuts the
+    bitmap to roughly a twelfth of the full RGB render.
+    """
+    probe_dpi = min(ocr_config.probe_dpi, ocr_config.dpi)
+    probe_image = None
+    language = None
+    if ocr_config.detect_script:
+        probe_image = page.render(scale=probe_dpi / 72.0, grayscale=True).to_pil()
+        language = _page_language(probe_image, ocr_config, engine)
+
+    if not ocr_config.adaptive_dpi:
+        # Calculate scale factor for DPI (e.g., 300 dpi / 72 base dpi)
+        pil_image = page.render(scale=ocr_config.dpi / 72.0).to_pil()
+        if not language:
+            text, _ = engine.recognize(pil_image)
+            return PageOCR(text, ocr_config.dpi, language=ocr_config.language)
+        # OSD only names the dominant script: a weak single-language read is
+        # retried with all languages in case the page mixes scripts
+        text, confidence = engine.recognize(pil_image, with_confidence=True, language=language)
+        result = PageOCR(text, ocr_config.dpi, confidence, language)
+        if _below_confidence(result, ocr_config):
+            text, confidence = engine.recognize(pil_image, with_confidence=True)
+            if (confidence or 0) > (result.confidence or 0):
+                result = PageOCR(text, ocr_config.dpi, confidence, ocr_config.language)
+        return result
+    
+    result = _ocr_with_confidence(page, probe_dpi, engine, language, probe_image)
+    if probe_dpi < ocr_config.dpi and _below_confidence(result, ocr_config):
+        result = _ocr_with_confidence(page, ocr_config.dpi, engine, language)
+    if language and _below_confidence(result, ocr_config):
+        retry = _ocr_with_confidence(page, result.dpi, engine)
+        if (retry.confidence or 0) > (result.confidence or 0):
+            result = retry
+    if result.language is None:
+        result.language = ocr_config.language
+    return result
+
+
+def _below_confidence(result: PageOCR, ocr_config: OCRConfig) -> bool:
+    return result.confidence is None or result.confidence < ocr_config.min_confidence
+
+
+def _ocr_with_confidence(
+    page: pdfium.PdfPage,
+    dpi: int,
+    engine: OCREngine,
+    language: Optional[str] = None,
+    image: Optional[Image.Image] = None,
+) -> PageOCR:
+    """`image` is an existing grayscale render of the page at `dpi`."""
+    pil_image = image if image is not None else page.render(scale=dpi / 72.0, grayscale=True).to_pil()
+    text, confidence = engine.recognize(pil_image, with_confidence=True, language=language)
+    return PageOCR(text, dpi, confidence, language)
 
 
 # --- Worker Function ---
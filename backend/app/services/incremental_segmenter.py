@@ -0,0 +1,146 @@
+import asyncio
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.services.clause_diff import ClauseMapping, MappedClause, map_clauses
+from app.services.local_segmenter import segment_locally
+from app.services.segmenter import ClauseExtractionResult, extract_clauses
+
+# Words compared when matching a re-segmented clause to the clause it replaces
+_MATCH_WORDS = 8
+
+
+async def _segment_region(text: str, min_confidence: float) -> ClauseExtractionResult:
+    result, confidence = segment_locally(text)
+    if confidence >= min_confidence:
+        return result
+    return await extract_clauses(text)
+
+
+def _regions(mapping: ClauseMapping) -> List[Tuple[int, int, List[MappedClause]]]:
+    """
+    Word ranges of the new content to segment again, with the clauses they
+    replace: every insertion outside the clauses, merged with the edited
+    clauses directly around it. Edited clauses with no new text next to them
+    are not part of any region; they keep their place and id.
+    """
+    # (start, order, clause or None for an insertion, end)
+    items = [(start, 0, None, end) for start, end, _ in mapping.insertions]
+    items += [
+        (item.start, 1, item, item.end)
+        for item in mapping.clauses if item.start is not None
+    ]
+    items.sort(key=lambda item: (item[0], item[1]))
+
+    regions = []
+    run: List[Tuple[int, int, Optional[MappedClause], int]] = []
+
+    def close() -> None:
+        if any(clause is None for _, _, clause, _ in run):
+            start = min(item[0] for item in run)
+            end = max(item[3] for item in run)
+            regions.append((start, end, [clause for _, _, clause, _ in run if clause is not None]))
+        run.clear()
+
+    for item in items:
+        clause = item[2]
+        if clause is None or clause.touched:
+            run.append(item)
+        else:
+            close()
+    close()
+    return regions
+
+
+def _opening(text: str) -> Tuple[str, ...]:
+    return tuple(text.split()[:_MATCH_WORDS])
+
+
+async def resegment_incrementally(
+    original_content: str,
+    original_clauses: Sequence,
+    content: str,
+    min_confidence: float,
+    max_resegmented_share: float = 0.5,
+) -> Optional[Tuple[List[dict], Dict[str, int]]]:
+    """
+    Updates the clauses segmented from `original_content` for the edited
+    `content` without segmenting the whole text again.
+
+    Untouched clauses are kept as they are. Edited clauses take their new
+    text and keep their id. Clauses whose text was deleted are dropped. Only
+    new text outside the existing clauses, together with the edited clauses
+    around it, is segmented again: locally when the local segmenter is
+    confident enough, with the LLM otherwise. Re-segmented clauses that
+    start like a clause they replace take over its id, level and heading.
+
+    Returns the clauses and counts of what happened to them, or None when
+    the clauses cannot be mapped or more than `max_resegmented_share` of
+    the text is rewritten or would need segmenting again (past that, the
+    diff hands new clauses to the edited ones around them).
+    """
+    if content == original_content:
+        clauses = [dict(clause if isinstance(clause, dict) else clause.model_dump()) for clause in original_clauses]
+        return clauses, {"kept": len(clauses), "edited": 0, "removed": 0, "regions": 0, "resegmented": 0}
+
+    mapping = await asyncio.to_thread(map_clauses, original_content, original_clauses, content)
+    if mapping is None:
+        return None
+    regions = _regions(mapping)
+    limit = max_resegmented_share * max(len(mapping.word_spans), 1)
+    if mapping.changed_words > limit or sum(end - start for start, end, _ in regions) > limit:
+        return None
+
+    results = await asyncio.gather(*(
+        _segment_region(mapping.text(start, end), min_confidence) for start, end, _ in regions
+    ))
+    in_region = {id(clause) for _, _, replaced in regions for clause in replaced}
+    stats = {"kept": 0, "edited": 0, "removed": 0, "regions": len(regions), "resegmented": 0}
+
+    # Clauses in document order: kept and edited ones by their old position,
+    # each region's clauses where the region starts
+    ordered: List[Tuple[int, int, object]] = []
+    for index, item in enumerate(mapping.clauses):
+        if id(item) in in_region:
+            continue
+        if item.start is None:
+            ordered.append((-1, index, item.data))
+            continue
+        if item.touched:
+            if item.end <= item.start:
+                stats["removed"] += 1
+                continue
+            stats["edited"] += 1
+            item.data.update(text=mapping.text(item.start, item.end), content=None)
+        else:
+            stats["kept"] += 1
+        ordered.append((item.start, index, item.data))
+    for (start, _, replaced), result in zip(regions, results):
+        ordered.append((start, -1, (replaced, result)))
+    ordered.sort(key=lambda item: (item[0], item[1]))
+
+    used = {str(data["clause_id"]) for _, _, data in ordered if isinstance(data, dict)}
+    clauses: List[dict] = []
+    for _, _, entry in ordered:
+        if isinstance(entry, dict):
+            clauses.append(entry)
+            continue
+        replaced, result = entry
+        by_opening = {
+            _opening(mapping.text(item.start, item.end)): item.data
+            for item in replaced if item.end > item.start
+        }
+        for new in result.clauses:
+            data = new.model_dump()
+            old = by_opening.pop(_opening(new.text), None)
+            if old is not None:
+                data.update(clause_id=old["clause_id"], level=old["level"], heading=new.heading or old.get("heading"))
+            elif not data["clause_id"] or data["clause_id"] in used:
+                # Numbered from scratch within the region: continue from the clause before it
+                previous = clauses[-1] if clauses else {"clause_id": "0", "level": 1}
+                suffix = 1
+                while f"{previous['clause_id']}-{suffix}" in used:
+                    suffix += 1
+                data.update(clause_id=f"{previous['clause_id']}-{suffix}", level=previous["level"])
+            used.add(str(data["clause_id"]))
+            clauses.append(data)
+            stats["resegmented"] += 1
+    return clauses, stats
@@ -0,0 +1,263 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from app.models.documentUploaded import ContractDocument
+from app.config import settings
+from app.logger import logger
+from app.models.ingestion import IngestionJob, IngestionStage
+from app.repositories.extraction_cache import ExtractionCacheRepository
+from app.services.near_duplicate import index_contract
+from app.services.extractor import (
+    PAGE_BREAK,
+    DocumentExtractor,
+    ExtractionResult,
+    PageCallback,
+    PageExtraction,
+    ProgressCallback,
+)
+
+
+class JobEventLog:
+    """
+    Append-only event log of one ingestion job.
+
+    Subscribers replay the events published so far and then wait for new
+    ones, so a client that connects late (or reconnects) sees every page.
+    Only touched from the event loop thread.
+    """
+
+    def __init__(self):
+        self.events: List[Tuple[str, dict]] = []
+        self.closed = False
+        self._wakeup = asyncio.Event()
+
+    def publish(self, event: str, data: dict, final: bool = False) -> None:
+        self.events.append((event, data))
+        self.closed = self.closed or final
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    async def follow(self, after: int = 0) -> AsyncIterator[Tuple[int, str, dict]]:
+        """Yields (event_id, event, data) for events after `after`, until the job ends."""
+        position = after
+        while True:
+            while position < len(self.events):
+                event, data = self.events[position]
+                position += 1
+                yield position, event, data
+            if self.closed:
+                return
+            await self._wakeup.wait()
+
+
+class IngestionQueue:
+    """
+    Runs document extraction off the event loop.
+
+    Extraction (pdfminer, pdfium rendering, Tesseract) is CPU-bound and
+    blocking, so it is executed on a dedicated thread pool whose size bounds
+    how many documents are processed at once on this worker. Background jobs
+    report their progress on an `IngestionJob` document until the contract
+    content is filled in.
+    """
+
+    def __init__(
+        self,
+        extractor: DocumentExtractor,
+        max_concurrency: int = 2,
+        flush_interval: float = 1.0,
+        event_retention: float = 300.0,
+    ):
+        self.extractor = extractor
+        self.flush_interval = flush_interval
+        self.event_retention = event_retention
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ingestion")
+        self._tasks: Set[asyncio.Task] = set()
+        self._events: Dict[str, JobEventLog] = {}
+
+    def events(self, job_id: str) -> Optional[JobEventLog]:
+        """Event log of a job started by this process, kept for `event_retention` seconds after it ends."""
+        return self._events.get(str(job_id))
+
+    async def extract(
+        self,
+        file_path: Path,
+        progress: Optional[ProgressCallback] = None,
+        file_hash: Optional[str] = None,
+        pdf_backend: Optional[str] = None,
+        on_page: Optional[PageCallback] = None,
+        executor: Optional[Executor] = None,
+    ) -> ExtractionResult:
+        """
+        Run the extractor on the ingestion pool, or on `executor`, and wait for the result.
+
+        When the SHA-256 of the file is given, a previous extraction of the
+        same bytes under the same OCR configuration and PDF text backend is
+        returned instead, and successful extractions are added to the cache.
+        `on_page` is called from the extraction thread as pages complete, and
+        for every cached page on a cache hit.
+        """
+        cache_key = None
+        if file_hash:
+            cache_key = self.extractor.cache_key(file_hash, Path(file_path).suffix, pdf_backend)
+            cached = await ExtractionCacheRepository.get(cache_key)
+            if cached:
+                logger.info(f"Extraction cache hit for {file_hash[:12]}, skipping extraction.")
+                if on_page:
+                    self._replay_pages(cached, on_page)
+                return cached
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            executor or self._executor, self.extractor.extract_document, file_path, progress, pdf_backend, on_page
+        )
+
+        if cache_key and not result.error:
+            await ExtractionCacheRepository.put(cache_key, file_hash, result)
+        return result
+
+    async def submit(
+        self,
+        contract: ContractDocument,
+        file_path: Path,
+        file_hash: Optional[str] = None,
+        pdf_backend: Optional[str] = None,
+    ) -> IngestionJob:
+        """
+        Queue a background extraction for an already stored contract.
+
+        The temporary file at `file_path` is owned by the job and removed
+        once extraction finishes.
+        """
+        job = IngestionJob(contract_id=contract.id, file_name=contract.file_name)
+        await job.insert()
+        self._events[str(job.id)] = JobEventLog()
+
+        task = asyncio.create_task(self._run(job, contract, Path(file_path), file_hash, pdf_backend))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(
+        self,
+        job: IngestionJob,
+        contract: ContractDocument,
+        file_path: Path,
+        file_hash: Optional[str],
+        pdf_backend: Optional[str],
+    ) -> None:
+        # Written from the worker thread, persisted from the event loop.
+        snapshot = {"stage": IngestionStage.EXTRACTING, "pages_done": 0, "pages_total": None}
+        log = self._events[str(job.id)]
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+
+        def progress(stage: str, pages_done: int, pages_total: int) -> None:
+            snapshot["stage"] = IngestionStage(stage)
+            snapshot["pages_done"] = pages_done
+            snapshot["pages_total"] = pages_total
+
+        def on_page(page: PageExtraction, pages_total: int) -> None:
+            data = {
+                "page_index": page.page_index,
+                "pages_total": pages_total,
+                "method": page.method,
+                "chars": page.char_count,
+                "elapsed": round(time.monotonic() - started, 3),
+                "dpi": page.dpi,
+                "ocr_confidence": page.ocr_confidence,
+                "ocr_language": page.ocr_language,
+                "text": page.text,
+            }
+            loop.call_soon_threadsafe(log.publish, "page", data)
+
+        await self._update(job, stage=IngestionStage.EXTRACTING)
+        flusher = asyncio.create_task(self._flush_progress(job, snapshot))
+        error = None
+        interrupted = None
+        try:
+            result = await self.extract(file_path, progress, file_hash, pdf_backend, on_page)
+            if result.error:
+                raise RuntimeError(result.error)
+            await contract.update({"$set": {
+                "content": result.text,
+                "extraction_stats": result.summary(),
+                "last_updated": datetime.utcnow(),
+            }})
+            await index_contract(contract, settings.NEAR_DUPLICATE_THRESHOLD)
+        except asyncio.CancelledError as e:
+            # Shutdown: end the job instead of leaving it extracting, then stop
+            logger.warning(f"Ingestion job {job.id} interrupted.")
+            error = "Ingestion was interrupted before it finished."
+            interrupted = e
+        except Exception as e:
+            logger.error(f"Ingestion job {job.id} failed: {e}")
+            error = str(e)
+        finally:
+            await self._stop(flusher)
+            file_path.unlink(missing_ok=True)
+
+        loop.call_later(self.event_retention, self._events.pop, str(job.id), None)
+        if interrupted is not None:
+            log.publish("failed", {"error": error}, final=True)
+            await self._update(job, stage=IngestionStage.FAILED, error=error, finished_at=datetime.utcnow())
+            raise interrupted
+
+        if error:
+            await self._update(job, stage=IngestionStage.FAILED, error=error, finished_at=datetime.utcnow())
+            log.publish("failed", {"error": error}, final=True)
+        else:
+            pages_total = len(result.pages) if result.cache_hit else snapshot["pages_total"]
+            await self._update(
+                job,
+                stage=IngestionStage.COMPLETED,
+                pages_done=pages_total or snapshot["pages_done"],
+                pages_total=pages_total,
+                finished_at=datetime.utcnow(),
+            )
+            log.publish("completed", {
+                "contract_id": str(contract.id),
+                "elapsed": round(time.monotonic() - started, 3),
+                "extraction_stats": result.summary(),
+            }, final=True)
+
+    @staticmethod
+    def _replay_pages(result: ExtractionResult, on_page: PageCallback) -> None:
+        # Cached pages are stored without text; it is recovered from the joined document text
+        texts = result.text.split(PAGE_BREAK)
+        if len(texts) != len(result.pages):
+            texts = [""] * len(result.pages)
+        for page, text in zip(result.pages, texts):
+            on_page(replace(page, text=text), len(result.pages))
+
+    async def _flush_progress(self, job: IngestionJob, snapshot: dict) -> None:
+        last = None
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            current = dict(snapshot)
+            if current != last:
+                await self._update(job, **current)
+                last = current
+
+    @staticmethod
+    async def _stop(task: asyncio.Task) -> None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    @staticmethod
+    async def _update(job: IngestionJob, **fields) -> None:
+        fields["updated_at"] = datetime.utcnow()
+        await job.set(fields)
+
+    async def shutdown(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional, Type, TypeVar
+import httpx
+from agno.agent import Agent
+from agno.models.openai import OpenAIChat
+from agno.run.agent import RunOutput
+from pydantic import BaseModel
+from app.config import settings
+from app.services.llm_cache import ResponseCache
+
+T = TypeVar("T")
+
+# Base URL and API key of each OpenAI-compatible provider the agents talk to
+PROVIDERS = {
+    "groq": lambda: (settings.GROQ_BASE_URL, settings.GROQ_API_KEY),
+}
+
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+
+response_cache = ResponseCache(max_entries=settings.LLM_CACHE_MAX_ENTRIES, ttl=settings.LLM_CACHE_TTL)
+
+
+class LLMTimeoutError(TimeoutError):
+    """An agent call ran past its deadline and was cancelled."""
+
+
+def http_client(provider: str = "groq") -> httpx.AsyncClient:
+    """
+    The provider's pooled async HTTP client, shared by every model so that
+    concurrent agent calls reuse connections instead of opening their own.
+    """
+    client = _http_clients.get(provider)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.LLM_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            ),
+        )
+        _http_clients[provider] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
+
+
+def chat_model(provider: str = "groq", **kwargs: Any) -> OpenAIChat:
+    """An OpenAI-compatible chat model for `provider` on its pooled HTTP client."""
+    base_url, api_key = PROVIDERS[provider]()
+    return OpenAIChat(
+        id=kwargs.pop("id", settings.GROQ_MODEL),
+        api_key=api_key,
+        base_url=base_url,
+        http_client=http_client(provider),
+        timeout=settings.LLM_TIMEOUT,
+        **kwargs,
+    )
+
+
+async def arun(agent: Agent, prompt: str, timeout: Optional[float] = None, **kwargs: Any) -> RunOutput:
+    """
+    Runs `agent` on its async path without blocking the event loop.
+
+    The call is cancelled after `timeout` seconds (LLM_TIMEOUT by default)
+    and raises LLMTimeoutError; cancelling the awaiting task cancels the
+    request as well.
+    """
+    timeout = settings.LLM_TIMEOUT if timeout is None else timeout
+    try:
+        return await asyncio.wait_for(agent.arun(prompt, stream=False, **kwargs), timeout)
+    except asyncio.TimeoutError:
+        raise LLMTimeoutError(f"{agent.name} did not answer within {timeout} seconds.") from None
+
+
+async def arun_cached(
+    agent: Agent,
+    prompt: str,
+    parse: Callable[[RunOutput], Optional[T]],
+    result_type: Optional[Type[BaseModel]] = None,
+    timeout: Optional[float] = None,
+    cache_scope: str = "",
+    **kwargs: Any,
+) -> Optional[T]:
+    """
+    `arun` behind the response cache.
+
+    `parse` turns the response into the value that is returned and cached,
+    so a hit skips the call and the parsing; it returns None (or raises) for
+    responses that must not be cached. Pydantic results are cached dumped and
+    revalidated as `result_type`. `cache_scope` separates responses that
+    depend on state outside the prompt, such as the policies in a knowledge base.
+    """
+    if not response_cache.enabled:
+        return parse(await arun(agent, prompt, timeout, **kwargs))
+    key = ResponseCache.key(agent, prompt, cache_scope)
+    cached = await response_cache.get(key, result_type)
+    if cached is not None:
+        return cached
+    value = parse(await arun(agent, prompt, timeout, **kwargs))
+    if value is not None:
+        await response_cache.put(key, str(agent.model.id), value)
+    return value
@@ -0,0 +1,101 @@
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Type
+from agno.agent import Agent
+from pydantic import BaseModel
+from app.repositories.llm_cache import LLMCacheRepository
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Parsed LLM responses, keyed by model id, instructions and prompt.
+
+    A bounded in-process LRU answers repeated calls without any I/O; behind
+    it, responses persist in Mongo for `ttl` seconds so they survive
+    restarts and are shared by all workers. `max_entries=0` disables the
+    LRU, `ttl=0` the whole cache. Failures of the persistent tier are logged
+    and treated as misses.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: int = 7 * 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def key(agent: Agent, prompt: str, scope: str = "") -> str:
+        instructions = agent.instructions if isinstance(agent.instructions, (list, str)) else repr(agent.instructions)
+        schema = agent.output_schema.model_json_schema() if isinstance(agent.output_schema, type) else None
+        return ":".join([
+            str(agent.model.id),
+            *([scope] if scope else []),
+            _digest(json.dumps([instructions, schema], sort_keys=True, default=str)),
+            _digest(prompt),
+        ])
+
+    async def get(self, key: str, result_type: Optional[Type[BaseModel]] = None) -> Optional[Any]:
+        """The cached response, revalidated as `result_type` if given; a copy the caller may change."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return copy.deepcopy(value)
+            del self._entries[key]
+
+        try:
+            stored = await LLMCacheRepository.get(key)
+        except Exception as e:
+            print(f"LLM cache lookup failed: {e}")
+            stored = None
+        if stored is None:
+            self.misses += 1
+            return None
+        value = result_type.model_validate(stored) if result_type else stored
+        self._remember(key, value)
+        self.persistent_hits += 1
+        return copy.deepcopy(value)
+
+    async def put(self, key: str, model_id: str, value: Any) -> None:
+        self._remember(key, copy.deepcopy(value))
+        stored = value.model_dump(mode="json") if isinstance(value, BaseModel) else value
+        try:
+            await LLMCacheRepository.put(key, model_id, stored, self.ttl)
+        except Exception as e:
+            print(f"LLM cache write failed: {e}")
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.persistent_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries_in_memory": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.persistent_hits) / lookups, 3) if lookups else None,
+        }
@@ -0,0 +1,317 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from app.services.segmenter import ClauseExtractionResult, ExtractedClause
+
+# Arabic-Indic and Eastern Arabic-Indic digits, read as ASCII digits
+_DIGITS = str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹", "01234567890123456789")
+
+# Letters used for lettered lists in Arabic contracts, in abjad order
+ABJAD = "أبجدهوزحطيكلمنسعفصقرشتثخذضظغ"
+
+ARABIC_ORDINALS = {
+    "الأولى": 1, "الاولى": 1, "الأول": 1, "الاول": 1,
+    "الثانية": 2, "الثاني": 2, "الثالثة": 3, "الثالث": 3,
+    "الرابعة": 4, "الرابع": 4, "الخامسة": 5, "الخامس": 5,
+    "السادسة": 6, "السادس": 6, "السابعة": 7, "السابع": 7,
+    "الثامنة": 8, "الثامن": 8, "التاسعة": 9, "التاسع": 9,
+    "العاشرة": 10, "العاشر": 10,
+}
+
+_TERMINATOR = r"(?:[.)\-–:]|(?=\s)|$)"
+_KEYWORD = re.compile(
+    r"^(?:article|section|clause|part|المادة|مادة|البند|بند|الفصل|فصل)\s+"
+    r"(\d{1,3}(?:\.\d{1,3})*|[ivxlc]{1,6}|" + "|".join(sorted(ARABIC_ORDINALS, key=len, reverse=True)) + r")"
+    + _TERMINATOR + r"\s*[-–:]?\s*",
+    re.IGNORECASE,
+)
+_DECIMAL = re.compile(r"^(\d{1,3}(?:\.\d{1,3})+)\.?(?=\s|$)\s*|^(\d{1,3})[.)\-–](?=\s|$)\s*")
+_LETTER = re.compile(r"^\(([a-zA-Z]{1,6})\)\s*|^([a-zA-Z]{1,6})[.)](?=\s|$)\s*")
+_ABJAD = re.compile(r"^\(?([" + ABJAD + r"])ـ?[).\-](?=\s|$)\s*")
+
+# Lines that end the clauses: execution and signature blocks
+_STOP = re.compile(r"^(?:in witness whereof|signatures?\s*:?$|signed by|وإثباتا لما تقدم|واثباتا لما تقدم|التوقيعات?\s*:?$)", re.IGNORECASE)
+
+_ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100, "d": 500, "m": 1000}
+
+# Extractor markers left at the edges of a clause
+_EDGE_MARKERS = re.compile(r"^(?:\s*---(?:PAGE BREAK|TABLE ROW)---\s*)+|(?:\s*---(?:PAGE BREAK|TABLE ROW)---\s*)+$")
+
+# Heading lines are short and carry no sentence punctuation
+MAX_HEADING_WORDS = 12
+
+
+def roman_value(numeral: str) -> Optional[int]:
+    """Value of a well-formed Roman numeral, or None."""
+    numeral = numeral.lower()
+    if not numeral or any(ch not in _ROMAN_VALUES for ch in numeral):
+        return None
+    total = 0
+    for current, following in zip(numeral, numeral[1:] + " "):
+        value = _ROMAN_VALUES[current]
+        total += -value if following != " " and _ROMAN_VALUES[following] > value else value
+    return total if to_roman(total) == numeral else None
+
+
+def to_roman(value: int) -> str:
+    numerals = [(1000, "m"), (900, "cm"), (500, "d"), (400, "cd"), (100, "c"), (90, "xc"),
+                (50, "l"), (40, "xl"), (10, "x"), (9, "ix"), (5, "v"), (4, "iv"), (1, "i")]
+    result = ""
+    for number, numeral in numerals:
+        while value >= number:
+            result += numeral
+            value -= number
+    return result
+
+
+@dataclass
+class _Marker:
+    scheme: str  # "keyword", "decimal:<depth>", "alpha", "ALPHA", "roman", "ROMAN" or "abjad"
+    value: int  # position in its sequence (1 for "1", "a", "i", "أ")
+    label: str  # the marker as written, digits in ASCII
+    rest: str  # the line after the marker
+    parent_label: Optional[str] = None  # for decimals, the number of the parent ("1.2" for "1.2.3")
+
+
+@dataclass
+class _Open:
+    scheme: str
+    value: int
+    clause_id: str
+    label: str
+
+
+_MINOR_WORDS = {"of", "and", "the", "to", "for", "in", "on", "a", "an", "or", "by", "with", "&"}
+
+
+def _is_heading(line: str) -> bool:
+    words = line.split()
+    return 0 < len(words) <= MAX_HEADING_WORDS and not re.search(r"[.;,،؛]$", line)
+
+
+def _is_title(line: str) -> bool:
+    """A heading on the numbered line itself: "Payment Terms", "CONFIDENTIALITY", "التعريفات"."""
+    if not _is_heading(line):
+        return False
+    latin = [word for word in line.split() if word[0].isascii() and word[0].isalpha()]
+    if not latin:
+        # No letter case to go by; only accept short Arabic titles
+        return len(line.split()) <= 5
+    significant = [word for word in latin if word.lower() not in _MINOR_WORDS]
+    return bool(significant) and sum(word[0].isupper() for word in significant) / len(significant) >= 0.6
+
+
+def _is_caps_heading(line: str) -> bool:
+    letters = [ch for ch in line if ch.isalpha()]
+    return _is_heading(line) and len(letters) >= 3 and all(ch.isupper() for ch in letters)
+
+
+class LocalSegmenter:
+    """
+    Rule-based clause segmentation for contracts with explicit numbering.
+
+    Recognises decimal numbering (1., 1.1, 2.3.4, 1-, 1)), Article/Section
+    and المادة/البند keywords (with Arabic ordinals), lettered items ((a),
+    A.), Roman numerals ((iv), II.) and abjad-lettered Arabic items (أ-,
+    ب)), in ASCII or Arabic-Indic digits. The hierarchy comes from the order
+    in which schemes open: a scheme already on the stack continues a
+    sibling sequence, a new one starts a child level.
+
+    `segment` returns the clauses with a structural confidence in [0, 1]
+    that says how consistently the numbering ran (siblings counting up,
+    children starting at 1/a/i) and whether the clauses plausibly cover the
+    document. Callers fall back to the LLM below their threshold.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def segment(self) -> Tuple[ClauseExtractionResult, float]:
+        lines = self._lines()
+        stack: List[_Open] = []
+        clauses: List[dict] = []
+        consistent = 0
+        pending_heading: Optional[Tuple[int, str]] = None  # (line number, text) of a caps line
+        end_of_clauses = len(lines)
+
+        for number, (offset, line) in enumerate(lines):
+            stripped = line.strip()
+            if _STOP.match(stripped):
+                end_of_clauses = number
+                break
+            marker = self._marker(stripped, stack)
+            if marker is None:
+                if _is_caps_heading(stripped) and not re.match(r"^-+[A-Z ]+-+$", stripped):
+                    pending_heading = (number, stripped)
+                elif stripped:
+                    pending_heading = None
+                continue
+
+            level, clause_id, in_sequence = self._place(marker, stack)
+            consistent += in_sequence
+            heading = None
+            first_line = number
+            if _is_title(marker.rest):
+                heading = marker.rest
+            else:
+                # "1. Definitions. In this Agreement..."
+                match = re.match(r"^([^.:]{2,60})[.:]\s+\S", marker.rest)
+                if match and len(match.group(1).split()) <= 5 and match.group(1)[0].isupper():
+                    heading = match.group(1)
+            if heading is None and pending_heading is not None:
+                # "PAYMENT TERMS" on its own line right above "5. The Customer shall...".
+                # A title on the numbered line wins: the caps line is then e.g. the document title
+                heading = pending_heading[1]
+                first_line = pending_heading[0]
+            pending_heading = None
+            clauses.append({"clause_id": clause_id, "heading": heading, "level": level, "line": first_line})
+
+        # Clause text runs from its first line to the next clause's first line
+        extracted: List[ExtractedClause] = []
+        boundaries = [clause["line"] for clause in clauses] + [end_of_clauses]
+        sizes = []
+        for clause, start, end in zip(clauses, boundaries, boundaries[1:]):
+            text = self._slice(lines, start, end)
+            sizes.append(len(text))
+            extracted.append(ExtractedClause(
+                clause_id=clause["clause_id"], text=text, heading=clause["heading"], level=clause["level"],
+            ))
+
+        preamble = self._slice(lines, 0, boundaries[0])
+        if len(preamble.split()) >= 30:
+            # Recitals and party details before the first numbered clause
+            extracted.insert(0, ExtractedClause(clause_id="0", text=preamble, heading=None, level=0))
+
+        confidence = self._confidence(len(clauses), consistent, sizes, len(preamble))
+        return ClauseExtractionResult(clauses=extracted, total_clauses=len(extracted)), confidence
+
+    def _lines(self) -> List[Tuple[int, str]]:
+        lines, offset = [], 0
+        for line in self.text.split("\n"):
+            lines.append((offset, line))
+            offset += len(line) + 1
+        return lines
+
+    def _slice(self, lines: List[Tuple[int, str]], start: int, end: int) -> str:
+        if start >= end:
+            return ""
+        begin = lines[start][0]
+        finish = lines[end][0] if end < len(lines) else len(self.text)
+        return _EDGE_MARKERS.sub("", self.text[begin:finish]).strip()
+
+    def _marker(self, line: str, stack: List[_Open]) -> Optional[_Marker]:
+        normalized = line.translate(_DIGITS)
+
+        match = _KEYWORD.match(normalized)
+        if match:
+            token = match.group(1)
+            rest = normalized[match.end():].strip()
+            if "." in token:
+                # "Section 3.2" is decimal numbering behind a keyword
+                parts = token.split(".")
+                return _Marker(f"decimal:{len(parts)}", int(parts[-1]), token, rest, parent_label=".".join(parts[:-1]))
+            if token.isdigit():
+                value = int(token)
+            elif token in ARABIC_ORDINALS:
+                value = ARABIC_ORDINALS[token]
+            else:
+                value = roman_value(token)
+                if value is None:
+                    return None
+            return _Marker("keyword", value, str(value), rest)
+
+        match = _DECIMAL.match(normalized)
+        if match:
+            label = match.group(1) or match.group(2)
+            parts = label.split(".")
+            return _Marker(
+                f"decimal:{len(parts)}", int(parts[-1]), label, normalized[match.end():].strip(),
+                parent_label=".".join(parts[:-1]) or None,
+            )
+
+        match = _ABJAD.match(normalized)
+        if match:
+            letter = match.group(1)
+            return _Marker("abjad", ABJAD.index(letter) + 1, letter, normalized[match.end():].strip())
+
+        match = _LETTER.match(normalized)
+        if match:
+            token = match.group(1) or match.group(2)
+            rest = normalized[match.end():].strip()
+            upper = token.isupper()
+            if not (token.isupper() or token.islower()):
+                return None
+            roman = roman_value(token)
+            if roman is not None and (roman > 50 or set(token.lower()) & {"d", "m"}):
+                # List numbering stays small; "mix." or "did." are words
+                roman = None
+            if len(token) == 1 and not self._prefers_roman(token, roman, stack):
+                return _Marker("ALPHA" if upper else "alpha", ord(token.lower()) - ord("a") + 1, token, rest)
+            if roman is not None:
+                return _Marker("ROMAN" if upper else "roman", roman, token, rest)
+        return None
+
+    @staticmethod
+    def _prefers_roman(letter: str, roman: Optional[int], stack: List[_Open]) -> bool:
+        """Whether a one-letter marker such as "(i)" or "(v)" reads as a Roman numeral here."""
+        if roman is None:
+            return False
+        upper = letter.isupper()
+        alpha_scheme, roman_scheme = ("ALPHA", "ROMAN") if upper else ("alpha", "roman")
+        for entry in reversed(stack):
+            if entry.scheme == roman_scheme:
+                return roman == entry.value + 1 or roman == 1
+            if entry.scheme == alpha_scheme:
+                # "(i)" right after "(h)" continues the letters
+                return ord(letter.lower()) - ord("a") + 1 != entry.value + 1
+        return roman == 1
+
+    @staticmethod
+    def _place(marker: _Marker, stack: List[_Open]) -> Tuple[int, str, bool]:
+        """Pushes the marker on the stack; returns its level, clause id and whether it continued a sequence."""
+        sibling = next((i for i in range(len(stack) - 1, -1, -1) if stack[i].scheme == marker.scheme), None)
+        if sibling is not None:
+            previous = stack[sibling]
+            del stack[sibling:]
+            in_sequence = marker.value == previous.value + 1
+        else:
+            in_sequence = marker.value == 1
+        if marker.parent_label is not None:
+            # A decimal's parent is the clause whose number prefixes it
+            parent = next((i for i in range(len(stack) - 1, -1, -1) if stack[i].label == marker.parent_label), None)
+            in_sequence = in_sequence and parent is not None
+            if parent is not None:
+                del stack[parent + 1:]
+
+        if marker.scheme == "keyword" or marker.parent_label is not None:
+            clause_id = marker.label
+        elif marker.scheme.startswith("decimal"):
+            # "1." nested under "Article 3" becomes "3.1"
+            clause_id = f"{stack[-1].clause_id}.{marker.label}" if stack else marker.label
+        else:
+            parent_id = stack[-1].clause_id if stack else ""
+            clause_id = f"{parent_id}({marker.label})"
+        stack.append(_Open(marker.scheme, marker.value, clause_id, marker.label))
+        return len(stack), clause_id, in_sequence
+
+    @staticmethod
+    def _confidence(markers: int, consistent: int, sizes: List[int], preamble_chars: int) -> float:
+        if markers < 3:
+            return 0.0
+        sequence = consistent / markers
+        total = sum(sizes) + preamble_chars
+        structure = 1.0
+        if total:
+            preamble_share = preamble_chars / total
+            largest_share = max(sizes) / total
+            # Numbering that only covers a small part of the document
+            structure -= max(0.0, preamble_share - 0.4)
+            # One "clause" swallowing the document: numbering was missed
+            if markers > 3:
+                structure -= max(0.0, largest_share - 0.5)
+        return round(max(0.0, sequence * structure), 3)
+
+
+def segment_locally(contract_text: str) -> Tuple[ClauseExtractionResult, float]:
+    """Rule-based segmentation and its structural confidence (see LocalSegmenter)."""
+    return LocalSegmenter(contract_text).segment()
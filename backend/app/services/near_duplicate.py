@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from beanie import PydanticObjectId
+from app.models.documentUploaded import ContractDocument
+from app.repositories.fingerprint import FingerprintRepository
+from app.services.clause_diff import map_clauses
+
+# MinHash over word shingles, indexed with LSH: NUM_PERM = LSH_BANDS * LSH_ROWS.
+# Two contracts share a band with probability 1 - (1 - s^8)^16 for Jaccard
+# similarity s: ~0.98 at s=0.8, ~0.1 at s=0.5.
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = 8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_permutations = np.random.RandomState(1).randint(1, (1 << 61) - 1, size=(2, NUM_PERM), dtype=np.uint64)
+_PERM_A, _PERM_B = _permutations[0], _permutations[1]
+_HASH_CHUNK = 2048
+
+_WORD = re.compile(r"\w+")
+_ARABIC_DIACRITICS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed]")
+_DIGITS = re.compile(r"\d")
+
+
+def _normalize_words(text: str) -> List[str]:
+    """
+    Words compared by the fingerprint: case-folded, without Arabic
+    diacritics, and with every digit replaced, so that dates, amounts and
+    numbering differences do not count as changes.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _ARABIC_DIACRITICS.sub("", text)
+    return [_DIGITS.sub("0", word) for word in _WORD.findall(text)]
+
+
+def _shingles(words: Sequence[str]) -> Set[str]:
+    if len(words) <= SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text: str) -> Optional[List[int]]:
+    """MinHash signature of `text`'s word shingles, or None for text without words."""
+    shingles = _shingles(_normalize_words(text))
+    if not shingles:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    signature = np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    # Chunked so the (shingles x permutations) matrix stays small; uint64 overflow wraps by design
+    for start in range(0, len(hashes), _HASH_CHUNK):
+        chunk = hashes[start:start + _HASH_CHUNK, np.newaxis]
+        permuted = ((chunk * _PERM_A + _PERM_B) % _MERSENNE_PRIME) & _MAX_HASH
+        np.minimum(signature, permuted.min(axis=0), out=signature)
+    return signature.tolist()
+
+
+def lsh_bands(signature: Sequence[int]) -> List[str]:
+    """One key per band of LSH_ROWS signature values; equal keys mean a candidate pair."""
+    values = np.asarray(signature, dtype=np.uint64)
+    return [
+        f"{band}:{hashlib.blake2b(values[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes(), digest_size=8).hexdigest()}"
+        for band in range(LSH_BANDS)
+    ]
+
+
+def estimated_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.mean(np.asarray(a) == np.asarray(b)))
+
+
+async def find_near_duplicate(
+    contract_id: PydanticObjectId, signature: List[int], bands: List[str], threshold: float
+) -> Optional[Tuple[ContractDocument, float]]:
+    """
+    The most similar contract that already has clauses, if its estimated
+    similarity reaches `threshold`.
+    """
+    scored: Dict[PydanticObjectId, float] = {}
+    for candidate in await FingerprintRepository.candidates(bands, exclude=contract_id):
+        similarity = estimated_similarity(signature, candidate.signature)
+        if similarity >= threshold:
+            scored[candidate.contract_id] = similarity
+    if not scored:
+        return None
+
+    reviewed = await ContractDocument.find(
+        {"_id": {"$in": list(scored)}, "clauses": {"$ne": None}}
+    ).to_list()
+    if not reviewed:
+        return None
+    best = max(reviewed, key=lambda contract: (scored[contract.id], contract.compliance_score is not None))
+    return best, scored[best.id]
+
+
+async def index_contract(contract: ContractDocument, threshold: float) -> Optional[PydanticObjectId]:
+    """
+    Fingerprints the contract's content, adds it to the LSH index and records
+    the closest reviewed near-duplicate on `duplicate_of`.
+
+    Returns the near-duplicate's id. Failures are logged and never raised:
+    the index only ever saves work.
+    """
+    if not contract.content or contract.id is None:
+        return None
+    try:
+        signature = await asyncio.to_thread(minhash_signature, contract.content)
+        if signature is None:
+            return None
+        bands = lsh_bands(signature)
+        match = await find_near_duplicate(contract.id, signature, bands, threshold)
+        await FingerprintRepository.upsert(contract.id, signature, bands)
+
+        duplicate_of, similarity = (match[0].id, round(match[1], 3)) if match else (None, None)
+        if (duplicate_of, similarity) != (contract.duplicate_of, contract.duplicate_similarity):
+            await contract.set({"duplicate_of": duplicate_of, "duplicate_similarity": similarity})
+        if duplicate_of:
+            print(f"Contract {contract.id} is a near-duplicate of {duplicate_of} (similarity {similarity}).")
+        return duplicate_of
+    except Exception as e:
+        print(f"Near-duplicate indexing of contract {contract.id} failed: {e}")
+        return None
+
+
+# --- Reusing the clauses and findings of a near-duplicate ---
+
+def _clause_value(clause, key: str):
+    return clause.get(key) if isinstance(clause, dict) else getattr(clause, key, None)
+
+
+def _clause_key(clause) -> Tuple[str, str, str]:
+    """
+    What a clause must keep to count as unchanged: its id and its exact
+    heading and text, whitespace-normalised. Unlike the fingerprint, digits
+    count, so a changed amount or notice period is checked again.
+    """
+    return (
+        str(_clause_value(clause, "clause_id")),
+        " ".join((_clause_value(clause, "heading") or "").split()),
+        " ".join((_clause_value(clause, "text") or "").split()),
+    )
+
+
+def reuse_clauses(
+    original_content: str,
+    original_clauses: Sequence,
+    content: str,
+    max_uncovered_words: int = 20,
+) -> Optional[Tuple[List[dict], int]]:
+    """
+    Carries the clauses of a near-duplicate over to `content`.
+
+    Each original clause is located in the original text and its span mapped
+    through a word-level diff onto `content`; clauses the diff touches take
+    their text from `content`, keeping id, heading and level. Returns the
+    clauses and how many changed, or None when a clause cannot be located or
+    `content` adds more than `max_uncovered_words` words outside any clause
+    (new clauses need a real segmentation).
+    """
+    mapping = map_clauses(original_content, original_clauses, content)
+    if mapping is None or mapping.uncovered_words > max_uncovered_words:
+        return None
+
+    clauses: List[dict] = []
+    changed = 0
+    for item in mapping.clauses:
+        if item.touched:
+            changed += 1
+            item.data.update(text=mapping.text(item.start, item.end), content=None)
+        clauses.append(item.data)
+    return clauses, changed
+
+
+def split_for_review(
+    clauses: Sequence, original_clauses: Sequence, original_findings: Sequence[dict]
+) -> Tuple[List, List[dict]]:
+    """
+    Splits a near-duplicate's clauses into those that differ from the
+    reviewed original (to be checked again) and the original findings that
+    still apply: those that only concern unchanged clauses, or no clause of
+    the contract at all (e.g. missing provisions). Findings on original
+    clauses that were edited or removed are dropped.
+    """
+    original_keys = {_clause_key(clause) for clause in original_clauses}
+    keys = {_clause_key(clause) for clause in clauses}
+    changed = [clause for clause in clauses if _clause_key(clause) not in original_keys]
+    changed_ids = {str(_clause_value(clause, "clause_id")) for clause in changed}
+    # Original clauses with no identical counterpart, deleted ones included
+    changed_ids.update(key[0] for key in original_keys - keys)
+
+    reused = []
+    for finding in original_findings:
+        affected = {str(item.get("clause_id")) for item in finding.get("affected_clauses") or []}
+        if not affected & changed_ids:
+            reused.append(finding)
+    return changed, reused
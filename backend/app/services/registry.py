@@ -0,0 +1,104 @@
+import asyncio
+import functools
+import inspect
+from typing import Any, Callable, Dict, List, Tuple
+from agno.agent import Agent
+from agno.knowledge.knowledge import Knowledge
+from agno.models.openai import OpenAIChat
+from agno.vectordb.qdrant import Qdrant
+from app.config import settings
+from app.services.llm import chat_model, close_http_clients
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a builder argument; lists and dicts (e.g. instructions) become tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class AgentRegistry:
+    """
+    Builds each configured agent once and hands out copies of it.
+
+    Agent builders are registered with the `register` decorator; calling the
+    decorated builder returns a `deep_copy` of an agent built on first use
+    (or by `warm_up` at startup). Copies share the template's model and
+    knowledge, and with them the pooled HTTP and Qdrant clients, while run
+    state stays per copy, so concurrent requests never share an Agent.
+    """
+
+    def __init__(self):
+        self._builders: List[Callable[..., Agent]] = []
+        self._agents: Dict[Tuple, Agent] = {}
+        self._models: Dict[Tuple, OpenAIChat] = {}
+        self._knowledge: Dict[str, Knowledge] = {}
+
+    def model(self, **kwargs: Any) -> OpenAIChat:
+        """The shared chat model for these settings (e.g. temperature)."""
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._models:
+            self._models[key] = chat_model(**kwargs)
+        return self._models[key]
+
+    def knowledge(self, collection_name: str = "company_policies") -> Knowledge:
+        """The shared knowledge base over a Qdrant collection."""
+        if collection_name not in self._knowledge:
+            self._knowledge[collection_name] = Knowledge(
+                vector_db=Qdrant(collection=collection_name, url=settings.QDRANT_URL),
+                max_results=5,
+            )
+        return self._knowledge[collection_name]
+
+    @staticmethod
+    def _key(builder: Callable[..., Agent], args: Tuple, kwargs: Dict[str, Any]) -> Tuple:
+        bound = inspect.signature(builder).bind(*args, **kwargs)
+        bound.apply_defaults()
+        return (builder, *((name, _freeze(value)) for name, value in bound.arguments.items()))
+
+    def register(self, builder: Callable[..., Agent]) -> Callable[..., Agent]:
+        self._builders.append(builder)
+
+        @functools.wraps(builder)
+        def get(*args: Any, **kwargs: Any) -> Agent:
+            key = self._key(builder, args, kwargs)
+            template = self._agents.get(key)
+            if template is None:
+                template = self._agents[key] = builder(*args, **kwargs)
+            return template.deep_copy()
+
+        return get
+
+    def warm_up(self) -> None:
+        """
+        Builds every registered agent with its default arguments and opens
+        the Qdrant clients, so no request pays for connection setup.
+        Failures are logged; those agents are built on first use.
+        """
+        for builder in self._builders:
+            key = self._key(builder, (), {})
+            if key in self._agents:
+                continue
+            try:
+                self._agents[key] = builder()
+            except Exception as e:
+                # Built on first use instead
+                print(f"Could not build agent {builder.__qualname__} at startup: {e}")
+        for knowledge in self._knowledge.values():
+            knowledge.vector_db.async_client  # created on first access
+        print(f"Agent registry ready: {len(self._agents)} agents, {len(self._knowledge)} knowledge bases.")
+
+    async def close(self) -> None:
+        await asyncio.gather(
+            *(knowledge.vector_db.async_close() for knowledge in self._knowledge.values()),
+            return_exceptions=True,
+        )
+        self._agents.clear()
+        self._knowledge.clear()
+        self._models.clear()
+        await close_http_clients()
+
+
+agent_registry = AgentRegistry()
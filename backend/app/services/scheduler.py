@@ -0,0 +1,99 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+from app.config import settings
+from app.services.llm import LLMTimeoutError
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+class DeadlineExceeded(LLMTimeoutError):
+    """An agent call was still queued or running when its run's deadline passed, and was cancelled."""
+
+
+class AgentScheduler:
+    """
+    Runs agent calls on a bounded number of slots shared by every request,
+    under one deadline per run.
+
+    Calls that have not finished by the deadline, whether still waiting for
+    a slot or talking to the provider, are cancelled, so an abandoned run
+    stops using LLM quota. With `hedge_after`, a call still running after
+    that many seconds gets one duplicate attempt when a slot is free; the
+    first attempt to succeed wins and the other is cancelled.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]]) -> T:
+        async with self._slots:
+            return await call()
+
+    async def run(
+        self,
+        calls: Dict[K, Callable[[], Awaitable[T]]],
+        deadline: float,
+        hedge_after: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[K, Optional[T], Optional[BaseException]]]:
+        """
+        Starts every call and yields (key, result, error) for each as it
+        completes, in completion order. Calls cut off by the `deadline`
+        (seconds from now) are yielded last with a DeadlineExceeded error.
+        Closing the iterator early cancels whatever is still running.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        ends_at = started + deadline
+        hedge_at = started + hedge_after if hedge_after and hedge_after < deadline else None
+
+        attempts: Dict[asyncio.Task, K] = {
+            asyncio.ensure_future(self._attempt(call)): key for key, call in calls.items()
+        }
+        finished: List[K] = []
+        hedged = set()
+
+        def cancel(key: Optional[K] = None) -> None:
+            for task, task_key in list(attempts.items()):
+                if key is None or task_key == key:
+                    task.cancel()
+                    del attempts[task]
+
+        try:
+            while attempts:
+                now = loop.time()
+                if now >= ends_at:
+                    break
+                wait = ends_at - now
+                if hedge_at is not None and now < hedge_at:
+                    wait = min(wait, hedge_at - now)
+                done, _ = await asyncio.wait(set(attempts), timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in [task for task in attempts if task in done]:
+                    if task not in attempts:
+                        continue  # both attempts of a call completed together
+                    key = attempts.pop(task)
+                    error = asyncio.CancelledError() if task.cancelled() else task.exception()
+                    if error is not None and key in attempts.values():
+                        continue  # the other attempt may still succeed
+                    cancel(key)
+                    finished.append(key)
+                    yield key, (task.result() if error is None else None), error
+
+                if hedge_at is not None and loop.time() >= hedge_at:
+                    for key in calls:
+                        if key in finished or key in hedged or self._slots.locked():
+                            continue
+                        hedged.add(key)
+                        print(f"Hedging agent call {key!r} after {hedge_after} seconds")
+                        attempts[asyncio.ensure_future(self._attempt(calls[key]))] = key
+        finally:
+            cancel()
+
+        for key in calls:
+            if key not in finished:
+                yield key, None, DeadlineExceeded(f"{key!r} did not finish within the {deadline} second deadline.")
+
+
+agent_scheduler = AgentScheduler(settings.AGENT_MAX_CONCURRENCY)
@@ -1,9 +1,17 @@
 
-from typing import List, Optional
+import asyncio
+import bisect
+import re
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 from app.config import settings
+from app.logger import logger
+from agno.run.agent import RunOutput
+from app.services.llm import arun_cached
+from app.services.registry import agent_registry
 
 
 class ExtractedClause(BaseModel):
@@ -20,39 +28,311 @@ class ClauseExtractionResult(BaseModel):
     total_clauses: int
 
 
-def extract_clauses(contract_text: str) -> ClauseExtractionResult:
-    print("---------------------------------")
-    print(contract_text)
-    agent = Agent(
+_INSTRUCTIONS = [
+    "Given a legal contract Extract ALL its clauses with hierarchical structure, regardless of language (English or Arabic).",
+    "Things such as titles, headers, footers, signatures, and other non-content elements should be ignored.",
+    "Handle both Left-to-Right (LTR) and Right-to-Left (RTL) document structures.",
+    "Identify clause IDs based on the following numbering formats:",
+    "  - **Standard English/Western:** 1, 1.1, 2.3.4, (a), (i), A.",
+    "  - **Arabic/Legal:** **Arabic Numerals (١, ٢, ٣)**, **Hindi-Arabic Numerals (1, 2, 3)**, and standard Roman numerals.",
+    "Detect headings and titles for each clause.",
+    "Determine hierarchical level (0=root, 1=main section, 2=subsection, etc.) based on the numbering depth.",
+    "Maintain the original text exactly as written in the `text` field.",
+    "If no explicit numbering exists, deduce and create a logical structural hierarchy and use sequential IDs.",
+    "Don't skip any clauses or sections.",
+    "Each clause in a contract is a standalone statement or a group of statements that are related to a single topic or a single action.",
+    "Trim whitespaces or extra punctuation, focus on the main content of the clause.",
+]
+
+_PART_INSTRUCTIONS = [
+    "The text is one part of a longer contract and may begin or end in the middle of a clause.",
+    "Keep clause IDs exactly as numbered in the text; do not restart or shift the numbering.",
+]
+
+_PAGE_BREAK = "---PAGE BREAK---"
+# Lines that open a top-level section: "Article 4", "Section 2", "المادة ٣", "5. ", "V. "
+_SECTION_START = re.compile(
+    r"^[ \t]*(?:(?:article|section|clause|part|schedule|annex|المادة|مادة|البند|الفصل)\b"
+    r"|[0-9\u0660-\u0669]{1,3}[.)\-\u2013]?[ \t]+\S|[IVXL]{1,6}\.[ \t])",
+    re.IGNORECASE | re.MULTILINE,
+)
+_NUMERIC_ID = re.compile(r"^[0-9]+(?:\.[0-9]+)*$")
+# A located clause within this many characters of a window edge may be cut off there
+_EDGE_SLACK = 20
+
+
+@agent_registry.register
+def _create_agent(part_of_longer_text: bool = False) -> Agent:
+    return Agent(
         name="ClauseExtractor",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
-        instructions=[
-            "Given a legal contract Extract ALL its clauses with hierarchical structure, regardless of language (English or Arabic).",
-            "Things such as titles, headers, footers, signatures, and other non-content elements should be ignored.",
-            "Handle both Left-to-Right (LTR) and Right-to-Left (RTL) document structures.",
-            "Identify clause IDs based on the following numbering formats:",
-            "  - **Standard English/Western:** 1, 1.1, 2.3.4, (a), (i), A.",
-            "  - **Arabic/Legal:** **Arabic Numerals (١, ٢, ٣)**, **Hindi-Arabic Numerals (1, 2, 3)**, and standard Roman numerals.",
-            "Detect headings and titles for each clause.",
-            "Determine hierarchical level (0=root, 1=main section, 2=subsection, etc.) based on the numbering depth.",
-            "Maintain the original text exactly as written in the `text` field.",
-            "If no explicit numbering exists, deduce and create a logical structural hierarchy and use sequential IDs.",
-            "Don't skip any clauses or sections.",
-            "Each clause in a contract is a standalone statement or a group of statements that are related to a single topic or a single action.",
-            "Trim whitespaces or extra punctuation, focus on the main content of the clause.",
-        ],
+        model=agent_registry.model(),
+        instructions=_INSTRUCTIONS + (_PART_INSTRUCTIONS if part_of_longer_text else []),
         stream=False,
         output_schema=ClauseExtractionResult,
     )
-    
+
+
+async def _run_agent(text: str, part_of_longer_text: bool = False) -> ClauseExtractionResult:
     prompt = f"""
     
-    {contract_text}
+    {text}
     """
-    
-    response = agent.run(prompt)
-    return response.content
\ No newline at end of file
+    return await arun_cached(
+        _create_agent(part_of_longer_text), prompt, _parse_clauses, result_type=ClauseExtractionResult
+    )
+
+
+def _parse_clauses(response: RunOutput) -> ClauseExtractionResult:
+    if not isinstance(response.content, ClauseExtractionResult):
+        # Typically output cut off at the token limit, which leaves no valid JSON
+        raise ValueError("The model did not return a clause list.")
+    return response.content
+
+
+async def extract_clauses(contract_text: str) -> ClauseExtractionResult:
+    """
+    Segments the contract with the LLM. Texts longer than
+    SEGMENTER_CHUNK_CHARS are segmented in chunks (see `extract_clauses_chunked`)
+    so that no single response runs into the output token limit.
+    """
+    if len(contract_text) > settings.SEGMENTER_CHUNK_CHARS:
+        return await extract_clauses_chunked(contract_text)
+    return await _run_agent(contract_text)
+
+
+# --- Chunked segmentation of long contracts ---
+
+@dataclass
+class TextChunk:
+    """A window of the contract sent to the LLM on its own."""
+    index: int
+    start: int  # window in the full text, overlap included
+    end: int
+    own_start: int  # clauses starting in [own_start, own_end) belong to this chunk
+    own_end: int
+
+
+def _boundaries(text: str) -> List[Tuple[int, int]]:
+    """Candidate cut positions with their strength: 3 page break, 2 section start, 1 blank line, 0 line."""
+    found = {0: 3, len(text): 3}
+    for match in re.finditer(r"\n", text):
+        found.setdefault(match.end(), 0)
+    for match in re.finditer(r"\n[ \t]*\n", text):
+        found[match.end()] = max(found.get(match.end(), 0), 1)
+    for match in _SECTION_START.finditer(text):
+        position = text.rfind("\n", 0, match.start()) + 1
+        found[position] = max(found.get(position, 0), 2)
+    for match in re.finditer(re.escape(_PAGE_BREAK), text):
+        position = match.end()
+        while position < len(text) and text[position] == "\n":
+            position += 1
+        found[position] = 3
+    return sorted(found.items())
+
+
+def split_for_segmentation(text: str, max_chars: int, overlap: int) -> List[TextChunk]:
+    """
+    Splits `text` into chunks of at most about `max_chars` characters.
+
+    Cuts prefer page breaks, then section starts, then blank lines, then any
+    line break, as long as the chunk stays at least half full. Each chunk
+    also carries up to `overlap` characters of its neighbours on both sides,
+    so a clause cut at a seam is still seen whole by one of them.
+    """
+    if len(text) <= max_chars:
+        return [TextChunk(0, 0, len(text), 0, len(text))]
+    boundaries = _boundaries(text)
+    positions = [position for position, _ in boundaries]
+
+    cuts = [0]
+    while len(text) - cuts[-1] > max_chars:
+        low, high = cuts[-1] + max_chars // 2, cuts[-1] + max_chars
+        candidates = boundaries[bisect.bisect_left(positions, low):bisect.bisect_right(positions, high)]
+        if candidates:
+            # Strongest boundary, the latest one among equals
+            cut = max(candidates, key=lambda item: (item[1], item[0]))[0]
+        else:
+            cut = high
+        cuts.append(cut)
+    cuts.append(len(text))
+
+    chunks = []
+    for index in range(len(cuts) - 1):
+        own_start, own_end = cuts[index], cuts[index + 1]
+        # Overlap edges on line starts where there is one within reach
+        start = min(own_start, positions[bisect.bisect_left(positions, own_start - overlap)])
+        end = positions[bisect.bisect_right(positions, own_end + overlap) - 1]
+        if end <= own_end:
+            end = min(len(text), own_end + overlap)
+        chunks.append(TextChunk(index, start, end, own_start, own_end))
+    return chunks
+
+
+class _Normalized:
+    """The text with whitespace runs collapsed, mapped back to original offsets."""
+
+    def __init__(self, text: str):
+        parts, offsets = [], []
+        for match in re.finditer(r"\S+", text):
+            if parts:
+                parts.append(" ")
+                offsets.append(match.start())
+            parts.append(match.group())
+            offsets.extend(range(match.start(), match.end()))
+        self.text = "".join(parts)
+        self.offsets = offsets
+
+    def locate(self, needle: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Original span of the whitespace-normalized `needle` within [start, end) of the text."""
+        needle = " ".join(needle.split())
+        if not needle:
+            return None
+        low = bisect.bisect_left(self.offsets, start)
+        high = bisect.bisect_left(self.offsets, end)
+        # The model may trim or alter the very end of a clause: search by its head,
+        # then extend to as much of its tail as matches
+        head = needle[:80]
+        position = self.text.find(head, low, high)
+        if position < 0:
+            return None
+        length = len(head)
+        tail = needle[-80:]
+        if len(needle) > len(head):
+            tail_position = self.text.find(tail, position, min(high, position + len(needle) + 200))
+            length = tail_position + len(tail) - position if tail_position >= 0 else len(needle)
+        last = min(position + length, high, len(self.offsets)) - 1
+        return self.offsets[position], self.offsets[last] + 1
+
+
+def _merge_chunks(
+    text: str, chunks: List[TextChunk], results: List[ClauseExtractionResult]
+) -> List[Tuple[int, ExtractedClause]]:
+    """
+    Joins per-chunk clause lists into one, in document order.
+
+    Every clause is located in the full text; a chunk keeps the clauses that
+    start in the part it owns, so those the neighbours also saw in the
+    overlap are dropped. A kept clause that runs up to the end of its window
+    is replaced by the next chunk's copy of it, which is complete. Clauses
+    that cannot be located (text altered by the model) stay in their chunk's
+    order unless an identical clause was already kept. Returns each clause
+    with the index of the chunk it comes from.
+    """
+    normalized = _Normalized(text)
+    located: List[Tuple[int, int, int, int, ExtractedClause]] = []  # start, chunk, order, end, clause
+    unlocated: List[Tuple[int, int, ExtractedClause]] = []
+    by_start: List[Dict[int, Tuple[int, ExtractedClause]]] = []
+
+    for chunk, result in zip(chunks, results):
+        starts: Dict[int, Tuple[int, ExtractedClause]] = {}
+        for order, clause in enumerate(result.clauses):
+            span = normalized.locate(clause.text, chunk.start, chunk.end)
+            if span is None:
+                unlocated.append((chunk.index, order, clause))
+                continue
+            starts.setdefault(span[0], (span[1], clause))
+            if chunk.own_start <= span[0] < chunk.own_end:
+                located.append((span[0], chunk.index, order, span[1], clause))
+        by_start.append(starts)
+
+    merged: List[Tuple[Tuple[int, int, int], ExtractedClause]] = []
+    for start, index, order, end, clause in located:
+        chunk = chunks[index]
+        if end >= chunk.end - _EDGE_SLACK and chunk.end < len(text) and index + 1 < len(chunks):
+            # Cut off by the window; the next chunk saw more of it
+            longer = min(
+                (item for position, item in by_start[index + 1].items() if abs(position - start) <= _EDGE_SLACK),
+                key=lambda item: -item[0],
+                default=None,
+            )
+            if longer is not None and longer[0] > end:
+                clause = clause.model_copy(update={"text": longer[1].text, "heading": clause.heading or longer[1].heading})
+        merged.append(((start, index, order), clause))
+
+    seen = {" ".join(clause.text.split()) for _, clause in merged}
+    anchors = sorted(key for key, _ in merged)
+    for index, order, clause in unlocated:
+        normalized_text = " ".join(clause.text.split())
+        if normalized_text in seen:
+            continue
+        seen.add(normalized_text)
+        # Right after the located clause that preceded it in its chunk
+        previous = [key for key in anchors if key[1] == index and key[2] < order]
+        position = previous[-1][0] if previous else chunks[index].own_start
+        merged.append(((position, index, order), clause))
+
+    merged.sort(key=lambda item: item[0])
+    return [(key[1], clause) for key, clause in merged]
+
+
+def _reconcile(merged: List[Tuple[int, ExtractedClause]]) -> List[ExtractedClause]:
+    """
+    Makes clause ids unique and levels consistent across chunks.
+
+    A chunk whose first numeric id is not past the highest one so far and
+    most of whose numeric ids collide with earlier ones restarted a
+    generated numbering: its top-level numbers are shifted past the highest
+    one so far. Any id still taken (a second preamble, a seam clause kept
+    twice) just gets a suffix. Dotted numeric ids take their
+    level from their depth, which is what the model does within one chunk.
+    """
+    used = set()
+    highest = 0
+    reconciled = []
+    for _, items in groupby(merged, key=lambda item: item[0]):
+        group = [clause for _, clause in items]
+        # "0" (a preamble) does not tell whether the numbering restarted
+        numeric = [
+            clause.clause_id.strip() for clause in group
+            if _NUMERIC_ID.match(clause.clause_id.strip()) and clause.clause_id.strip() != "0"
+        ]
+        restarted = bool(numeric) and int(numeric[0].partition(".")[0]) <= highest and (
+            sum(1 for clause_id in numeric if clause_id in used) * 2 > len(numeric)
+        )
+        shift = highest if restarted else 0
+        for clause in group:
+            clause_id = clause.clause_id.strip()
+            level = clause.level
+            if _NUMERIC_ID.match(clause_id):
+                top, _, rest = clause_id.partition(".")
+                top = int(top) + shift if shift and int(top) > 0 else int(top)
+                clause_id = f"{top}.{rest}" if rest else str(top)
+                level = 0 if clause_id == "0" else clause_id.count(".") + 1
+                highest = max(highest, top)
+            base, suffix = clause_id, 2
+            while clause_id in used:
+                clause_id = f"{base}-{suffix}"
+                suffix += 1
+            used.add(clause_id)
+            reconciled.append(clause.model_copy(update={"clause_id": clause_id, "level": level}))
+    return reconciled
+
+
+async def extract_clauses_chunked(
+    contract_text: str,
+    max_chars: Optional[int] = None,
+    overlap: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+) -> ClauseExtractionResult:
+    """
+    Segments a long contract chunk by chunk, concurrently, so wall-clock
+    time follows the longest chunk rather than the whole document and no
+    response has to hold every clause.
+    """
+    max_chars = max_chars or settings.SEGMENTER_CHUNK_CHARS
+    overlap = settings.SEGMENTER_CHUNK_OVERLAP if overlap is None else overlap
+    chunks = split_for_segmentation(contract_text, max_chars, overlap)
+    if len(chunks) == 1:
+        return await _run_agent(contract_text)
+    logger.debug(f"Segmenting {len(contract_text)} characters in {len(chunks)} chunks.")
+
+    slots = asyncio.Semaphore(max_concurrency or settings.SEGMENTER_MAX_CONCURRENCY)
+
+    async def segment(chunk: TextChunk) -> ClauseExtractionResult:
+        async with slots:
+            return await _run_agent(contract_text[chunk.start:chunk.end], part_of_longer_text=True)
+
+    results = await asyncio.gather(*(segment(chunk) for chunk in chunks))
+
+    clauses = _reconcile(_merge_chunks(contract_text, chunks, results))
+    return ClauseExtractionResult(clauses=clauses, total_clauses=len(clauses))
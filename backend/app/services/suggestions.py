@@ -1,8 +1,8 @@
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-from app.config import settings
+from app.services.llm import arun
+from app.services.registry import agent_registry
 
 
 class SuggestionTag(BaseModel):
@@ -25,15 +25,12 @@ class SuggestionsResponse(BaseModel):
     suggestions: List[ClauseSuggestion]
 
 
+@agent_registry.register
 def create_suggestions_agent() -> Agent:
     """Create an AI agent for generating contract clause suggestions"""
     return Agent(
         name="ClauseSuggestionsAgent",
-        model=OpenAIChat(
-            id=settings.GROQ_MODEL,
-            api_key=settings.GROQ_API_KEY,
-            base_url=settings.GROQ_BASE_URL,
-        ),
+        model=agent_registry.model(),
         instructions=[
             "You are an expert legal contract advisor and clause writer.",
             "Your role is to analyze contract text and provide intelligent, actionable suggestions.",
@@ -96,7 +93,7 @@ def create_suggestions_agent() -> Agent:
     )
 
 
-def generate_suggestions(content: str, query: Optional[str] = None) -> SuggestionsResponse:
+async def generate_suggestions(content: str, query: Optional[str] = None) -> SuggestionsResponse:
     """
     Generate AI-powered contract clause suggestions.
     
@@ -144,7 +141,7 @@ IMPORTANT: Provide variety in your suggestions. Don't just suggest additions. Co
 Provide your suggestions as a JSON object matching the specified format with variety in suggestion types."""
     
     try:
-        response = agent.run(prompt)
+        response = await arun(agent, prompt)
         raw_output = (response.content or "").strip()
         
         # Clean up markdown code blocks if present
@@ -0,0 +1,58 @@
+import re
+from typing import List, Optional, Sequence, TypeVar
+from app.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # optional: exact counts instead of the estimate below
+    tiktoken = None
+
+T = TypeVar("T")
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is None and tiktoken is not None and not _encoding_failed:
+        try:
+            _encoding = tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+        except Exception as e:
+            # The encoding is downloaded on first use; estimate when that fails
+            print(f"Tokenizer {settings.TOKENIZER_ENCODING} unavailable, estimating token counts: {e}")
+            _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Prompt tokens in `text`: counted with tiktoken when it is installed,
+    otherwise estimated at one token per four characters of each word and
+    one per punctuation mark, which slightly overestimates English prose.
+    """
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(-(-len(token) // 4) for token in re.findall(r"\w+|[^\w\s]", text))
+
+
+def pack(items: Sequence[T], costs: Sequence[int], budget: int, first_budget: Optional[int] = None) -> List[List[T]]:
+    """
+    Packs `items`, in order, into batches whose costs add up to at most
+    `budget` (`first_budget` for the first batch). An item over budget gets
+    a batch of its own.
+    """
+    batches: List[List[T]] = []
+    batch: List[T] = []
+    used = 0
+    limit = budget if first_budget is None else first_budget
+    for item, cost in zip(items, costs):
+        if batch and used + cost > limit:
+            batches.append(batch)
+            batch, used, limit = [], 0, budget
+        batch.append(item)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
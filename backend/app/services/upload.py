@@ -0,0 +1,173 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+from fastapi import Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+from app import exceptions
+
+
+class MultipartUploadStream:
+    """
+    Incremental multipart/form-data reader for a single file upload.
+
+    The request body is parsed chunk by chunk as it is pulled through
+    `read()`. Bytes of the file part are hashed, spooled to a temporary file
+    for the extractor and handed to the caller (the MinIO upload) in the same
+    pass, so only the chunk being forwarded is held in memory. Plain form
+    fields are collected into `fields` as they go by. The upload is aborted
+    with `FileTooLarge` as soon as the file exceeds `max_size`.
+    """
+
+    def __init__(self, request: Request, max_size: int, file_field: str = "file", temp_dir: Optional[str] = None):
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise exceptions.BadRequest("Expected a multipart/form-data body.")
+
+        self.max_size = max_size
+        self.file_field = file_field
+        self.temp_dir = temp_dir
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.content_type = "application/octet-stream"
+        self.size = 0
+        self.path: Optional[Path] = None
+
+        self._body = request.stream().__aiter__()
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+        self._digest = hashlib.sha256()
+        self._spool = None
+        self._pending = bytearray()
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._part_name: Optional[str] = None
+        self._part_data = bytearray()
+        self._in_file = False
+        self._file_done = False
+        self._body_done = False
+        self._too_large = False
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    async def start(self) -> bool:
+        """Parse up to the start of the file part. Returns False when the form has no file."""
+        while self.filename is None and not self._body_done:
+            await self._pump()
+        return self.filename is not None
+
+    async def read(self, size: int = -1) -> bytes:
+        """Return up to `size` bytes of the file part, b"" once it is exhausted."""
+        while (size < 0 or len(self._pending) < size) and not self._file_done and not self._body_done:
+            await self._pump()
+        if size < 0 or size >= len(self._pending):
+            chunk = bytes(self._pending)
+            self._pending.clear()
+        else:
+            chunk = bytes(self._pending[:size])
+            del self._pending[:size]
+        return chunk
+
+    async def finish(self) -> Dict[str, str]:
+        """Consume the rest of the body so that trailing form fields are available."""
+        while not self._body_done:
+            await self._pump()
+        self._pending.clear()
+        return self.fields
+
+    def discard(self) -> None:
+        """Remove the spooled copy of the file."""
+        if self._spool is not None and not self._spool.closed:
+            self._spool.close()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    async def _pump(self) -> None:
+        try:
+            chunk = await self._body.__anext__()
+        except StopAsyncIteration:
+            self._parser.finalize()
+            self._body_done = True
+            self._close_spool()
+            return
+        self._parser.write(chunk)
+        if self._too_large:
+            self.discard()
+            raise exceptions.FileTooLarge(
+                f"File exceeds the maximum upload size of {self.max_size // (1024 * 1024)} MB."
+            )
+
+    def _close_spool(self) -> None:
+        if self._spool is not None and not self._spool.closed:
+            self._spool.close()
+
+    # --- multipart parser callbacks ---
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+        self._part_name = None
+        self._part_data = bytearray()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._part_name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+
+        if filename is not None and self._part_name == self.file_field and self.filename is None and filename:
+            self.filename = os.path.basename(filename.decode("utf-8", "replace"))
+            self.content_type = self._headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+            if self.temp_dir:
+                os.makedirs(self.temp_dir, exist_ok=True)
+            self._spool = tempfile.NamedTemporaryFile(
+                delete=False, dir=self.temp_dir, suffix=Path(self.filename).suffix
+            )
+            self.path = Path(self._spool.name)
+            self._in_file = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._too_large:
+            return
+        chunk = data[start:end]
+        if self._in_file:
+            self.size += len(chunk)
+            if self.size > self.max_size:
+                self._too_large = True
+                return
+            self._digest.update(chunk)
+            self._spool.write(chunk)
+            self._pending += chunk
+        else:
+            self._part_data += chunk
+            if len(self._part_data) > self.max_size:
+                self._too_large = True
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._in_file = False
+            self._file_done = True
+            self._close_spool()
+        elif self._part_name:
+            self.fields[self._part_name] = self._part_data.decode("utf-8", "replace")
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Set
+from urllib.parse import unquote_plus
+from app.minio import Bucket
+from app.repositories.contract import ContractRepository
+from app.services.ingestion import IngestionQueue
+
+
+class PresignedUploadListener:
+    """
+    Ingests contracts that clients upload straight to MinIO.
+
+    `GET /contract/upload-page` stores a contract flagged `awaiting_upload`
+    and hands out a presigned PUT URL, so the file never passes through the
+    API. This listener notices when the object lands under the bucket prefix,
+    claims the contract (atomically, so several API workers can run it),
+    streams the object to disk and queues a background ingestion job for it.
+
+    In "notifications" mode it consumes MinIO bucket notifications and falls
+    back to polling if the server does not support them; "poll" mode only
+    checks the contracts still awaiting their file every `poll_interval`
+    seconds, which also works against plain S3.
+    """
+
+    def __init__(
+        self,
+        ingestion: IngestionQueue,
+        bucket: Bucket,
+        mode: str = "notifications",
+        poll_interval: float = 5.0,
+        pending_window: float = 3600.0,
+        max_size: Optional[int] = None,
+        temp_dir: Optional[str] = None,
+    ):
+        self.ingestion = ingestion
+        self.bucket = bucket
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.pending_window = pending_window
+        self.max_size = max_size
+        self.temp_dir = temp_dir
+        self._task: Optional[asyncio.Task] = None
+        self._handlers: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if self.mode == "off" or self._task is not None:
+            return
+        if self.temp_dir:
+            os.makedirs(self.temp_dir, exist_ok=True)
+        self._task = asyncio.create_task(self._listen() if self.mode == "notifications" else self._poll())
+
+    async def stop(self) -> None:
+        tasks = [task for task in [self._task, *self._handlers] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _listen(self) -> None:
+        prefix = f"{self.bucket.file_prefix}/"
+        while True:
+            try:
+                # Uploads that completed while no notification stream was open
+                await self._sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Presigned upload sweep failed: {e}")
+            try:
+                events = await self.bucket.client.listen_bucket_notification(
+                    self.bucket.bucket_name, prefix=prefix, events=("s3:ObjectCreated:*",)
+                )
+                async for event in events:
+                    for record in (event or {}).get("Records", []):
+                        key = unquote_plus(record["s3"]["object"]["key"])
+                        self._spawn(key.removeprefix(prefix))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Bucket notifications unavailable ({e}), polling for presigned uploads instead.")
+                await self._poll()
+                return
+            # The server closed the stream; reconnect
+            await asyncio.sleep(1)
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                await self._sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Presigned upload poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _sweep(self) -> None:
+        since = datetime.utcnow() - timedelta(seconds=self.pending_window)
+        for contract in await ContractRepository.list_awaiting_upload(since):
+            if await self.bucket.stat(contract.file_name) is not None:
+                await self.handle(contract.file_name)
+
+    def _spawn(self, object_name: str) -> None:
+        task = asyncio.create_task(self.handle(object_name))
+        self._handlers.add(task)
+        task.add_done_callback(self._handlers.discard)
+
+    async def handle(self, object_name: str) -> None:
+        """Ingest `object_name` if a contract awaits it; other objects are ignored."""
+        contract = await ContractRepository.claim_presigned_upload(object_name)
+        if contract is None:
+            return
+
+        path = None
+        try:
+            stat = await self.bucket.stat(object_name)
+            if stat is None:
+                raise FileNotFoundError(f"{object_name} is not in the bucket")
+            if self.max_size is not None and stat.size > self.max_size:
+                # Not released: it would be rejected again on every sweep
+                print(f"Presigned upload {object_name} is {stat.size} bytes, over the limit; rejecting it.")
+                await ContractRepository.reject_presigned_upload(contract.id)
+                return
+
+            with tempfile.NamedTemporaryFile(
+                delete=False, dir=self.temp_dir, suffix=Path(object_name).suffix.lower()
+            ) as target:
+                path = Path(target.name)
+                file_hash = await self.bucket.download(object_name, target)
+
+            job = await self.ingestion.submit(contract, path, file_hash)
+            path = None  # owned by the job now
+            print(f"Presigned upload {object_name} received, ingestion job {job.id} queued.")
+        except asyncio.CancelledError:
+            await ContractRepository.release_presigned_upload(contract.id)
+            raise
+        except Exception as e:
+            print(f"Presigned upload {object_name} could not be ingested: {e}")
+            await ContractRepository.release_presigned_upload(contract.id)
+        finally:
+            if path is not None:
+                path.unlink(missing_ok=True)
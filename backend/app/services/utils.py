@@ -1,5 +1,6 @@
 # # from src.agents import AGENT_RESPONSE_KEYS
 from agno.agent import Agent
+from app.services.registry import agent_registry
 
 
 # def extract_response_from_agent(response, agent_name):
@@ -29,7 +30,10 @@ from agno.agent import Agent
 #     result = agent.run(query, structured_outputs=structured_outputs, stream=stream)
 #     return result.content
 
+@agent_registry.register
 def create_agent(**kwargs) -> Agent:
+    """An agent with these settings, built once; it uses the shared model unless given one."""
+    kwargs.setdefault("model", agent_registry.model())
     agent = Agent(
         **kwargs
     )
@@ -0,0 +1 @@
+"""Extraction benchmarks: a generated document corpus and a runner for DocumentExtractor."""
@@ -0,0 +1,72 @@
+"""
+Compares two benchmark result files.
+
+    python -m benchmarks.compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+
+Exits with status 1 when any throughput or p95 latency regresses by more
+than `--threshold` percent.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def _change(base: Optional[float], head: Optional[float]) -> Optional[float]:
+    if not base or head is None:
+        return None
+    return (head - base) / base * 100
+
+
+def _index(report: Dict) -> Dict[Tuple[str, str], Dict]:
+    return {(entry["operation"], entry["document"]): entry for entry in report["results"]}
+
+
+def compare(base: Dict, head: Dict, threshold: float) -> bool:
+    """Prints the per-entry changes and returns True if anything regressed."""
+    regressed = False
+    base_entries, head_entries = _index(base), _index(head)
+    print(f"base {str(base['commit'])[:12]}  ->  head {str(head['commit'])[:12]}")
+    for key in sorted(base_entries.keys() & head_entries.keys()):
+        old, new = base_entries[key], head_entries[key]
+        if old["error"] or new["error"]:
+            print(f"{key[0]:<13} {key[1]:<18} skipped (error)")
+            continue
+        if old["document_sha256"] != new["document_sha256"]:
+            print(f"{key[0]:<13} {key[1]:<18} skipped (corpus changed)")
+            continue
+        throughput = _change(old["pages_per_sec"], new["pages_per_sec"])
+        p95 = _change(old["p95_page_ms"], new["p95_page_ms"])
+        rss = _change(old["peak_rss_mb"], new["peak_rss_mb"])
+        flags = []
+        if throughput is not None and throughput < -threshold:
+            flags.append("throughput")
+        if p95 is not None and p95 > threshold:
+            flags.append("p95")
+        regressed = regressed or bool(flags)
+        print(
+            f"{key[0]:<13} {key[1]:<18} pages/s {_pct(throughput)}  p95 {_pct(p95)}  rss {_pct(rss)}"
+            + (f"  REGRESSION ({', '.join(flags)})" if flags else "")
+        )
+    return regressed
+
+
+def _pct(value: Optional[float]) -> str:
+    return "    n/a" if value is None else f"{value:+6.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression in percent")
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.base).read_text())
+    head = json.loads(Path(args.head).read_text())
+    sys.exit(1 if compare(base, head, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
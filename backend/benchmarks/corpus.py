@@ -0,0 +1,281 @@
+"""
+Reproducible benchmark corpus.
+
+Documents are generated from a fixed seed: digital PDFs (real text layer),
+image-only PDFs rendered from the same kind of text, mixed PDFs that
+alternate both, in English and Arabic, plus DOCX files with tables.
+
+Arabic needs a TrueType font with Arabic glyphs (e.g. DejaVuSans or Noto
+Naskh Arabic). Pass one with `--font` or install one in a standard
+location; without it the Arabic documents are skipped and the manifest
+records that. Arabic is written unshaped, which is enough for timing
+extraction but not for judging OCR accuracy.
+
+    python -m benchmarks.corpus --out benchmarks/corpus
+"""
+import argparse
+import ctypes
+import hashlib
+import json
+import random
+import re
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from docx import Document
+from PIL import Image, ImageDraw, ImageFont
+
+DEFAULT_SEED = 1337
+DEFAULT_CORPUS_DIR = Path(__file__).parent / "corpus"
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter in points
+MARGIN = 72
+FONT_SIZE = 11
+LINE_HEIGHT = 14
+# Resolution of the bitmaps embedded in image-only pages
+SCAN_DPI = 200
+
+FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/noto/NotoNaskhArabic-Regular.ttf",
+    "/usr/share/fonts/noto/NotoNaskhArabic-Regular.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+)
+
+ENGLISH_WORDS = (
+    "agreement party parties shall supplier customer services term termination notice "
+    "payment invoice days written consent confidential information liability damages "
+    "indemnify warranty obligations breach governing law jurisdiction dispute arbitration "
+    "effective date renewal period fees delivery acceptance intellectual property license "
+    "assignment subcontractor force majeure compliance applicable regulations audit records"
+).split()
+
+ARABIC_WORDS = (
+    "العقد الطرف الأول الثاني يلتزم بدفع المبلغ المتفق عليه خلال مدة الشروط والأحكام "
+    "التعويض السرية الإنهاء القانون الواجب التطبيق النزاع التحكيم الخدمات المورد العميل "
+    "الفاتورة يوما إشعار كتابي موافقة المسؤولية الأضرار الضمان الالتزامات الإخلال التجديد"
+).split()
+
+
+def find_font(font_path: Optional[str] = None) -> Optional[Path]:
+    if font_path:
+        return Path(font_path)
+    for candidate in FONT_CANDIDATES:
+        if Path(candidate).exists():
+            return Path(candidate)
+    return None
+
+
+def make_clauses(rng: random.Random, words: List[str], count: int) -> List[str]:
+    """Numbered contract-like clauses of 12 to 40 words."""
+    return [
+        f"{number}. " + " ".join(rng.choice(words) for _ in range(rng.randint(12, 40))) + "."
+        for number in range(1, count + 1)
+    ]
+
+
+def wrap(text: str, width: int = 90) -> List[str]:
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def page_lines(rng: random.Random, words: List[str]) -> List[str]:
+    """About one page worth of wrapped clause lines."""
+    max_lines = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+    lines: List[str] = []
+    for clause in make_clauses(rng, words, 12):
+        wrapped = wrap(clause)
+        if len(lines) + len(wrapped) > max_lines:
+            break
+        lines.extend(wrapped)
+        lines.append("")
+    return lines
+
+
+class PdfBuilder:
+    """Writes text-layer and image-only pages into a new PDF."""
+
+    def __init__(self, font_path: Optional[Path]):
+        self.pdf = pdfium.PdfDocument.new()
+        self._font = None
+        self._font_data = None
+        if font_path:
+            data = font_path.read_bytes()
+            # pdfium reads the font from this buffer, so keep it alive with the document
+            self._font_data = (ctypes.c_uint8 * len(data)).from_buffer_copy(data)
+            self._font = pdfium_c.FPDFText_LoadFont(
+                self.pdf.raw, self._font_data, len(data), pdfium_c.FPDF_FONT_TRUETYPE, True
+            )
+        self._image_font = (
+            ImageFont.truetype(str(font_path), FONT_SIZE * SCAN_DPI // 72)
+            if font_path else ImageFont.load_default(FONT_SIZE * SCAN_DPI // 72)
+        )
+
+    def add_text_page(self, lines: List[str]) -> None:
+        page = self.pdf.new_page(PAGE_WIDTH, PAGE_HEIGHT)
+        y = PAGE_HEIGHT - MARGIN
+        for line in lines:
+            if line:
+                if self._font:
+                    obj = pdfium_c.FPDFPageObj_CreateTextObj(self.pdf.raw, self._font, ctypes.c_float(FONT_SIZE))
+                else:
+                    obj = pdfium_c.FPDFPageObj_NewTextObj(self.pdf.raw, b"Helvetica", ctypes.c_float(FONT_SIZE))
+                buffer = ctypes.create_string_buffer((line + "\x00").encode("utf-16-le"))
+                pdfium_c.FPDFText_SetText(obj, ctypes.cast(buffer, ctypes.POINTER(pdfium_c.FPDF_WCHAR)))
+                pdfium_c.FPDFPageObj_Transform(obj, 1, 0, 0, 1, MARGIN, y)
+                pdfium_c.FPDFPage_InsertObject(page.raw, obj)
+            y -= LINE_HEIGHT
+        page.gen_content()
+        page.close()
+
+    def add_image_page(self, lines: List[str]) -> None:
+        scale = SCAN_DPI / 72
+        image = Image.new("L", (int(PAGE_WIDTH * scale), int(PAGE_HEIGHT * scale)), 255)
+        draw = ImageDraw.Draw(image)
+        y = MARGIN * scale
+        for line in lines:
+            draw.text((MARGIN * scale, y), line, fill=0, font=self._image_font)
+            y += LINE_HEIGHT * scale
+        page = self.pdf.new_page(PAGE_WIDTH, PAGE_HEIGHT)
+        image_obj = pdfium.PdfImage.new(self.pdf)
+        image_obj.set_bitmap(pdfium.PdfBitmap.from_pil(image))
+        image_obj.set_matrix(pdfium.PdfMatrix().scale(PAGE_WIDTH, PAGE_HEIGHT))
+        page.insert_obj(image_obj)
+        page.gen_content()
+        page.close()
+
+    def save(self, path: Path) -> None:
+        self.pdf.save(path)
+        if self._font:
+            pdfium_c.FPDFFont_Close(self._font)
+        self.pdf.close()
+        # pdfium stamps the current time and a random file ID; pin both
+        # (same length, so the xref offsets still hold)
+        data = re.sub(rb"/CreationDate\(D:\d{14}", b"/CreationDate(D:20000101000000", path.read_bytes())
+        data = re.sub(rb"/ID\[<[0-9A-F]{32}><[0-9A-F]{32}>", b"/ID[<" + b"0" * 32 + b"><" + b"0" * 32 + b">", data)
+        path.write_bytes(data)
+
+
+def build_pdf(path: Path, layout: List[tuple], font_path: Optional[Path], rng: random.Random) -> int:
+    """`layout` is a list of (kind, words) pages, kind being "text" or "image"."""
+    builder = PdfBuilder(font_path)
+    for kind, words in layout:
+        lines = page_lines(rng, words)
+        if kind == "text":
+            builder.add_text_page(lines)
+        else:
+            builder.add_image_page(lines)
+    builder.save(path)
+    return len(layout)
+
+
+def build_docx(path: Path, words: List[str], rng: random.Random, sections: int = 8) -> int:
+    """Headings, clause paragraphs and a fee table per section. Returns the table count."""
+    document = Document()
+    for section in range(1, sections + 1):
+        document.add_heading(f"Section {section}", level=1)
+        for clause in make_clauses(rng, words, 6):
+            document.add_paragraph(clause)
+        table = document.add_table(rows=1, cols=4)
+        for cell, title in zip(table.rows[0].cells, ("Item", "Description", "Quantity", "Amount")):
+            cell.text = title
+        for row in range(20):
+            cells = table.add_row().cells
+            cells[0].text = str(row + 1)
+            cells[1].text = " ".join(rng.choice(words) for _ in range(6))
+            cells[2].text = str(rng.randint(1, 50))
+            cells[3].text = f"{rng.uniform(100, 10000):.2f}"
+    document.core_properties.created = document.core_properties.modified = datetime(2000, 1, 1)
+    document.save(path)
+    _pin_zip_timestamps(path)
+    return sections
+
+
+def _pin_zip_timestamps(path: Path) -> None:
+    """Rewrites a zip with fixed entry timestamps so identical content gives identical bytes."""
+    with zipfile.ZipFile(path) as source:
+        entries = [(info.filename, source.read(info)) for info in source.infolist()]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+        for name, data in entries:
+            target.writestr(zipfile.ZipInfo(name, date_time=(2000, 1, 1, 0, 0, 0)), data, zipfile.ZIP_DEFLATED)
+
+
+def build_corpus(out_dir: Path = DEFAULT_CORPUS_DIR, font: Optional[str] = None, seed: int = DEFAULT_SEED) -> Dict:
+    """Generates the corpus into `out_dir` and writes `manifest.json` next to it."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    font_path = find_font(font)
+    en, ar = list(ENGLISH_WORDS), list(ARABIC_WORDS)
+
+    pdfs = {
+        "digital_en.pdf": [("text", en)] * 20,
+        "scanned_en.pdf": [("image", en)] * 6,
+        "mixed_en.pdf": [("text", en), ("text", en), ("image", en)] * 4,
+    }
+    docx = {"tables_en.docx": en}
+    if font_path:
+        pdfs.update({
+            "digital_ar.pdf": [("text", ar)] * 20,
+            "scanned_ar.pdf": [("image", ar)] * 6,
+            "mixed_en_ar.pdf": [("text", en), ("image", ar), ("text", ar), ("image", en)] * 3,
+        })
+        docx["tables_ar.docx"] = ar
+    else:
+        print("No TrueType font found, skipping Arabic documents (pass --font).")
+
+    documents = []
+    for name, layout in pdfs.items():
+        # One generator per file, so adding documents does not change the others
+        rng = random.Random(f"{seed}:{name}")
+        pages = build_pdf(out_dir / name, layout, font_path, rng)
+        documents.append({
+            "name": name,
+            "kind": "pdf",
+            "pages": pages,
+            "image_pages": sum(1 for kind, _ in layout if kind == "image"),
+        })
+    for name, words in docx.items():
+        rng = random.Random(f"{seed}:{name}")
+        tables = build_docx(out_dir / name, words, rng)
+        documents.append({"name": name, "kind": "docx", "pages": 1, "tables": tables})
+
+    for document in documents:
+        document["sha256"] = hashlib.sha256((out_dir / document["name"]).read_bytes()).hexdigest()
+
+    manifest = {
+        "seed": seed,
+        "font": font_path.name if font_path else None,
+        "documents": documents,
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate the extraction benchmark corpus.")
+    parser.add_argument("--out", default=str(DEFAULT_CORPUS_DIR), help="Output directory")
+    parser.add_argument("--font", help="TrueType font with Latin and Arabic glyphs")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    manifest = build_corpus(Path(args.out), args.font, args.seed)
+    for document in manifest["documents"]:
+        print(f"{document['name']:<20} {document['pages']:>3} page(s)  {document['sha256'][:12]}")
+
+
+if __name__ == "__main__":
+    main()
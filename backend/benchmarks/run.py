@@ -0,0 +1,244 @@
+"""
+Benchmarks DocumentExtractor on the generated corpus.
+
+Every (operation, document) pair runs in a fresh process so that peak RSS
+is attributable to it. Per-page latency is the time between consecutive
+page completions as reported by the extractor's callbacks (for DOCX, the
+whole document counts as one page). extract_pdf reports no per-page
+latency: it reads every text layer before its first page callback, so
+those gaps measure nothing. ocr_pdf extracts the documents that have
+image-only pages and times only their OCR stage, from its start to the
+last page, counting only the OCRed pages. Results are written as JSON
+keyed by the current git commit, for `benchmarks.compare`.
+
+    cd backend
+    python -m benchmarks.run                      # generates the corpus on first use
+    OCR_PARALLEL=1 python -m benchmarks.run --operations ocr_pdf --repeat 5
+
+OCR settings come from the usual OCR_* environment variables.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.corpus import DEFAULT_CORPUS_DIR, build_corpus
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# operation -> kind of document it applies to
+OPERATIONS = {
+    "extract_pdf": "pdf",
+    "ocr_pdf": "pdf",
+    "extract_docx": "docx",
+}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _peak_rss_mb(who: int) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _measure(operation: str, file_path: str, repeat: int, warmup: int) -> Dict:
+    """Runs in a fresh benchmark process."""
+    from app.config import get_config
+    from app.services.extractor import DocumentExtractor
+
+    extractor = DocumentExtractor(get_config())
+    path = Path(file_path)
+
+    def run_once() -> tuple:
+        marks: List[float] = []
+        start = time.perf_counter()
+        if operation == "ocr_pdf":
+            # The OCR stage reports once as it starts, then once per finished page
+            result = extractor.extract_document(
+                path, progress=lambda stage, done, total: stage == "ocr" and marks.append(time.perf_counter())
+            )
+            if not marks:
+                return 0.0, [], result.error or "No page was OCRed."
+            start = marks.pop(0)
+            end = max(marks, default=start)
+        else:
+            result = extractor.extract_document(path)
+            end = time.perf_counter()
+            if operation == "extract_docx":
+                marks.append(end)
+        # Pages can complete out of order under parallel OCR; only the timeline matters
+        timeline = [start] + sorted(marks)
+        return end - start, [b - a for a, b in zip(timeline, timeline[1:])], result.error
+
+    durations: List[float] = []
+    latencies: List[float] = []
+    error = None
+    try:
+        for run in range(warmup + repeat):
+            elapsed, page_latencies, error = run_once()
+            if error:
+                break
+            if run >= warmup:
+                durations.append(elapsed)
+                latencies.extend(page_latencies)
+    finally:
+        if extractor._ocr_pool is not None:
+            # Let pool workers exit so their peak RSS is counted
+            extractor._ocr_pool.shutdown(wait=True)
+        extractor.close()
+
+    return {
+        "durations": durations,
+        "latencies": latencies,
+        "error": error,
+        "peak_rss_mb": _peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_child_rss_mb": _peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _environment() -> Dict:
+    from app.config import get_config
+
+    config = get_config()
+    environment = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "ocr": asdict(config.ocr),
+        "pdf_backend": config.extraction.pdf_backend,
+    }
+    try:
+        import pytesseract
+        environment["tesseract"] = str(pytesseract.get_tesseract_version())
+    except Exception:
+        environment["tesseract"] = None
+    return environment
+
+
+def run(
+    corpus_dir: Path,
+    operations: List[str],
+    documents: Optional[List[str]],
+    repeat: int,
+    warmup: int,
+) -> Dict:
+    manifest_path = corpus_dir / "manifest.json"
+    if not manifest_path.exists():
+        print(f"Generating corpus in {corpus_dir}...")
+        build_corpus(corpus_dir)
+    manifest = json.loads(manifest_path.read_text())
+
+    commit = _git("rev-parse", "HEAD")
+    report = {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "repeat": repeat,
+        "warmup": warmup,
+        "corpus": {"seed": manifest["seed"], "font": manifest["font"]},
+        "environment": _environment(),
+        "results": [],
+    }
+
+    context = multiprocessing.get_context("spawn")
+    for document in manifest["documents"]:
+        if documents and not any(name in document["name"] for name in documents):
+            continue
+        for operation in operations:
+            if OPERATIONS[operation] != document["kind"]:
+                continue
+            if operation == "ocr_pdf" and not document.get("image_pages"):
+                continue
+            page_count = document["image_pages"] if operation == "ocr_pdf" else document["pages"]
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                measured = executor.submit(
+                    _measure, operation, str(corpus_dir / document["name"]), repeat, warmup
+                ).result()
+
+            total = sum(measured["durations"])
+            pages = page_count * len(measured["durations"])
+            entry = {
+                "operation": operation,
+                "document": document["name"],
+                "document_sha256": document["sha256"],
+                "pages": page_count,
+                "runs": len(measured["durations"]),
+                "seconds": round(total, 4),
+                "pages_per_sec": round(pages / total, 2) if total else None,
+                "p50_page_ms": _ms(percentile(measured["latencies"], 50)),
+                "p95_page_ms": _ms(percentile(measured["latencies"], 95)),
+                "peak_rss_mb": measured["peak_rss_mb"],
+                "peak_child_rss_mb": measured["peak_child_rss_mb"],
+                "error": measured["error"],
+            }
+            report["results"].append(entry)
+            print(_format(entry))
+    return report
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def _format(entry: Dict) -> str:
+    if entry["error"]:
+        return f"{entry['operation']:<13} {entry['document']:<18} ERROR {entry['error'][:80]}"
+    return (
+        f"{entry['operation']:<13} {entry['document']:<18} "
+        f"{entry['pages_per_sec']!s:>9} pages/s  p50 {entry['p50_page_ms']!s:>9} ms  "
+        f"p95 {entry['p95_page_ms']!s:>9} ms  rss {entry['peak_rss_mb']:>7} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DocumentExtractor on the generated corpus.")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS_DIR), help="Corpus directory")
+    parser.add_argument("--operations", nargs="+", choices=sorted(OPERATIONS), default=sorted(OPERATIONS))
+    parser.add_argument("--documents", nargs="+", help="Only documents whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs per document")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured runs per document")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+
+    report = run(Path(args.corpus), args.operations, args.documents, args.repeat, args.warmup)
+
+    if args.output:
+        output = Path(args.output)
+    else:
+        name = (report["commit"] or "unknown")[:12] + ("-dirty" if report["dirty"] else "")
+        output = RESULTS_DIR / f"{name}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Test doubles for the compliance check: specialist agents and the findings cache."""
+import asyncio
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from app.services import compliance_cache
+from app.services import compliance_check as compliance_module
+from app.services.compliance_check import ClauseWithCompliance
+
+SPECIALISTS = {
+    "compliance": "check_compliance_risks",
+    "tariff": "check_tariff_risks",
+    "external": "check_external_context_risks",
+}
+
+
+def clauses(count: int = 3) -> List[ClauseWithCompliance]:
+    return [
+        ClauseWithCompliance(clause_id=str(number), heading=f"Clause {number}", text=f"The supplier shall do {number}.", level=1)
+        for number in range(1, count + 1)
+    ]
+
+
+def finding(title: str, clause_ids=(), source: str = "compliance_agent") -> dict:
+    return {
+        "finding_id": "",
+        "finding_type": "legal_risk",
+        "domain": "legal",
+        "severity": "high",
+        "impact": "significant",
+        "confidence_score": 0.9,
+        "title": title,
+        "description": f"{title}.",
+        "affected_clauses": [{"clause_id": clause_id} for clause_id in clause_ids],
+        "source": source,
+    }
+
+
+class FakeSpecialists:
+    """
+    Stands in for the three specialist agents. Each one reports a finding
+    per clause it is shown, after `delays[name]` seconds, or raises
+    `errors[name]`. Calls cancelled while waiting are recorded.
+    """
+
+    def __init__(self, monkeypatch, delays: Optional[Dict[str, float]] = None, errors: Optional[Dict[str, Exception]] = None):
+        self.delays = delays or {}
+        self.errors = errors or {}
+        self.calls: List[tuple] = []
+        self.cancelled: List[str] = []
+        for name, attribute in SPECIALISTS.items():
+            monkeypatch.setattr(compliance_module, attribute, self._specialist(name))
+        # The agents themselves need Qdrant; only their instructions matter here
+        agent = SimpleNamespace(instructions=["Review the clauses."], output_schema=None, model=SimpleNamespace(id="model"))
+        for builder in ("create_compliance_agent", "create_tariff_agent", "create_risk_review_agent"):
+            monkeypatch.setattr(compliance_module, builder, lambda *args, **kwargs: agent)
+
+    def _specialist(self, name: str):
+        source = {"compliance": "compliance_agent", "tariff": "tariff_agent", "external": "external_review_agent"}[name]
+
+        async def check(clauses, contract_id, *args, **kwargs):
+            self.calls.append((name, [clause.clause_id for clause in clauses]))
+            try:
+                await asyncio.sleep(self.delays.get(name, 0))
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            if name in self.errors:
+                raise self.errors[name]
+            findings = [finding(f"{name} issue in {clause.text}", [clause.clause_id], source) for clause in clauses]
+            return {"findings": findings, "compliance_score": 0.8}
+
+        return check
+
+    def checked(self, name: str = "compliance") -> List[List[str]]:
+        return [clause_ids for caller, clause_ids in self.calls if caller == name]
+
+
+class FakeComplianceCache:
+    """In-memory stand-in for the Mongo tier of `compliance_cache`."""
+
+    def __init__(self, monkeypatch):
+        self.entries: Dict[str, SimpleNamespace] = {}
+        monkeypatch.setattr(compliance_cache, "lookup", self.lookup)
+        monkeypatch.setattr(compliance_cache, "store", self.store)
+
+    async def lookup(self, cache_keys):
+        return {key: self.entries[key] for key in cache_keys if key in self.entries}
+
+    async def store(self, entries):
+        for entry in entries:
+            self.entries[entry["cache_key"]] = SimpleNamespace(
+                clause_id=entry.get("clause_id"), findings=entry["findings"], score=entry.get("score")
+            )
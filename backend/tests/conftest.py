@@ -0,0 +1,10 @@
+import os
+
+# Settings without defaults; the tests never reach these services
+for name, value in {
+    "QDRANT_URL": "http://localhost:6333",
+    "QDRANT_GRPC_PORT": "6334",
+    "GOOGLE_EMBEDDING_API_KEY": "test",
+    "GROQ_API_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,61 @@
+"""Small PDFs for the extractor tests: pages with a text layer, or a scanned image of text."""
+import ctypes
+from pathlib import Path
+from typing import List, Tuple
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+from PIL import Image, ImageDraw, ImageFont
+
+WIDTH, HEIGHT = 612, 792
+
+
+def _add_text_page(pdf: pdfium.PdfDocument, lines: List[str]) -> None:
+    page = pdf.new_page(WIDTH, HEIGHT)
+    y = HEIGHT - 72
+    for line in lines:
+        obj = pdfium_c.FPDFPageObj_NewTextObj(pdf.raw, b"Helvetica", ctypes.c_float(11))
+        buffer = ctypes.create_string_buffer((line + "\x00").encode("utf-16-le"))
+        pdfium_c.FPDFText_SetText(obj, ctypes.cast(buffer, ctypes.POINTER(pdfium_c.FPDF_WCHAR)))
+        pdfium_c.FPDFPageObj_Transform(obj, 1, 0, 0, 1, 72, y)
+        pdfium_c.FPDFPage_InsertObject(page.raw, obj)
+        y -= 14
+    page.gen_content()
+    page.close()
+
+
+def _add_image_page(pdf: pdfium.PdfDocument, lines: List[str], dpi: int = 150) -> None:
+    scale = dpi / 72
+    image = Image.new("L", (int(WIDTH * scale), int(HEIGHT * scale)), 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(int(11 * scale))
+    y = 72 * scale
+    for line in lines:
+        draw.text((72 * scale, y), line, fill=0, font=font)
+        y += 14 * scale
+    page = pdf.new_page(WIDTH, HEIGHT)
+    image_obj = pdfium.PdfImage.new(pdf)
+    image_obj.set_bitmap(pdfium.PdfBitmap.from_pil(image))
+    image_obj.set_matrix(pdfium.PdfMatrix().scale(WIDTH, HEIGHT))
+    page.insert_obj(image_obj)
+    page.gen_content()
+    page.close()
+
+
+def make_pdf(path: Path, pages: List[Tuple[str, List[str]]]) -> Path:
+    """`pages` are ("text", lines), ("image", lines) or ("blank", [])."""
+    pdf = pdfium.PdfDocument.new()
+    for kind, lines in pages:
+        if kind == "text":
+            _add_text_page(pdf, lines)
+        elif kind == "image":
+            _add_image_page(pdf, lines)
+        else:
+            pdf.new_page(WIDTH, HEIGHT).close()
+    pdf.save(path)
+    pdf.close()
+    return path
+
+
+def clause_lines(count: int = 8, prefix: str = "Clause") -> List[str]:
+    return [f"{prefix} {index}. The supplier shall deliver the goods within thirty days." for index in range(1, count + 1)]
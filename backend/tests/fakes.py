@@ -0,0 +1,29 @@
+"""Test doubles shared by the extractor tests."""
+from typing import List, Optional, Tuple
+
+from app.services.extractor import OCREngine
+
+
+class FakeOCREngine(OCREngine):
+    """
+    Reads every page as "text at <width>px", with a confidence that grows
+    with the render width unless `confidences` maps languages to fixed ones.
+    """
+    name = "fake"
+
+    def __init__(self, ocr_config, script: Optional[Tuple[str, float]] = None, confidences=None):
+        super().__init__(ocr_config)
+        self.script = script
+        self.confidences = confidences or {}
+        self.calls: List[Tuple[int, Optional[str]]] = []
+
+    def recognize(self, image, with_confidence=False, language=None):
+        self.calls.append((image.width, language))
+        confidence = self.confidences.get(language or self.config.language, min(99.0, image.width / 20))
+        return f"text at {image.width}px", (confidence if with_confidence else None)
+
+    def detect_script(self, image):
+        return self.script
+
+    def health(self):
+        return {"engine": self.name, "ok": True}
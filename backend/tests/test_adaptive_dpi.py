@@ -0,0 +1,63 @@
+import pypdfium2 as pdfium
+import pytest
+
+from app.config import Config
+from app.services.extractor import _ocr_rendered_page
+from tests.documents import clause_lines, make_pdf
+from tests.fakes import FakeOCREngine
+
+
+@pytest.fixture
+def page(tmp_path):
+    pdf = pdfium.PdfDocument(make_pdf(tmp_path / "scan.pdf", [("image", clause_lines(4))]))
+    page = pdf.get_page(0)
+    yield page
+    page.close()
+    pdf.close()
+
+
+def ocr_config(**overrides):
+    settings = {"adaptive_dpi": True, "probe_dpi": 150, "dpi": 300, "language": "eng", "detect_script": False}
+    settings.update(overrides)
+    return Config.from_dict({"ocr": settings}).ocr
+
+
+def test_confident_probe_is_kept(page):
+    config = ocr_config()
+    engine = FakeOCREngine(config, confidences={"eng": 90.0})
+
+    result = _ocr_rendered_page(page, config, engine)
+
+    # 612pt at 150 dpi
+    assert engine.calls == [(1275, None)]
+    assert (result.dpi, result.confidence, result.language) == (150, 90.0, "eng")
+
+
+def test_weak_probe_is_rerendered_at_full_dpi(page):
+    config = ocr_config()
+    engine = FakeOCREngine(config)
+
+    result = _ocr_rendered_page(page, config, engine)
+
+    assert [width for width, _ in engine.calls] == [1275, 2550]
+    assert (result.dpi, result.confidence, result.text) == (300, 99.0, "text at 2550px")
+
+
+def test_probe_never_exceeds_the_full_dpi(page):
+    config = ocr_config(probe_dpi=200, dpi=100)
+    engine = FakeOCREngine(config, confidences={"eng": 10.0})
+
+    result = _ocr_rendered_page(page, config, engine)
+
+    assert [width for width, _ in engine.calls] == [850]
+    assert result.dpi == 100
+
+
+def test_fixed_dpi_renders_once_without_confidence(page):
+    config = ocr_config(adaptive_dpi=False)
+    engine = FakeOCREngine(config)
+
+    result = _ocr_rendered_page(page, config, engine)
+
+    assert engine.calls == [(2550, None)]
+    assert (result.dpi, result.confidence) == (300, None)
@@ -0,0 +1,58 @@
+import random
+
+from benchmarks.compare import compare
+from benchmarks.corpus import ENGLISH_WORDS, build_docx, build_pdf
+from benchmarks.run import percentile
+
+
+def test_nearest_rank_percentile():
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == 5.0
+    assert percentile(values, 1) == 1.0
+    assert percentile([], 50) is None
+
+
+def entry(document="digital_en.pdf", pages_per_sec=100.0, p95=10.0, sha="abc", error=None):
+    return {
+        "operation": "extract_pdf",
+        "document": document,
+        "document_sha256": sha,
+        "pages_per_sec": pages_per_sec,
+        "p95_page_ms": p95,
+        "peak_rss_mb": 120.0,
+        "error": error,
+    }
+
+
+def report(*entries):
+    return {"commit": "0123456789abcdef", "results": list(entries)}
+
+
+def test_changes_within_the_threshold_pass():
+    assert not compare(report(entry()), report(entry(pages_per_sec=96.0, p95=10.4)), threshold=5)
+
+
+def test_throughput_or_p95_regressions_are_flagged(capsys):
+    assert compare(report(entry()), report(entry(pages_per_sec=80.0)), threshold=5)
+    assert compare(report(entry()), report(entry(p95=12.0)), threshold=5)
+    assert "REGRESSION (p95)" in capsys.readouterr().out
+
+
+def test_errors_and_changed_documents_are_skipped(capsys):
+    base = report(entry(), entry(document="scanned_en.pdf"))
+    head = report(entry(pages_per_sec=1.0, sha="def"), entry(document="scanned_en.pdf", error="Tesseract not found"))
+
+    assert not compare(base, head, threshold=5)
+    output = capsys.readouterr().out
+    assert "skipped (corpus changed)" in output and "skipped (error)" in output
+
+
+def test_corpus_documents_are_reproducible(tmp_path):
+    words = list(ENGLISH_WORDS)
+    for name in ("first", "second"):
+        build_pdf(tmp_path / f"{name}.pdf", [("text", words), ("image", words)], None, random.Random("seed"))
+        build_docx(tmp_path / f"{name}.docx", words, random.Random("seed"), sections=2)
+
+    assert (tmp_path / "first.pdf").read_bytes() == (tmp_path / "second.pdf").read_bytes()
+    assert (tmp_path / "first.docx").read_bytes() == (tmp_path / "second.docx").read_bytes()
@@ -0,0 +1,150 @@
+import io
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.services import bulk_upload as bulk_module
+from app.services.bulk_upload import BulkIngestion, stage_bulk_files
+from app.services.extractor import ExtractionResult, PageExtraction
+
+ALLOWED = (".pdf", ".docx")
+MB = 1024 * 1024
+
+
+def upload(name, data):
+    return UploadFile(io.BytesIO(data), size=len(data), filename=name)
+
+
+def zip_upload(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return UploadFile(buffer, filename="contracts.zip")
+
+
+def test_files_and_archive_members_are_staged(tmp_path):
+    archive = zip_upload({
+        "nested/dir/b.docx": b"docx",
+        "__MACOSX/nested/._b.docx": b"resource fork",
+        ".hidden.pdf": b"pdf",
+        "notes.txt": b"text",
+    })
+
+    items, skipped = stage_bulk_files([upload("../a.pdf", b"%PDF-1.7")], archive, ALLOWED, MB, 10, 10 * MB, str(tmp_path))
+
+    assert [(item.file_name, item.size) for item in items] == [("a.pdf", 8), ("b.docx", 4)]
+    assert items[1].path.read_bytes() == b"docx"
+    assert [(entry["file_name"], entry["status"]) for entry in skipped] == [("notes.txt", "skipped")]
+
+
+def test_limits_skip_files_without_staging_them(tmp_path):
+    files = [upload("big.pdf", b"x" * 200), upload("one.pdf", b"1"), upload("two.pdf", b"2"), upload("three.pdf", b"3")]
+
+    items, skipped = stage_bulk_files(files, None, ALLOWED, 100, 2, MB, str(tmp_path))
+
+    assert [item.file_name for item in items] == ["one.pdf", "two.pdf"]
+    assert [entry["error"] for entry in skipped] == [
+        "File exceeds the upload size limits.",
+        "More than 2 files in one import.",
+    ]
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(item.path.name for item in items)
+
+
+def test_total_size_is_enforced_while_spooling(tmp_path):
+    # A file without a declared size is checked against the remaining total while it is copied
+    files = [upload("one.pdf", b"x" * 60), UploadFile(io.BytesIO(b"y" * 60), filename="two.pdf")]
+
+    items, skipped = stage_bulk_files(files, None, ALLOWED, 100, 10, 100, str(tmp_path))
+
+    assert [item.file_name for item in items] == ["one.pdf"]
+    assert skipped[0]["error"].startswith("File exceeds the maximum upload size")
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+
+    async def put_stream(self, data, object_name, content_type, filename):
+        self.objects[object_name] = data.read()
+        return object_name
+
+    async def delete(self, object_name):
+        del self.objects[object_name]
+
+
+class FakeIngestion:
+    async def extract(self, file_path, file_hash=None, pdf_backend=None, executor=None):
+        text = file_path.read_text()
+        if text == "broken":
+            return ExtractionResult(text="Error opening PDF", error="Error opening PDF")
+        return ExtractionResult(text=text, pages=[PageExtraction(0, "digital", len(text), text)])
+
+
+class FakeContract(SimpleNamespace):
+    inserted = []
+    fail = False
+
+    def __init__(self, **fields):
+        super().__init__(id=None, content=None, extraction_stats=None, duplicate_of=None, **fields)
+
+    @classmethod
+    async def insert_many(cls, contracts, ordered=True):
+        if cls.fail:
+            raise RuntimeError("Mongo is down")
+        cls.inserted.extend(contracts)
+
+
+@pytest.fixture
+def contracts(monkeypatch):
+    async def index_contract(contract, threshold):
+        return None
+
+    FakeContract.inserted, FakeContract.fail = [], False
+    monkeypatch.setattr(bulk_module, "ContractDocument", FakeContract)
+    monkeypatch.setattr(bulk_module, "index_contract", index_contract)
+    return FakeContract
+
+
+def stage(tmp_path, contents):
+    files = [upload(f"contract{index}.pdf", content.encode()) for index, content in enumerate(contents)]
+    items, _ = stage_bulk_files(files, None, ALLOWED, MB, 10, 10 * MB, str(tmp_path))
+    return items
+
+
+async def test_contracts_are_stored_in_batches(contracts, tmp_path):
+    bucket = FakeBucket()
+    items = stage(tmp_path, ["first", "second", "third"])
+
+    entries = await BulkIngestion(FakeIngestion(), bucket, batch_size=2).run(items)
+
+    assert [entry["status"] for entry in entries] == ["created"] * 3
+    assert sorted(contract.content for contract in contracts.inserted) == ["first", "second", "third"]
+    assert len(bucket.objects) == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_failed_extraction_deletes_the_uploaded_object(contracts, tmp_path):
+    bucket = FakeBucket()
+    items = stage(tmp_path, ["first", "broken"])
+
+    entries = await BulkIngestion(FakeIngestion(), bucket).run(items)
+
+    assert [entry["status"] for entry in entries] == ["created", "failed"]
+    assert "file_id" not in entries[1]
+    assert list(bucket.objects.values()) == [b"first"]
+
+
+async def test_failed_insert_deletes_the_uploaded_objects(contracts, tmp_path):
+    contracts.fail = True
+    bucket = FakeBucket()
+    items = stage(tmp_path, ["first", "second"])
+
+    entries = await BulkIngestion(FakeIngestion(), bucket).run(items)
+
+    assert [(entry["status"], entry["error"]) for entry in entries] == [("failed", "Mongo is down")] * 2
+    assert bucket.objects == {}
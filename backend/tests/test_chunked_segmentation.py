@@ -0,0 +1,94 @@
+import re
+
+from app.services import segmenter as segmenter_module
+from app.services.segmenter import (
+    ClauseExtractionResult,
+    ExtractedClause,
+    TextChunk,
+    _merge_chunks,
+    _reconcile,
+    extract_clauses_chunked,
+    split_for_segmentation,
+)
+
+
+def contract(sections=12):
+    return "\n\n".join(
+        f"{number}. Section {number}\nThe supplier shall perform obligation {number} with due care and skill.\n"
+        f"{number}.1 The customer shall cooperate with the supplier on obligation {number}."
+        for number in range(1, sections + 1)
+    )
+
+
+def test_short_text_is_one_chunk():
+    assert split_for_segmentation("1. Short", 100, 10) == [TextChunk(0, 0, 8, 0, 8)]
+
+
+def test_chunks_cut_at_section_starts_and_overlap():
+    text = contract()
+    chunks = split_for_segmentation(text, 500, 80)
+
+    assert len(chunks) > 2
+    assert chunks[0].own_start == 0 and chunks[-1].own_end == len(text)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.own_start == previous.own_end
+        assert re.match(r"\d+\. Section", text[chunk.own_start:])
+        assert chunk.start < chunk.own_start and previous.end > previous.own_end
+    assert all(chunk.own_end - chunk.own_start <= 500 for chunk in chunks)
+
+
+def clause(clause_id, text, level=1, heading=None):
+    return ExtractedClause(clause_id=clause_id, text=text, level=level, heading=heading)
+
+
+def test_overlapping_clauses_are_kept_once_and_cut_clauses_completed():
+    text = "1. First clause text here.\n2. Second clause that runs across the seam.\n3. Third clause."
+    seam = text.index("across")
+    chunks = [TextChunk(0, 0, seam + 6, 0, text.index("3.")), TextChunk(1, text.index("2."), len(text), text.index("3."), len(text))]
+    results = [
+        ClauseExtractionResult(clauses=[clause("1", "1. First clause text here."), clause("2", "2. Second clause that runs across")], total_clauses=2),
+        ClauseExtractionResult(clauses=[clause("2", "2. Second clause that runs across the seam."), clause("3", "3. Third clause.")], total_clauses=2),
+    ]
+
+    merged = _merge_chunks(text, chunks, results)
+
+    assert [(index, item.clause_id) for index, item in merged] == [(0, "1"), (0, "2"), (1, "3")]
+    assert merged[1][1].text == "2. Second clause that runs across the seam."
+
+
+def test_restarted_numbering_is_shifted_and_duplicates_suffixed():
+    merged = [
+        (0, clause("0", "Preamble", level=0)),
+        (0, clause("1", "a")), (0, clause("1.1", "b", level=1)), (0, clause("2", "c")),
+        # The second chunk's model restarted at 1
+        (1, clause("0", "Another preamble", level=0)), (1, clause("1", "d")), (1, clause("1.1", "e")), (1, clause("2", "f")),
+        # The third continued correctly, apart from a seam clause seen twice
+        (2, clause("5", "g")), (2, clause("5", "h")),
+    ]
+
+    reconciled = _reconcile(merged)
+
+    assert [(item.clause_id, item.level) for item in reconciled] == [
+        ("0", 0), ("1", 1), ("1.1", 2), ("2", 1),
+        ("0-2", 0), ("3", 1), ("3.1", 2), ("4", 1),
+        ("5", 1), ("5-2", 1),
+    ]
+
+
+async def test_long_contracts_are_segmented_per_chunk(monkeypatch):
+    calls = []
+
+    async def run_agent(text, part_of_longer_text=False):
+        calls.append(part_of_longer_text)
+        # Numbers every complete line from 1, like a model that restarts per part
+        clauses = [clause(str(index), line) for index, line in enumerate(re.findall(r"^\d+\. .*$", text, re.MULTILINE), 1)]
+        return ClauseExtractionResult(clauses=clauses, total_clauses=len(clauses))
+
+    monkeypatch.setattr(segmenter_module, "_run_agent", run_agent)
+    text = "\n\n".join(f"{number}. The supplier shall meet obligation number {number} in full." for number in range(1, 21))
+
+    result = await extract_clauses_chunked(text, max_chars=400, overlap=0)
+
+    assert len(calls) > 1 and all(calls)
+    assert [item.clause_id for item in result.clauses] == [str(number) for number in range(1, 21)]
+    assert [item.text for item in result.clauses] == text.split("\n\n")
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import compliance_cache
+from app.services.compliance_check import check_compliance
+from tests.compliance import FakeComplianceCache, FakeSpecialists, clauses
+
+
+def test_clause_key_ignores_ids_and_spacing():
+    key = compliance_cache.clause_key("ns", "Payment", "Pay within 30 days.")
+
+    assert key == compliance_cache.clause_key("ns", " Payment ", "Pay  within\n30 days.")
+    assert key != compliance_cache.clause_key("ns", "Payment", "Pay within 60 days.")
+    assert key != compliance_cache.clause_key("other", "Payment", "Pay within 30 days.")
+    assert compliance_cache.review_namespace("v1", ["a"]) != compliance_cache.review_namespace("v1", ["b"])
+
+
+def test_cached_findings_follow_the_clause_id():
+    entry = SimpleNamespace(clause_id="4", findings=[{"title": "Late", "affected_clauses": [{"clause_id": "4"}]}])
+
+    findings = compliance_cache.findings_for(entry, "7")
+
+    assert findings[0]["affected_clauses"] == [{"clause_id": "7"}]
+    assert entry.findings[0]["affected_clauses"] == [{"clause_id": "4"}]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    return FakeComplianceCache(monkeypatch)
+
+
+async def test_only_new_or_changed_clauses_are_checked_again(monkeypatch, cache):
+    specialists = FakeSpecialists(monkeypatch)
+    first = await check_compliance(clauses(3), "contract-1", policy_version="v1", deadline=5)
+
+    # Renumbered and with clause 2 edited
+    edited = clauses(3)
+    edited[1].text = "The supplier shall do 2 twice."
+    for clause, clause_id in zip(edited, ("11", "12", "13")):
+        clause.clause_id = clause_id
+    second = await check_compliance(edited, "contract-2", policy_version="v1", deadline=5)
+
+    assert specialists.checked() == [["1", "2", "3"], ["12"]]
+    titles = {finding.title: [c.clause_id for c in finding.affected_clauses] for finding in second.findings}
+    assert titles["compliance issue in The supplier shall do 1."] == ["11"]
+    assert titles["compliance issue in The supplier shall do 2 twice."] == ["12"]
+    assert "compliance issue in The supplier shall do 2." not in titles
+    assert len(second.findings) == len(first.findings) == 9
+
+
+async def test_another_policy_version_misses_the_cache(monkeypatch, cache):
+    specialists = FakeSpecialists(monkeypatch)
+    await check_compliance(clauses(2), "contract-1", policy_version="v1", deadline=5)
+    await check_compliance(clauses(2), "contract-1", policy_version="v2", deadline=5)
+
+    assert specialists.checked() == [["1", "2"], ["1", "2"]]
+
+
+async def test_runs_with_a_failed_agent_are_not_cached(monkeypatch, cache):
+    FakeSpecialists(monkeypatch, errors={"tariff": RuntimeError("rate limited")})
+
+    result = await check_compliance(clauses(2), "contract-1", policy_version="v1", deadline=5)
+
+    assert result.dropped_agents == ["tariff_agent"]
+    assert cache.entries == {}
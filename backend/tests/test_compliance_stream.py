@@ -0,0 +1,48 @@
+import asyncio
+
+from app.services.compliance_check import AnalysisSource, stream_compliance
+from tests.compliance import FakeSpecialists, clauses, finding
+
+
+async def collect(stream):
+    return [(event, data) async for event, data in stream]
+
+
+async def test_findings_stream_in_completion_order(monkeypatch):
+    FakeSpecialists(monkeypatch, delays={"compliance": 0.1, "tariff": 0, "external": 0.05})
+    reused = [finding("Reused issue", ["9"])]
+
+    events = await collect(stream_compliance(clauses(2), "contract-1", reused_findings=reused, deadline=5))
+
+    assert [(event, data["source"]) for event, data in events[:-1]] == [
+        ("findings", None),
+        ("findings", AnalysisSource.TARIFF_AGENT),
+        ("findings", AnalysisSource.EXTERNAL_REVIEW_AGENT),
+        ("findings", AnalysisSource.COMPLIANCE_AGENT),
+    ]
+    assert events[0][1]["findings"][0].finding_id == "COMP-001"
+    assert [f.finding_id for f in events[3][1]["findings"]] == ["COMP-002", "COMP-003"]
+    event, result = events[-1]
+    assert event == "result" and len(result.findings) == 7
+
+
+async def test_failed_agents_are_reported_and_skipped(monkeypatch):
+    FakeSpecialists(monkeypatch, errors={"external": RuntimeError("search unavailable")})
+
+    events = await collect(stream_compliance(clauses(1), "contract-1", deadline=5))
+
+    failed = [data for event, data in events if event == "agent_failed"]
+    assert failed == [{"source": AnalysisSource.EXTERNAL_REVIEW_AGENT, "batch": 0, "error": "search unavailable", "timed_out": False}]
+    assert events[-1][1].dropped_agents == [AnalysisSource.EXTERNAL_REVIEW_AGENT]
+
+
+async def test_closing_the_stream_cancels_running_agents(monkeypatch):
+    specialists = FakeSpecialists(monkeypatch, delays={"compliance": 0, "tariff": 10, "external": 10})
+    stream = stream_compliance(clauses(1), "contract-1", deadline=30)
+
+    event, data = await anext(stream)
+    await stream.aclose()
+    await asyncio.sleep(0.01)
+
+    assert (event, data["source"]) == ("findings", AnalysisSource.COMPLIANCE_AGENT)
+    assert sorted(specialists.cancelled) == ["external", "tariff"]
@@ -0,0 +1,64 @@
+from docx import Document
+
+from app.config import Config
+from app.services.extractor import TABLE_ROW, DocumentExtractor, iter_docx_blocks
+
+
+def make_docx(path, first_paragraph="Clause 1. Payment is due within thirty days."):
+    document = Document()
+    document.add_heading("Fees", level=1)
+    document.add_paragraph(first_paragraph)
+    table = document.add_table(rows=2, cols=2)
+    for row, cells in enumerate((("Item", "Amount"), ("Licence", "100.00"))):
+        for cell, text in zip(table.rows[row].cells, cells):
+            cell.text = text
+    nested = table.rows[1].cells[0].add_table(rows=1, cols=2)
+    nested.rows[0].cells[0].text = "Tier"
+    nested.rows[0].cells[1].text = "Gold"
+    document.add_paragraph("Clause 2. Invoices are sent monthly.")
+    document.save(path)
+    return path
+
+
+def test_blocks_keep_document_order(tmp_path):
+    blocks = list(iter_docx_blocks(make_docx(tmp_path / "contract.docx")))
+
+    assert blocks == [
+        "Fees",
+        "Clause 1. Payment is due within thirty days.",
+        f"{TABLE_ROW}Item | Amount",
+        f"{TABLE_ROW}Licence\nTier | Gold | 100.00",
+        "Clause 2. Invoices are sent monthly.",
+    ]
+
+
+def test_docx_is_one_digital_page(tmp_path):
+    path = make_docx(tmp_path / "contract.docx", first_paragraph="Errors and omissions are excluded.")
+    progress = []
+
+    result = DocumentExtractor(Config()).extract_document(path, progress=lambda *args: progress.append(args))
+
+    assert result.error is None
+    assert result.text.startswith("Fees\n\nErrors and omissions")
+    assert [(page.method, page.char_count) for page in result.pages] == [("digital", len(result.text))]
+    assert progress == [("digital", 1, 1)]
+
+
+def test_unreadable_docx_reports_an_error(tmp_path):
+    path = tmp_path / "broken.docx"
+    path.write_bytes(b"not a zip")
+
+    result = DocumentExtractor(Config()).extract_document(path)
+
+    assert result.error and result.error.startswith("Error extracting DOCX text")
+    assert result.pages == []
+
+
+def test_doc_without_libreoffice_reports_an_error(tmp_path):
+    path = tmp_path / "legacy.doc"
+    path.write_bytes(b"\xd0\xcf\x11\xe0")
+    config = Config.from_dict({"extraction": {"soffice_path": str(tmp_path / "missing-soffice")}})
+
+    result = DocumentExtractor(config).extract_document(path)
+
+    assert result.error == "Error: LibreOffice not found. Set SOFFICE_PATH to convert .doc files."
@@ -0,0 +1,88 @@
+import pytest
+
+from app.config import Config
+from app.services import ingestion as ingestion_module
+from app.services.extractor import DocumentExtractor, ExtractionResult, PageExtraction
+from app.services.ingestion import IngestionQueue
+
+
+def cache_key(file_hash="abc", suffix=".pdf", pdf_backend=None, **ocr):
+    return DocumentExtractor(Config.from_dict({"ocr": ocr})).cache_key(file_hash, suffix, pdf_backend)
+
+
+def test_cache_key_is_stable_for_the_same_file_and_settings():
+    assert cache_key() == cache_key()
+    assert cache_key(suffix=".PDF") == cache_key(suffix=".pdf")
+
+
+@pytest.mark.parametrize("change", [
+    {"file_hash": "def"},
+    {"suffix": ".docx"},
+    {"pdf_backend": "pdfminer"},
+    {"dpi": 200},
+    {"language": "eng"},
+    {"psm_mode": 4},
+])
+def test_cache_key_changes_with_anything_that_changes_the_text(change):
+    assert cache_key(**change) != cache_key()
+
+
+class CountingExtractor(DocumentExtractor):
+    def __init__(self, result):
+        super().__init__(Config.from_dict({}))
+        self.result = result
+        self.calls = 0
+
+    def extract_document(self, file_path, progress=None, pdf_backend=None, on_page=None):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    entries = {}
+
+    async def get(key):
+        return entries.get(key)
+
+    async def put(key, file_hash, result):
+        entries[key] = ExtractionResult(text=result.text, pages=result.pages, cache_hit=True)
+
+    monkeypatch.setattr(ingestion_module.ExtractionCacheRepository, "get", staticmethod(get))
+    monkeypatch.setattr(ingestion_module.ExtractionCacheRepository, "put", staticmethod(put))
+    return entries
+
+
+async def test_second_extraction_of_the_same_file_is_served_from_cache(cache, tmp_path):
+    extractor = CountingExtractor(ExtractionResult(text="clauses", pages=[PageExtraction(0, "digital", 7)]))
+    queue = IngestionQueue(extractor)
+
+    first = await queue.extract(tmp_path / "a.pdf", file_hash="abc")
+    second = await queue.extract(tmp_path / "b.pdf", file_hash="abc")
+    await queue.shutdown()
+
+    assert extractor.calls == 1
+    assert not first.cache_hit and second.cache_hit
+    assert second.text == "clauses"
+
+
+async def test_failed_extractions_are_not_cached(cache, tmp_path):
+    extractor = CountingExtractor(ExtractionResult(text="Error opening PDF", error="Error opening PDF"))
+    queue = IngestionQueue(extractor)
+
+    await queue.extract(tmp_path / "a.pdf", file_hash="abc")
+    await queue.extract(tmp_path / "a.pdf", file_hash="abc")
+    await queue.shutdown()
+
+    assert extractor.calls == 2
+    assert cache == {}
+
+
+async def test_extractions_without_a_hash_bypass_the_cache(cache, tmp_path):
+    extractor = CountingExtractor(ExtractionResult(text="clauses"))
+    queue = IngestionQueue(extractor)
+
+    await queue.extract(tmp_path / "a.pdf")
+    await queue.shutdown()
+
+    assert cache == {}
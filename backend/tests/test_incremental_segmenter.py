@@ -0,0 +1,70 @@
+import pytest
+
+from app.services import incremental_segmenter as incremental_module
+from app.services.incremental_segmenter import resegment_incrementally
+from app.services.local_segmenter import segment_locally
+from app.services.segmenter import ClauseExtractionResult, ExtractedClause
+
+ORIGINAL = "\n".join(
+    f"{number}. The supplier shall meet obligation number {number} fully and on time every month."
+    for number in range(1, 7)
+)
+CLAUSES = [clause.model_dump() for clause in segment_locally(ORIGINAL)[0].clauses]
+NEW_CLAUSE = "The customer shall pay the supplier for every delivery within thirty days of receipt."
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    async def extract_clauses(text):
+        # One clause per line, numbered from 1 as the model does for a fragment
+        calls.append(text)
+        clauses = [ExtractedClause(clause_id=str(index), text=line, level=1)
+                   for index, line in enumerate(text.split("\n"), 1) if line]
+        return ClauseExtractionResult(clauses=clauses, total_clauses=len(clauses))
+
+    monkeypatch.setattr(incremental_module, "extract_clauses", extract_clauses)
+    return calls
+
+
+def summary(clauses):
+    return [(clause["clause_id"], clause["text"].split()[0] if clause["text"] else "") for clause in clauses]
+
+
+async def test_unchanged_content_keeps_every_clause(llm_calls):
+    clauses, stats = await resegment_incrementally(ORIGINAL, CLAUSES, ORIGINAL, 0.7)
+
+    assert clauses == CLAUSES and clauses[0] is not CLAUSES[0]
+    assert stats["kept"] == 6 and llm_calls == []
+
+
+async def test_edits_and_deletions_need_no_segmentation(llm_calls):
+    content = ORIGINAL.replace("number 2 fully", "number 2 partly").replace(
+        "\n4. The supplier shall meet obligation number 4 fully and on time every month.", ""
+    )
+
+    clauses, stats = await resegment_incrementally(ORIGINAL, CLAUSES, content, 0.7)
+
+    assert [clause["clause_id"] for clause in clauses] == ["1", "2", "3", "5", "6"]
+    assert "number 2 partly" in clauses[1]["text"]
+    assert stats == {"kept": 4, "edited": 1, "removed": 1, "regions": 0, "resegmented": 0}
+    assert llm_calls == []
+
+
+async def test_only_new_text_and_edited_neighbours_are_resegmented(llm_calls):
+    content = ORIGINAL.replace("number 5 fully", "number 5 slowly").replace("\n6.", f"\n{NEW_CLAUSE}\n6.")
+
+    clauses, stats = await resegment_incrementally(ORIGINAL, CLAUSES, content, 0.7)
+
+    assert len(llm_calls) == 1 and llm_calls[0].startswith("5. The supplier") and llm_calls[0].endswith("receipt.")
+    assert summary(clauses) == [("1", "1."), ("2", "2."), ("3", "3."), ("4", "4."), ("5", "5."), ("5-1", "The"), ("6", "6.")]
+    assert "number 5 slowly" in clauses[4]["text"]
+    assert stats == {"kept": 5, "edited": 0, "removed": 0, "regions": 1, "resegmented": 2}
+
+
+async def test_rewrites_fall_back_to_full_segmentation(llm_calls):
+    content = "\n".join(f"{number}. {NEW_CLAUSE}" for number in range(1, 9))
+
+    assert await resegment_incrementally(ORIGINAL, CLAUSES, content, 0.7) is None
+    assert llm_calls == []
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.ingestion import IngestionStage
+from app.services import ingestion as ingestion_module
+from app.services.extractor import ExtractionResult, PageExtraction
+from app.services.ingestion import IngestionQueue, JobEventLog
+
+
+class FakeExtractor:
+    def __init__(self, pages=2, error=None, block=None):
+        self.pages = pages
+        self.error = error
+        self.block = block
+
+    def extract_document(self, file_path, progress=None, pdf_backend=None, on_page=None):
+        if self.error:
+            return ExtractionResult(text=self.error, error=self.error)
+        pages = []
+        for index in range(self.pages):
+            page = PageExtraction(index, "digital", 4, "page")
+            pages.append(page)
+            on_page(page, self.pages)
+            progress("digital", index + 1, self.pages)
+        if self.block is not None:
+            self.block.wait(5)
+        return ExtractionResult(text="page\fpage", pages=pages)
+
+
+class FakeJob:
+    def __init__(self):
+        self.id = "job-1"
+        self.updates = []
+
+    async def set(self, fields):
+        self.updates.append(fields)
+
+
+class FakeContract:
+    def __init__(self):
+        self.id = "contract-1"
+        self.updates = []
+
+    async def update(self, query):
+        self.updates.append(query)
+
+
+@pytest.fixture(autouse=True)
+def no_index(monkeypatch):
+    async def index_contract(contract, threshold):
+        return None
+
+    monkeypatch.setattr(ingestion_module, "index_contract", index_contract)
+
+
+async def run_job(queue, tmp_path):
+    job, contract = FakeJob(), FakeContract()
+    queue._events[job.id] = JobEventLog()
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(b"%PDF")
+    await queue._run(job, contract, path, None, None)
+    return job, contract, path
+
+
+async def test_completed_job_stores_content_and_publishes_pages(tmp_path):
+    queue = IngestionQueue(FakeExtractor(pages=2), flush_interval=60)
+    job, contract, path = await run_job(queue, tmp_path)
+
+    assert not path.exists()
+    assert contract.updates[0]["$set"]["content"] == "page\fpage"
+    assert job.updates[-1]["stage"] == IngestionStage.COMPLETED
+    assert job.updates[-1]["pages_total"] == 2
+    events = [event for event, _ in queue.events(job.id).events]
+    assert events == ["page", "page", "completed"]
+    assert queue.events(job.id).closed
+    await queue.shutdown()
+
+
+async def test_failed_extraction_marks_the_job_failed(tmp_path):
+    queue = IngestionQueue(FakeExtractor(error="Error opening PDF: broken"), flush_interval=60)
+    job, contract, _ = await run_job(queue, tmp_path)
+
+    assert contract.updates == []
+    assert job.updates[-1]["stage"] == IngestionStage.FAILED
+    assert job.updates[-1]["error"] == "Error opening PDF: broken"
+    assert queue.events(job.id).events[-1] == ("failed", {"error": "Error opening PDF: broken"})
+    await queue.shutdown()
+
+
+async def test_cancelled_job_is_failed_and_closes_its_event_log(tmp_path):
+    release = threading.Event()
+    queue = IngestionQueue(FakeExtractor(pages=1, block=release), flush_interval=60)
+    job, contract = FakeJob(), FakeContract()
+    log = queue._events[job.id] = JobEventLog()
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(b"%PDF")
+
+    task = asyncio.create_task(queue._run(job, contract, path, None, None))
+    while not log.events:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    try:
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    finally:
+        release.set()
+
+    assert job.updates[-1]["stage"] == IngestionStage.FAILED
+    assert log.closed and log.events[-1][0] == "failed"
+    assert not path.exists()
+    await queue.shutdown()
+
+
+def test_queue_shutdown_is_safe_without_jobs():
+    queue = IngestionQueue(SimpleNamespace())
+    asyncio.run(queue.shutdown())
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.api.contract import _sse
+from app.services.extractor import PAGE_BREAK, ExtractionResult, PageExtraction
+from app.services.ingestion import IngestionQueue, JobEventLog
+
+
+async def collect(log, after=0):
+    return [(event_id, event) async for event_id, event, _ in log.follow(after)]
+
+
+async def test_late_subscriber_replays_every_event():
+    log = JobEventLog()
+    log.publish("page", {"page": 0})
+    log.publish("page", {"page": 1})
+    log.publish("completed", {}, final=True)
+
+    assert await collect(log) == [(1, "page"), (2, "page"), (3, "completed")]
+
+
+async def test_reconnect_resumes_after_the_last_event_id():
+    log = JobEventLog()
+    follower = asyncio.create_task(collect(log, after=1))
+    for page in range(3):
+        log.publish("page", {"page": page})
+        await asyncio.sleep(0)
+    log.publish("failed", {"error": "boom"}, final=True)
+
+    assert await asyncio.wait_for(follower, 1) == [(2, "page"), (3, "page"), (4, "failed")]
+
+
+async def test_followers_wait_for_new_events():
+    log = JobEventLog()
+    follower = asyncio.create_task(collect(log))
+    await asyncio.sleep(0.01)
+    assert not follower.done()
+
+    log.publish("completed", {}, final=True)
+    assert await asyncio.wait_for(follower, 1) == [(1, "completed")]
+
+
+def test_cache_hits_replay_pages_with_their_text():
+    pages = [PageExtraction(0, "digital", 5), PageExtraction(1, "ocr", 3)]
+    result = ExtractionResult(text=PAGE_BREAK.join(["First", "Two"]), pages=pages)
+    seen = []
+
+    IngestionQueue._replay_pages(result, lambda page, total: seen.append((page.page_index, page.text, total)))
+
+    assert seen == [(0, "First", 2), (1, "Two", 2)]
+    assert pages[0].text == ""
+
+
+def test_sse_frames_carry_the_event_id():
+    assert _sse("page", {"page": 1}, 4) == 'event: page\nid: 4\ndata: {"page": 1}\n\n'
+    assert _sse("progress", {}) == "event: progress\ndata: {}\n\n"
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from app.services.llm import LLMTimeoutError, arun, chat_model, close_http_clients, http_client
+
+
+class SlowAgent:
+    name = "SlowAgent"
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.cancelled = False
+
+    async def arun(self, prompt, stream=False, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return f"answer to {prompt}"
+
+
+async def test_agent_calls_are_awaited():
+    assert await arun(SlowAgent(0), "the question", timeout=1) == "answer to the question"
+
+
+async def test_slow_agent_calls_are_cancelled():
+    agent = SlowAgent(10)
+
+    with pytest.raises(LLMTimeoutError, match="SlowAgent did not answer within 0.05 seconds"):
+        await arun(agent, "the question", timeout=0.05)
+    assert agent.cancelled
+
+
+async def test_models_share_the_pooled_client():
+    try:
+        first, second = chat_model(), chat_model(id="another-model")
+        assert first.http_client is second.http_client is http_client()
+        assert second.id == "another-model"
+
+        await close_http_clients()
+        assert first.http_client.is_closed
+        assert http_client() is not first.http_client
+    finally:
+        await close_http_clients()
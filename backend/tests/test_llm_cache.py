@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from app.services import llm as llm_module
+from app.services import llm_cache as cache_module
+from app.services.llm_cache import ResponseCache
+
+
+class Verdict(BaseModel):
+    compliant: bool
+    reasons: list
+
+
+class FakeRepository:
+    def __init__(self):
+        self.stored = {}
+        self.fail = False
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("Mongo is down")
+        return self.stored.get(key)
+
+    async def put(self, key, model_id, value, ttl):
+        self.stored[key] = value
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repository = FakeRepository()
+    monkeypatch.setattr(cache_module, "LLMCacheRepository", repository)
+    return repository
+
+
+def agent(instructions=("Check the clause.",), model_id="llama-3.3-70b"):
+    return SimpleNamespace(name="Checker", instructions=list(instructions), output_schema=Verdict, model=SimpleNamespace(id=model_id))
+
+
+def test_key_covers_model_instructions_scope_and_prompt():
+    key = ResponseCache.key(agent(), "clause 1")
+    assert key.startswith("llama-3.3-70b:")
+    assert key == ResponseCache.key(agent(), "clause 1")
+    assert len({
+        key,
+        ResponseCache.key(agent(), "clause 2"),
+        ResponseCache.key(agent(["Check it twice."]), "clause 1"),
+        ResponseCache.key(agent(model_id="gpt-4o"), "clause 1"),
+        ResponseCache.key(agent(), "clause 1", scope="policies-v2"),
+    }) == 5
+
+
+async def test_least_recently_used_entries_are_evicted(repository):
+    cache = ResponseCache(max_entries=2)
+    for key in ("a", "b"):
+        await cache.put(key, "model", key.upper())
+    await cache.get("a")
+    await cache.put("c", "model", "C")
+    repository.stored.clear()
+
+    assert [await cache.get(key) for key in ("a", "b", "c")] == ["A", None, "C"]
+    assert cache.stats()["entries_in_memory"] == 2
+
+
+async def test_expired_entries_are_dropped(repository, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=60)
+    await cache.put("a", "model", "A")
+    repository.stored.clear()
+
+    now[0] += 59
+    assert await cache.get("a") == "A"
+    now[0] += 2
+    assert await cache.get("a") is None
+
+
+async def test_persistent_hits_are_revalidated_and_copied(repository):
+    await ResponseCache().put("a", "model", Verdict(compliant=False, reasons=["late"]))
+    cache = ResponseCache()
+
+    first = await cache.get("a", Verdict)
+    first.reasons.append("changed by the caller")
+
+    assert first.compliant is False
+    assert (await cache.get("a", Verdict)).reasons == ["late"]
+    assert (cache.persistent_hits, cache.memory_hits) == (1, 1)
+
+
+async def test_persistent_failures_are_misses(repository):
+    repository.fail = True
+    cache = ResponseCache()
+
+    assert await cache.get("a") is None
+    assert cache.stats()["hit_rate"] == 0.0
+
+
+async def test_cached_runs_skip_the_call(repository, monkeypatch):
+    calls = []
+
+    async def arun(agent, prompt, timeout=None, **kwargs):
+        calls.append(prompt)
+        return SimpleNamespace(content=Verdict(compliant=True, reasons=[]) if prompt != "unparsable" else None)
+
+    monkeypatch.setattr(llm_module, "arun", arun)
+    monkeypatch.setattr(llm_module, "response_cache", ResponseCache())
+    parse = lambda response: response.content
+
+    for prompt in ("clause 1", "clause 1", "unparsable", "unparsable"):
+        await llm_module.arun_cached(agent(), prompt, parse, result_type=Verdict)
+
+    assert calls == ["clause 1", "unparsable", "unparsable"]
@@ -0,0 +1,79 @@
+from app.services.local_segmenter import roman_value, segment_locally
+
+ENGLISH = """SERVICES AGREEMENT
+
+1. Definitions. In this Agreement the following terms apply.
+1.1 "Services" means the services in Schedule A.
+1.2 "Fees" means the amounts in Schedule B.
+2. Payment Terms
+The Customer shall pay each invoice within thirty days.
+(a) Invoices are issued monthly.
+(b) Late payments bear interest.
+CONFIDENTIALITY
+3. Each party shall keep the other's information confidential.
+(h) Disclosures required by law are permitted.
+(i) Disclosures to advisers are permitted.
+IN WITNESS WHEREOF the parties have signed this Agreement.
+Signed by the Supplier"""
+
+ARABIC = """المادة الأولى: التعريفات
+يقصد بالكلمات التالية المعاني المبينة قرين كل منها.
+المادة الثانية: الدفع
+أ- يلتزم العميل بالدفع خلال ٣٠ يوما.
+ب- تصدر الفواتير شهريا.
+المادة الثالثة: الإنهاء
+يجوز لأي طرف إنهاء العقد بإشعار كتابي."""
+
+
+def outline(result):
+    return [(clause.clause_id, clause.heading, clause.level) for clause in result.clauses]
+
+
+def test_numbered_english_contract():
+    result, confidence = segment_locally(ENGLISH)
+
+    assert outline(result) == [
+        ("1", "Definitions", 1),
+        ("1.1", None, 2),
+        ("1.2", None, 2),
+        ("2", "Payment Terms", 1),
+        ("2(a)", None, 2),
+        ("2(b)", None, 2),
+        ("3", "CONFIDENTIALITY", 1),
+        ("3(h)", None, 2),
+        ("3(i)", None, 2),  # continues the letters, not Roman one
+    ]
+    assert result.clauses[3].text.endswith("within thirty days.")
+    assert result.clauses[6].text.startswith("CONFIDENTIALITY\n3. Each party")
+    # The execution block is not a clause
+    assert "WITNESS" not in result.clauses[-1].text
+    assert 0.8 < confidence < 1
+
+
+def test_arabic_articles_and_abjad_items():
+    result, confidence = segment_locally(ARABIC)
+
+    assert outline(result) == [
+        ("1", "التعريفات", 1),
+        ("2", "الدفع", 1),
+        ("2(أ)", None, 2),
+        ("2(ب)", None, 2),
+        ("3", "الإنهاء", 1),
+    ]
+    assert confidence == 1.0
+
+
+def test_unnumbered_text_gets_no_confidence():
+    result, confidence = segment_locally("This letter confirms our meeting.\nWe will talk about pricing next week.")
+
+    assert result.clauses == [] and confidence == 0.0
+
+
+def test_numbering_gaps_lower_the_confidence():
+    text = "\n".join(f"{number}. The supplier shall comply with clause {number}." for number in (1, 2, 5, 9))
+    _, confidence = segment_locally(text)
+    assert confidence == 0.5
+
+
+def test_roman_numerals():
+    assert [roman_value(numeral) for numeral in ("iv", "IX", "xl", "iiii", "mix")] == [4, 9, 40, None, 1009]
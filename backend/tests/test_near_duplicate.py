@@ -0,0 +1,93 @@
+import random
+
+from app.services.near_duplicate import (
+    estimated_similarity,
+    lsh_bands,
+    minhash_signature,
+    reuse_clauses,
+    split_for_review,
+)
+
+WORDS = (
+    "agreement party shall supplier customer services term notice payment invoice days written consent "
+    "confidential information liability damages warranty obligations breach governing law dispute"
+).split()
+
+
+def contract_text(seed, words=400):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def test_digits_case_and_diacritics_do_not_change_the_signature():
+    a = minhash_signature("Payment is due within 30 days of the Invoice date, بِسْمِ الله.")
+    b = minhash_signature("payment is due within 45 days of the invoice date, بسم الله.")
+    assert a == b
+    assert minhash_signature("  ...  ") is None
+
+
+def test_near_copies_share_a_band_and_unrelated_contracts_do_not():
+    original = contract_text("original").split()
+    edited = list(original)
+    for index in range(0, len(edited), 80):
+        edited[index] = "amended"
+    signature = minhash_signature(" ".join(original))
+    near = minhash_signature(" ".join(edited))
+    other = minhash_signature(contract_text("other"))
+
+    assert estimated_similarity(signature, near) > 0.8
+    assert set(lsh_bands(signature)) & set(lsh_bands(near))
+    assert estimated_similarity(signature, other) < 0.3
+    assert not set(lsh_bands(signature)) & set(lsh_bands(other))
+
+
+def clause(clause_id, text, heading=None):
+    return {"clause_id": clause_id, "heading": heading, "text": text}
+
+
+ORIGINAL = [
+    clause("1", "The supplier delivers within 30 days."),
+    clause("2", "Payment is due on receipt of the invoice."),
+    clause("3", "Either party may terminate on 90 days notice."),
+]
+FINDINGS = [
+    {"title": "Late delivery", "affected_clauses": [{"clause_id": "1"}]},
+    {"title": "Payment terms", "affected_clauses": [{"clause_id": "2"}]},
+    {"title": "Termination", "affected_clauses": [{"clause_id": "3"}]},
+    {"title": "No governing law", "affected_clauses": []},
+]
+
+
+def test_changed_amount_is_checked_again():
+    clauses = [clause("1", "The supplier delivers within  60 days."), ORIGINAL[1], ORIGINAL[2]]
+
+    changed, reused = split_for_review(clauses, ORIGINAL, FINDINGS)
+
+    assert [c["clause_id"] for c in changed] == ["1"]
+    assert [f["title"] for f in reused] == ["Payment terms", "Termination", "No governing law"]
+
+
+def test_whitespace_only_edits_keep_every_finding():
+    clauses = [clause(c["clause_id"], "  " + c["text"].replace(" ", "\n")) for c in ORIGINAL]
+
+    changed, reused = split_for_review(clauses, ORIGINAL, FINDINGS)
+
+    assert changed == [] and reused == FINDINGS
+
+
+def test_findings_on_deleted_clauses_are_dropped():
+    changed, reused = split_for_review(ORIGINAL[:2], ORIGINAL, FINDINGS)
+
+    assert changed == []
+    assert [f["title"] for f in reused] == ["Late delivery", "Payment terms", "No governing law"]
+
+
+def test_reused_clauses_take_their_text_from_the_new_contract():
+    original_content = "\n\n".join(c["text"] for c in ORIGINAL)
+    content = original_content.replace("30 days", "45 days")
+
+    clauses, changed = reuse_clauses(original_content, [dict(c) for c in ORIGINAL], content)
+
+    assert changed == 1
+    assert [c["text"] for c in clauses] == [ORIGINAL[0]["text"].replace("30", "45"), ORIGINAL[1]["text"], ORIGINAL[2]["text"]]
+    assert reuse_clauses(original_content, ORIGINAL, content + " " + contract_text("new clause", 30)) is None
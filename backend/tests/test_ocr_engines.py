@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import Config
+from app.services import extractor as extractor_module
+from app.services.extractor import (
+    PytesseractEngine,
+    _text_from_tesseract_data,
+    create_ocr_engine,
+    resolve_ocr_engine,
+)
+
+
+def ocr_config(engine):
+    return Config.from_dict({"ocr": {"engine": engine, "language": "eng+ara"}}).ocr
+
+
+@pytest.mark.parametrize("engine, installed, expected", [
+    ("auto", True, "tesserocr"),
+    ("auto", False, "pytesseract"),
+    ("tesserocr", True, "tesserocr"),
+    ("tesserocr", False, "pytesseract"),
+    ("pytesseract", True, "pytesseract"),
+])
+def test_engine_resolution(monkeypatch, engine, installed, expected):
+    monkeypatch.setattr(extractor_module, "tesserocr", SimpleNamespace() if installed else None)
+    assert resolve_ocr_engine(ocr_config(engine)) == expected
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_ocr_engine(ocr_config("easyocr"))
+
+
+def test_missing_tesserocr_falls_back_to_pytesseract(monkeypatch):
+    monkeypatch.setattr(extractor_module, "tesserocr", None)
+    assert isinstance(create_ocr_engine(ocr_config("tesserocr")), PytesseractEngine)
+
+
+@pytest.mark.parametrize("engine, warned", [("auto", True), ("pytesseract", False)])
+def test_health_warns_when_tesserocr_was_wanted(monkeypatch, engine, warned):
+    monkeypatch.setattr(extractor_module.pytesseract, "get_tesseract_version", lambda: "5.3.0")
+    monkeypatch.setattr(extractor_module.pytesseract, "get_languages", lambda config="": ["eng", "osd"])
+
+    report = PytesseractEngine(ocr_config(engine)).health()
+
+    assert report["version"] == "5.3.0"
+    assert report["missing_languages"] == ["ara"] and not report["ok"]
+    assert ("warning" in report) is warned
+
+
+def test_tesseract_data_is_rebuilt_by_line_and_paragraph():
+    data = {
+        "text": ["Clause", "1", "", "Payment", "terms", "Notes"],
+        "conf": [90, 80, -1, 70, "60", -1],
+        "block_num": [1, 1, 1, 1, 1, 2],
+        "par_num": [1, 1, 1, 1, 1, 1],
+        "line_num": [1, 1, 1, 2, 2, 1],
+    }
+
+    text, confidence = _text_from_tesseract_data(data)
+
+    assert text == "Clause 1\nPayment terms\n\nNotes"
+    assert confidence == 75.0
+    assert _text_from_tesseract_data({"text": [], "conf": [], "block_num": [], "par_num": [], "line_num": []}) == ("", None)
@@ -0,0 +1,46 @@
+from app.config import Config
+from app.services.extractor import PAGE_BREAK, DocumentExtractor
+from tests.documents import clause_lines, make_pdf
+from tests.fakes import FakeOCREngine
+
+
+def make_extractor():
+    extractor = DocumentExtractor(Config.from_dict({"ocr": {"parallel": False, "detect_script": False, "dpi": 72}}))
+    engine = extractor._local.engine = FakeOCREngine(extractor.config.ocr)
+    return extractor, engine
+
+
+def test_only_image_pages_are_ocred(tmp_path):
+    path = make_pdf(tmp_path / "mixed.pdf", [
+        ("text", clause_lines(4)),
+        ("image", clause_lines(4)),
+        ("blank", []),
+        ("text", clause_lines(2, prefix="Article")),
+    ])
+    extractor, engine = make_extractor()
+
+    result = extractor.extract_document(path, pdf_backend="pdfium")
+
+    assert result.error is None
+    assert [page.method for page in result.pages] == ["digital", "ocr", "blank", "digital"]
+    assert len(engine.calls) == 1
+    texts = result.text.split(PAGE_BREAK)
+    assert texts[0].startswith("Clause 1.")
+    assert texts[1] == "text at 612px"
+    assert texts[2] == ""
+    assert texts[3].startswith("Article 1.")
+    summary = result.summary()
+    assert (summary["digital_pages"], summary["ocr_pages"], summary["blank_pages"]) == (2, 1, 1)
+    assert summary["ocr_avoided_ratio"] == 0.75
+
+
+def test_digital_pdf_never_reaches_ocr(tmp_path):
+    path = make_pdf(tmp_path / "digital.pdf", [("text", clause_lines(5))] * 3)
+    extractor, engine = make_extractor()
+    progress = []
+
+    result = extractor.extract_document(path, lambda *args: progress.append(args), pdf_backend="pdfium")
+
+    assert engine.calls == []
+    assert [page.method for page in result.pages] == ["digital"] * 3
+    assert progress[-1] == ("digital", 3, 3)
@@ -0,0 +1,61 @@
+import shutil
+import threading
+
+import pytest
+
+from app.config import Config
+from app.services.extractor import DocumentExtractor
+from tests.documents import clause_lines, make_pdf
+from tests.fakes import FakeOCREngine
+
+
+def make_extractor(**ocr):
+    return DocumentExtractor(Config.from_dict({"ocr": {"detect_script": False, **ocr}}))
+
+
+def test_pool_is_created_once_by_concurrent_threads():
+    extractor = make_extractor(parallel=True, workers=2)
+    pools = []
+    barrier = threading.Barrier(8)
+
+    def get_pool():
+        barrier.wait()
+        pools.append(extractor._get_ocr_pool())
+
+    threads = [threading.Thread(target=get_pool) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert len({id(pool) for pool in pools}) == 1
+    finally:
+        extractor.close()
+    assert extractor._ocr_pool is None
+
+
+def test_serial_ocr_keeps_page_order_and_reports_progress(tmp_path):
+    path = make_pdf(tmp_path / "scan.pdf", [("image", clause_lines(3))] * 3)
+    extractor = make_extractor(parallel=False, dpi=72)
+    extractor._local.engine = FakeOCREngine(extractor.config.ocr)
+    progress, results = [], []
+
+    pages = extractor._ocr_pages(
+        path, [2, 0], lambda stage, done, total: progress.append((stage, done, total)),
+        lambda page_index, page_ocr: results.append(page_index),
+    )
+
+    assert [page.text for page in pages] == ["text at 612px"] * 2
+    assert results == [2, 0]
+    assert progress == [("ocr", 0, 2), ("ocr", 1, 2), ("ocr", 2, 2)]
+
+
+@pytest.mark.skipif(shutil.which("tesseract") is None, reason="needs the tesseract binary")
+def test_parallel_ocr_returns_pages_in_document_order(tmp_path):
+    path = make_pdf(tmp_path / "scan.pdf", [("image", [f"Page number {index}"]) for index in range(4)])
+    extractor = make_extractor(parallel=True, workers=2, max_inflight_pages=2, language="eng", dpi=150)
+    try:
+        pages = extractor._ocr_pages(path, range(4))
+    finally:
+        extractor.close()
+    assert [str(index) in page.text for index, page in enumerate(pages)] == [True] * 4
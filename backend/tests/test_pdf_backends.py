@@ -0,0 +1,78 @@
+import pytest
+
+from app.config import Config
+from app.services import extractor as extractor_module
+from app.services.extractor import DocumentExtractor, PdfTextBackend, text_layer_looks_sound
+from tests.documents import clause_lines, make_pdf
+
+
+class FakeBackend(PdfTextBackend):
+    def __init__(self, name, texts):
+        self.name = name
+        self.texts = texts
+        self.requests = []
+
+    def read_pages(self, file_path, page_indices=None):
+        self.requests.append(None if page_indices is None else list(page_indices))
+        indices = range(len(self.texts)) if page_indices is None else page_indices
+        return [self.texts[index] for index in indices]
+
+
+SOUND = "The supplier shall deliver the goods within thirty days of the order. " * 3
+
+
+@pytest.mark.parametrize("text, sound", [
+    (SOUND, True),
+    ("", True),
+    ("Short heading", True),
+    ("Clause \ufffd\ufffd\ufffd " + SOUND[:60], False),
+    ("\ue000\ue001 " * 20, False),
+    ("Thesuppliershalldeliverthegoodswithinthirtydays" * 6, False),
+    (" " * 150 + "x" * 10, False),
+])
+def test_text_layer_quality_checks(text, sound):
+    assert text_layer_looks_sound(text) is sound
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    pdfium = FakeBackend("pdfium", [SOUND, "Glued" * 60, SOUND])
+    pdfminer = FakeBackend("pdfminer", [SOUND, "Glued text " * 30, SOUND])
+    monkeypatch.setattr(extractor_module, "PDF_TEXT_BACKENDS", {"pdfium": pdfium, "pdfminer": pdfminer})
+    return pdfium, pdfminer
+
+
+def test_auto_rereads_only_unsound_pages_with_pdfminer(backends, tmp_path):
+    pdfium, pdfminer = backends
+    extractor = DocumentExtractor(Config())
+
+    texts, used = extractor._read_text_layers(tmp_path / "contract.pdf", "auto")
+
+    assert used == ["pdfium", "pdfminer", "pdfium"]
+    assert texts[1] == "Glued text " * 30
+    assert pdfminer.requests == [[1]]
+
+
+def test_explicit_backend_reads_every_page(backends, tmp_path):
+    pdfium, pdfminer = backends
+    extractor = DocumentExtractor(Config())
+
+    _, used = extractor._read_text_layers(tmp_path / "contract.pdf", "pdfminer")
+
+    assert used == ["pdfminer"] * 3
+    assert pdfium.requests == []
+    with pytest.raises(ValueError):
+        extractor._read_text_layers(tmp_path / "contract.pdf", "poppler")
+
+
+@pytest.mark.parametrize("backend", ["pdfium", "pdfminer", "auto"])
+def test_backend_is_recorded_per_page(backend, tmp_path):
+    path = make_pdf(tmp_path / "digital.pdf", [("text", clause_lines(5))] * 2)
+    extractor = DocumentExtractor(Config())
+
+    result = extractor.extract_document(path, pdf_backend=backend)
+
+    assert result.error is None
+    assert "Clause 5." in result.pages[1].text
+    expected = "pdfium" if backend == "auto" else backend
+    assert [page.backend for page in result.pages] == [expected] * 2
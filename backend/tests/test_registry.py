@@ -0,0 +1,56 @@
+from agno.agent import Agent
+
+from app.services.registry import AgentRegistry, _freeze
+
+
+def make_registry():
+    registry = AgentRegistry()
+    builds = []
+
+    @registry.register
+    def build_reviewer(instructions=("Review the clause.",), temperature: float = 0.0) -> Agent:
+        builds.append((instructions, temperature))
+        return Agent(name="Reviewer", model=registry.model(temperature=temperature), instructions=list(instructions))
+
+    return registry, build_reviewer, builds
+
+
+def test_agents_are_built_once_and_handed_out_as_copies():
+    registry, build_reviewer, builds = make_registry()
+
+    first, second = build_reviewer(), build_reviewer(temperature=0.0)
+
+    assert builds == [(("Review the clause.",), 0.0)]
+    assert first is not second
+    assert first.model is second.model is registry.model(temperature=0.0)
+
+
+def test_arguments_select_the_template():
+    registry, build_reviewer, builds = make_registry()
+
+    build_reviewer(["Review the clause.", "Be brief."])
+    build_reviewer(["Review the clause.", "Be brief."])
+    warm = build_reviewer(temperature=0.7)
+
+    assert len(builds) == 2
+    assert warm.model is not registry.model(temperature=0.0)
+
+
+def test_arguments_are_frozen_for_the_key():
+    assert _freeze({"b": [1, {"c": 2}], "a": "x"}) == (("a", "x"), ("b", (1, (("c", 2),))))
+
+
+async def test_warm_up_builds_defaults_and_survives_failures():
+    registry, build_reviewer, builds = make_registry()
+
+    @registry.register
+    def build_broken() -> Agent:
+        raise RuntimeError("no API key")
+
+    registry.warm_up()
+    build_reviewer()
+
+    assert len(builds) == 1
+    await registry.close()
+    build_reviewer()
+    assert len(builds) == 2
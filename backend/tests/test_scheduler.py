@@ -0,0 +1,98 @@
+import asyncio
+
+from app.services.compliance_check import AnalysisSource, check_compliance
+from app.services.scheduler import AgentScheduler, DeadlineExceeded
+from tests.compliance import FakeSpecialists, clauses
+
+
+def call(result, delay=0.0, log=None, error=None):
+    async def run():
+        if log is not None:
+            log.append(result)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append(f"cancelled {result}")
+            raise
+        if error is not None:
+            raise error
+        return result
+
+    return run
+
+
+async def collect(scheduler, calls, deadline, hedge_after=None):
+    return [(key, result, error) async for key, result, error in scheduler.run(calls, deadline, hedge_after)]
+
+
+async def test_results_arrive_in_completion_order():
+    calls = {"slow": call("a", 0.05), "fast": call("b"), "broken": call("c", error=ValueError("bad JSON"))}
+
+    results = await collect(AgentScheduler(4), calls, deadline=1)
+
+    assert [key for key, _, _ in results] == ["fast", "broken", "slow"]
+    assert results[0][1] == "b" and isinstance(results[1][2], ValueError)
+
+
+async def test_calls_past_the_deadline_are_cancelled():
+    log = []
+    calls = {"fast": call("fast", 0, log), "stuck": call("stuck", 10, log)}
+
+    results = await collect(AgentScheduler(4), calls, deadline=0.05)
+    await asyncio.sleep(0)
+
+    assert [key for key, _, _ in results] == ["fast", "stuck"]
+    assert isinstance(results[1][2], DeadlineExceeded)
+    assert "cancelled stuck" in log
+
+
+async def test_queued_calls_share_the_slots_and_the_deadline():
+    log = []
+    calls = {index: call(index, 0.04, log) for index in range(4)}
+
+    results = await collect(AgentScheduler(2), calls, deadline=0.06)
+    await asyncio.sleep(0)
+
+    # Two slots: the last two calls only start once the first two are done,
+    # and run into the deadline
+    assert log[:2] == [0, 1] and sorted(log[2:4]) == [2, 3]
+    assert sorted(log[4:]) == ["cancelled 2", "cancelled 3"]
+    assert [(key, error is None) for key, _, error in results] == [(0, True), (1, True), (2, False), (3, False)]
+
+
+async def test_straggler_is_hedged_and_the_first_success_wins():
+    attempts = []
+
+    def flaky():
+        async def run():
+            attempts.append(len(attempts))
+            # The first attempt hangs, the hedged one answers at once
+            await asyncio.sleep(10 if len(attempts) == 1 else 0)
+            return f"attempt {len(attempts)}"
+
+        return run()
+
+    results = await collect(AgentScheduler(4), {"agent": flaky}, deadline=1, hedge_after=0.02)
+
+    assert results == [("agent", "attempt 2", None)]
+    assert attempts == [0, 1]
+
+
+async def test_hedging_waits_for_a_free_slot():
+    log = []
+    calls = {"a": call("a", 0.1, log), "b": call("b", 0.1, log)}
+
+    await collect(AgentScheduler(2), calls, deadline=1, hedge_after=0.02)
+
+    assert log == ["a", "b"]
+
+
+async def test_compliance_check_returns_partial_results_at_the_deadline(monkeypatch):
+    FakeSpecialists(monkeypatch, delays={"external": 10})
+
+    result = await check_compliance(clauses(2), "contract-1", deadline=0.1)
+
+    assert set(result.agents_used) == {AnalysisSource.COMPLIANCE_AGENT, AnalysisSource.TARIFF_AGENT}
+    assert result.dropped_agents == [AnalysisSource.EXTERNAL_REVIEW_AGENT]
+    assert len(result.findings) == 4
@@ -0,0 +1,80 @@
+import pypdfium2 as pdfium
+import pytest
+from PIL import Image
+
+from app.config import Config
+from app.services.extractor import _ocr_rendered_page, _page_language
+from tests.documents import clause_lines, make_pdf
+from tests.fakes import FakeOCREngine
+
+IMAGE = Image.new("L", (10, 10), 255)
+
+
+def ocr_config(**overrides):
+    settings = {"language": "eng+ara", "detect_script": True, "min_script_confidence": 10.0,
+                "min_confidence": 70.0, "adaptive_dpi": False, "probe_dpi": 150, "dpi": 300}
+    settings.update(overrides)
+    return Config.from_dict({"ocr": settings}).ocr
+
+
+@pytest.mark.parametrize("script, overrides, expected", [
+    (("Arabic", 25.0), {}, "ara"),
+    (("Latin", 12.0), {}, "eng"),
+    (("Latin", 4.0), {}, None),  # too unsure to drop a pack
+    (("Cyrillic", 30.0), {}, None),  # no configured pack reads it
+    (None, {}, None),  # OSD unavailable or nothing to read
+    (("Arabic", 25.0), {"language": "eng"}, None),  # a single pack is used as is
+    (("Arabic", 25.0), {"detect_script": False}, None),
+])
+def test_page_language(script, overrides, expected):
+    config = ocr_config(**overrides)
+    assert _page_language(IMAGE, config, FakeOCREngine(config, script=script)) == expected
+
+
+@pytest.fixture
+def page(tmp_path):
+    pdf = pdfium.PdfDocument(make_pdf(tmp_path / "scan.pdf", [("image", clause_lines(4))]))
+    page = pdf.get_page(0)
+    yield page
+    page.close()
+    pdf.close()
+
+
+def test_confident_page_is_read_with_its_pack_only(page):
+    config = ocr_config()
+    engine = FakeOCREngine(config, script=("Arabic", 25.0), confidences={"ara": 88.0})
+
+    result = _ocr_rendered_page(page, config, engine)
+
+    assert engine.calls == [(2550, "ara")]
+    assert (result.language, result.confidence) == ("ara", 88.0)
+
+
+def test_weak_single_pack_read_is_retried_with_all_packs(page):
+    config = ocr_config()
+    engine = FakeOCREngine(config, script=("Latin", 25.0), confidences={"eng": 40.0, "eng+ara": 80.0})
+
+    result = _ocr_rendered_page(page, config, engine)
+
+    assert engine.calls == [(2550, "eng"), (2550, None)]
+    assert (result.language, result.confidence) == ("eng+ara", 80.0)
+
+
+def test_adaptive_mode_reuses_the_probe_render(page):
+    config = ocr_config(adaptive_dpi=True)
+    engine = FakeOCREngine(config, script=("Arabic", 25.0), confidences={"ara": 90.0})
+
+    result = _ocr_rendered_page(page, config, engine)
+
+    assert engine.calls == [(1275, "ara")]
+    assert (result.dpi, result.language) == (150, "ara")
+
+
+def test_retry_keeps_the_better_read(page):
+    config = ocr_config(adaptive_dpi=True)
+    engine = FakeOCREngine(config, script=("Arabic", 25.0), confidences={"ara": 60.0, "eng+ara": 50.0})
+
+    result = _ocr_rendered_page(page, config, engine)
+
+    assert engine.calls == [(1275, "ara"), (2550, "ara"), (2550, None)]
+    assert (result.dpi, result.language, result.confidence) == (300, "ara", 60.0)
@@ -0,0 +1,39 @@
+import pytest
+
+from app.config import settings
+from app.services import tokens as tokens_module
+from app.services.compliance_check import check_compliance
+from app.services.tokens import count_tokens, pack
+from tests.compliance import FakeSpecialists, clauses
+
+
+@pytest.fixture
+def estimated(monkeypatch):
+    monkeypatch.setattr(tokens_module, "_get_encoding", lambda: None)
+
+
+def test_token_estimate(estimated):
+    # "Payment"=2, "is"=1, "due"=1, "."=1, "supercalifragilistic"=5
+    assert count_tokens("Payment is due.") == 5
+    assert count_tokens("supercalifragilistic") == 5
+    assert count_tokens("") == 0
+
+
+def test_pack_keeps_order_within_budgets():
+    items = ["a", "b", "c", "d", "e"]
+    assert pack(items, [3, 3, 3, 3, 3], budget=6) == [["a", "b"], ["c", "d"], ["e"]]
+    assert pack(items, [3, 3, 3, 3, 3], budget=9, first_budget=3) == [["a"], ["b", "c", "d"], ["e"]]
+    assert pack(items, [1, 10, 1, 1, 1], budget=4) == [["a"], ["b"], ["c", "d", "e"]]
+    assert pack([], [], budget=4) == []
+
+
+async def test_large_contracts_are_checked_in_batches(monkeypatch, estimated):
+    specialists = FakeSpecialists(monkeypatch)
+    monkeypatch.setattr(settings, "COMPLIANCE_BATCH_TOKENS", 0)
+
+    result = await check_compliance(clauses(3), "contract-1", deadline=5)
+
+    # A budget below one clause gives every clause a batch of its own
+    assert sorted(specialists.checked()) == [["1"], ["2"], ["3"]]
+    assert len(specialists.calls) == 9
+    assert len(result.findings) == 9
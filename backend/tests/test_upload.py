@@ -0,0 +1,89 @@
+import hashlib
+
+import pytest
+
+from app import exceptions
+from app.services.upload import MultipartUploadStream
+
+BOUNDARY = "testboundary"
+
+
+class FakeRequest:
+    def __init__(self, body: bytes, chunk_size: int = 64, content_type: str = None):
+        self.headers = {"content-type": content_type or f"multipart/form-data; boundary={BOUNDARY}"}
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+
+def form(fields=(), file=None, trailing=()):
+    parts = []
+    for name, value in fields:
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    if file is not None:
+        filename, content = file
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f"Content-Type: application/pdf\r\n\r\n".encode() + content + b"\r\n"
+        )
+    for name, value in trailing:
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+async def read_all(upload):
+    data = bytearray()
+    while chunk := await upload.read(100):
+        data += chunk
+    return bytes(data)
+
+
+async def test_file_is_streamed_hashed_and_spooled(tmp_path):
+    content = bytes(range(256)) * 20
+    body = form(fields=[("name", "Supply")], file=("../contract.pdf", content), trailing=[("category", "NDA")])
+    upload = MultipartUploadStream(FakeRequest(body), max_size=len(content), temp_dir=str(tmp_path))
+
+    assert await upload.start()
+    assert upload.filename == "contract.pdf"
+    assert upload.content_type == "application/pdf"
+    assert await read_all(upload) == content
+    assert await upload.finish() == {"name": "Supply", "category": "NDA"}
+    assert upload.size == len(content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    assert upload.path.read_bytes() == content
+    upload.discard()
+    assert not upload.path.exists()
+
+
+async def test_form_without_a_file_only_collects_fields(tmp_path):
+    upload = MultipartUploadStream(FakeRequest(form(fields=[("content", "Plain text")])), max_size=1024)
+
+    assert not await upload.start()
+    assert upload.path is None
+    assert await upload.finish() == {"content": "Plain text"}
+
+
+async def test_oversized_file_is_rejected_and_its_spool_removed(tmp_path):
+    body = form(file=("contract.pdf", b"x" * 4096))
+    upload = MultipartUploadStream(FakeRequest(body), max_size=1024, temp_dir=str(tmp_path))
+
+    with pytest.raises(exceptions.FileTooLarge):
+        await upload.start()
+        await read_all(upload)
+    assert upload.size > upload.max_size
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_oversized_form_field_is_rejected():
+    upload = MultipartUploadStream(FakeRequest(form(fields=[("content", "y" * 4096)])), max_size=1024)
+
+    with pytest.raises(exceptions.FileTooLarge):
+        await upload.finish()
+
+
+def test_non_multipart_body_is_a_bad_request():
+    with pytest.raises(exceptions.BadRequest):
+        MultipartUploadStream(FakeRequest(b"{}", content_type="application/json"), max_size=1024)
@@ -0,0 +1,133 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import upload_listener as listener_module
+from app.services.upload_listener import PresignedUploadListener
+
+
+class FakeRepository:
+    """Contracts awaiting their presigned upload, by file name."""
+
+    def __init__(self, *file_names):
+        self.contracts = {name: SimpleNamespace(id=f"id-{name}", file_name=name) for name in file_names}
+        self.awaiting = set(file_names)
+        self.released, self.rejected = [], []
+
+    async def claim_presigned_upload(self, file_name):
+        if file_name not in self.awaiting:
+            return None
+        self.awaiting.discard(file_name)
+        return self.contracts[file_name]
+
+    async def release_presigned_upload(self, contract_id):
+        self.released.append(contract_id)
+
+    async def reject_presigned_upload(self, contract_id):
+        self.rejected.append(contract_id)
+
+    async def list_awaiting_upload(self, since, limit=100):
+        return [self.contracts[name] for name in sorted(self.awaiting)]
+
+
+class FakeBucket:
+    file_prefix = "contracts"
+    bucket_name = "documents"
+
+    def __init__(self, objects, fail_download=False):
+        self.objects = objects
+        self.fail_download = fail_download
+        self.client = SimpleNamespace(listen_bucket_notification=self._listen)
+
+    async def stat(self, object_name):
+        data = self.objects.get(object_name)
+        return None if data is None else SimpleNamespace(size=len(data))
+
+    async def download(self, object_name, target):
+        if self.fail_download:
+            raise ConnectionError("MinIO went away")
+        target.write(self.objects[object_name])
+        return "sha256"
+
+    async def _listen(self, *args, **kwargs):
+        raise NotImplementedError("notifications are not supported")
+
+
+class FakeIngestion:
+    def __init__(self):
+        self.jobs = []
+
+    async def submit(self, contract, path, file_hash=None):
+        self.jobs.append((contract.file_name, path.read_bytes(), file_hash))
+        path.unlink()
+        return SimpleNamespace(id=f"job-{len(self.jobs)}")
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repository = FakeRepository("contract_a.pdf")
+    monkeypatch.setattr(listener_module, "ContractRepository", repository)
+    return repository
+
+
+def listener(bucket, ingestion, tmp_path, **options):
+    return PresignedUploadListener(ingestion, bucket, temp_dir=str(tmp_path), **options)
+
+
+async def test_claimed_upload_is_queued_once(repository, tmp_path):
+    ingestion = FakeIngestion()
+    upload_listener = listener(FakeBucket({"contract_a.pdf": b"%PDF"}), ingestion, tmp_path)
+
+    await upload_listener.handle("contract_a.pdf")
+    await upload_listener.handle("contract_a.pdf")
+    await upload_listener.handle("unrelated.pdf")
+
+    assert ingestion.jobs == [("contract_a.pdf", b"%PDF", "sha256")]
+    assert repository.released == [] and repository.rejected == []
+
+
+async def test_oversized_upload_is_rejected_not_released(repository, tmp_path):
+    ingestion = FakeIngestion()
+    upload_listener = listener(FakeBucket({"contract_a.pdf": b"x" * 100}), ingestion, tmp_path, max_size=10)
+
+    await upload_listener.handle("contract_a.pdf")
+
+    assert repository.rejected == ["id-contract_a.pdf"]
+    assert repository.released == [] and ingestion.jobs == []
+
+
+async def test_failed_download_releases_the_claim(repository, tmp_path):
+    ingestion = FakeIngestion()
+    upload_listener = listener(FakeBucket({"contract_a.pdf": b"%PDF"}, fail_download=True), ingestion, tmp_path)
+
+    await upload_listener.handle("contract_a.pdf")
+
+    assert repository.released == ["id-contract_a.pdf"]
+    assert ingestion.jobs == []
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_listener_survives_a_failed_sweep_and_falls_back_to_polling(repository, tmp_path, monkeypatch):
+    sweeps = []
+    original_sweep = PresignedUploadListener._sweep
+
+    async def flaky_sweep(self):
+        sweeps.append(len(sweeps))
+        if len(sweeps) == 1:
+            raise ConnectionError("Mongo is down")
+        await original_sweep(self)
+
+    monkeypatch.setattr(PresignedUploadListener, "_sweep", flaky_sweep)
+    ingestion = FakeIngestion()
+    upload_listener = listener(FakeBucket({"contract_a.pdf": b"%PDF"}), ingestion, tmp_path, poll_interval=0.01)
+
+    upload_listener.start()
+    for _ in range(100):
+        if ingestion.jobs:
+            break
+        await asyncio.sleep(0.01)
+    await upload_listener.stop()
+
+    assert len(sweeps) >= 2
+    assert [file_name for file_name, _, _ in ingestion.jobs] == ["contract_a.pdf"]